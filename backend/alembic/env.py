@@ -18,6 +18,16 @@ if config.config_file_name is not None:
 
 config.set_main_option("sqlalchemy.url", settings.database_url)
 target_metadata = SQLModel.metadata
+# Índice de búsqueda creado por DDL propio de cada dialecto (`app.models.note_search`).
+_DDL_MANAGED = ("note_search_fts", "ix_note_search_document")
+
+
+def include_object(obj: Any, name: str | None, type_: str, *_args: Any) -> bool:
+    if name is None:
+        return True
+    if type_ == "column" and name == "document" and obj.table.name == "note_search":
+        return False
+    return not name.startswith(_DDL_MANAGED)
 
 
 def run_migrations_offline() -> None:
@@ -27,6 +37,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -34,7 +45,12 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Any) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
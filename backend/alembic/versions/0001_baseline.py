@@ -0,0 +1,205 @@
+"""Esquema inicial.
+
+El de `SQLModel.metadata` más el índice de búsqueda de cada dialecto.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 04:19:59.961997+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: str | Sequence[str] | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Copia de `app.models.note_search` en el momento de esta revisión.
+_SEARCH_DDL = {
+    "sqlite": (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS note_search_fts USING fts5("
+        "title, content, content='note_search', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS note_search_ai AFTER INSERT ON note_search BEGIN "
+        "INSERT INTO note_search_fts(rowid, title, content) "
+        "VALUES (new.id, new.title, new.content); "
+        "END",
+        "CREATE TRIGGER IF NOT EXISTS note_search_ad AFTER DELETE ON note_search BEGIN "
+        "INSERT INTO note_search_fts(note_search_fts, rowid, title, content) "
+        "VALUES ('delete', old.id, old.title, old.content); "
+        "END",
+        "CREATE TRIGGER IF NOT EXISTS note_search_au AFTER UPDATE ON note_search BEGIN "
+        "INSERT INTO note_search_fts(note_search_fts, rowid, title, content) "
+        "VALUES ('delete', old.id, old.title, old.content); "
+        "INSERT INTO note_search_fts(rowid, title, content) "
+        "VALUES (new.id, new.title, new.content); "
+        "END",
+    ),
+    "postgresql": (
+        "ALTER TABLE note_search ADD COLUMN IF NOT EXISTS document tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', title), 'A') || "
+        "setweight(to_tsvector('simple', left(content, 262144)), 'B')"
+        ") STORED",
+        "CREATE INDEX IF NOT EXISTS ix_note_search_document ON note_search USING GIN (document)",
+    ),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("display_name", sa.String(), nullable=True, comment="Nombre visible del usuario"),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_users_email"), "users", ["email"], unique=True)
+    op.create_table(
+        "vaults",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("theme", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("owner_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(
+            ["owner_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_vaults_owner_id"), "vaults", ["owner_id"], unique=False)
+    op.create_table(
+        "note_tombstones",
+        sa.Column("note_id", sa.Uuid(), nullable=False),
+        sa.Column("vault_id", sa.Uuid(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["vault_id"], ["vaults.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("note_id"),
+    )
+    op.create_index(
+        "ix_note_tombstones_vault_deleted_at",
+        "note_tombstones",
+        ["vault_id", "deleted_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_note_tombstones_vault_version", "note_tombstones", ["vault_id", "version"], unique=False
+    )
+    op.create_table(
+        "notes",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("content", sa.LargeBinary(), nullable=False),
+        sa.Column("content_length", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("content_hash", sa.String(length=64), server_default="", nullable=False),
+        sa.Column("links", sa.JSON(), server_default="[]", nullable=False),
+        sa.Column("vault_id", sa.Uuid(), nullable=False),
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(
+            ["vault_id"],
+            ["vaults.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_notes_vault_updated_id", "notes", ["vault_id", "updated_at", "id"], unique=False
+    )
+    op.create_index("ix_notes_vault_version", "notes", ["vault_id", "version"], unique=False)
+    op.create_table(
+        "note_links",
+        sa.Column("source_id", sa.Uuid(), nullable=False),
+        sa.Column("target_id", sa.Uuid(), nullable=False),
+        sa.Column("vault_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(["source_id"], ["notes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["target_id"], ["notes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["vault_id"], ["vaults.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("source_id", "target_id"),
+    )
+    op.create_index(
+        "ix_note_links_target_source", "note_links", ["target_id", "source_id"], unique=False
+    )
+    op.create_index("ix_note_links_vault_id", "note_links", ["vault_id"], unique=False)
+    op.create_table(
+        "note_revisions",
+        sa.Column("note_id", sa.Uuid(), nullable=False),
+        sa.Column("revision", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("vault_id", sa.Uuid(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("snapshot", sa.Boolean(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("content_length", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("saved_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("superseded_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["note_id"], ["notes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["vault_id"], ["vaults.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("note_id", "revision"),
+    )
+    op.create_index(
+        "ix_note_revisions_superseded_at", "note_revisions", ["superseded_at"], unique=False
+    )
+    op.create_table(
+        "note_search",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("note_id", sa.Uuid(), nullable=False),
+        sa.Column("vault_id", sa.Uuid(), nullable=False),
+        sa.Column("title", sa.Text(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["note_id"], ["notes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["vault_id"], ["vaults.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("note_id"),
+    )
+    op.create_index(op.f("ix_note_search_vault_id"), "note_search", ["vault_id"], unique=False)
+    for statement in _SEARCH_DDL.get(op.get_bind().dialect.name, ()):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS note_search_fts")
+    op.drop_index(op.f("ix_note_search_vault_id"), table_name="note_search")
+    op.drop_table("note_search")
+    op.drop_index("ix_note_revisions_superseded_at", table_name="note_revisions")
+    op.drop_table("note_revisions")
+    op.drop_index("ix_note_links_vault_id", table_name="note_links")
+    op.drop_index("ix_note_links_target_source", table_name="note_links")
+    op.drop_table("note_links")
+    op.drop_index("ix_notes_vault_version", table_name="notes")
+    op.drop_index("ix_notes_vault_updated_id", table_name="notes")
+    op.drop_table("notes")
+    op.drop_index("ix_note_tombstones_vault_version", table_name="note_tombstones")
+    op.drop_index("ix_note_tombstones_vault_deleted_at", table_name="note_tombstones")
+    op.drop_table("note_tombstones")
+    op.drop_index(op.f("ix_vaults_owner_id"), table_name="vaults")
+    op.drop_table("vaults")
+    op.drop_index(op.f("ix_users_email"), table_name="users")
+    op.drop_table("users")
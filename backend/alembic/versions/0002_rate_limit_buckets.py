@@ -0,0 +1,35 @@
+"""Buckets compartidos del rate limiting (`RATE_LIMIT_BACKEND=postgres`).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 04:27:40.689571+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: str | Sequence[str] | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("tat", sa.Double(), nullable=False),
+        sa.Column("allowed", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE rate_limit_buckets SET UNLOGGED")
+
+
+def downgrade() -> None:
+    op.drop_table("rate_limit_buckets")
@@ -0,0 +1,48 @@
+"""Estado de aprovisionamiento del usuario (`users.provisioned_at`).
+
+Los usuarios existentes que ya tienen algún vault se marcan como aprovisionados; el resto
+queda pendiente y lo recoge el reintento en segundo plano.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:12:31.402218+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: str | Sequence[str] | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("provisioned_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE users SET provisioned_at = created_at "
+        "WHERE EXISTS (SELECT 1 FROM vaults WHERE vaults.owner_id = users.id)"
+    )
+    op.create_index(
+        "ix_users_unprovisioned",
+        "users",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("provisioned_at IS NULL"),
+        sqlite_where=sa.text("provisioned_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_users_unprovisioned",
+        table_name="users",
+        postgresql_where=sa.text("provisioned_at IS NULL"),
+        sqlite_where=sa.text("provisioned_at IS NULL"),
+    )
+    op.drop_column("users", "provisioned_at")
@@ -0,0 +1,36 @@
+"""Caché de respuestas compartida entre workers (`RESPONSE_CACHE_BACKEND=postgres`).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:05:47.118532+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: str | Sequence[str] | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "response_cache_entries",
+        sa.Column("vault_id", sa.Uuid(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("body", sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint("vault_id", "kind"),
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE response_cache_entries SET UNLOGGED")
+
+
+def downgrade() -> None:
+    op.drop_table("response_cache_entries")
@@ -0,0 +1,30 @@
+"""Poda de tombstones (`vaults.tombstones_pruned_version`).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:22:08.517309+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: str | Sequence[str] | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "vaults",
+        sa.Column("tombstones_pruned_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("vaults", "tombstones_pruned_version")
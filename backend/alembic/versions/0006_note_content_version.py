@@ -0,0 +1,34 @@
+"""Versión del último cambio de contenido (`notes.content_version`).
+
+Las notas existentes toman su `version`: un parche calculado sobre una versión anterior
+sigue chocando, como antes.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 15:03:41.226874+00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: str | Sequence[str] | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "notes",
+        sa.Column("content_version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute("UPDATE notes SET content_version = version")
+
+
+def downgrade() -> None:
+    op.drop_column("notes", "content_version")
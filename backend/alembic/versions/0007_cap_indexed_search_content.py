@@ -0,0 +1,36 @@
+"""Recorta `note_search.content` al máximo indexado.
+
+Los documentos existentes se truncan a `INDEXED_CONTENT_MAX_CHARS` (copia del valor en
+`app.services.search` en el momento de esta revisión); los triggers de FTS5 y la columna
+generada de Postgres se actualizan solos. No tiene vuelta atrás: el texto recortado sigue
+en `notes` y `rebuild_search_index` regenera los documentos.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 17:20:12.584301+00:00
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: str | Sequence[str] | None = "0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_INDEXED_CONTENT_MAX_CHARS = 32_768
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE note_search "
+        f"SET content = substr(content, 1, {_INDEXED_CONTENT_MAX_CHARS}) "
+        f"WHERE length(content) > {_INDEXED_CONTENT_MAX_CHARS}"
+    )
+
+
+def downgrade() -> None:
+    pass
@@ -1 +1,5 @@
 # Makes the app package importable.
+import time
+
+# Inicio de la importación de la app: `app.main` reporta cuánto tardó.
+IMPORT_STARTED = time.perf_counter()
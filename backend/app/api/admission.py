@@ -0,0 +1,78 @@
+"""Dependencias de admisión: 429 al superar un límite de tasa, 503 con el worker saturado.
+
+Se resuelven antes que el handler, así una ráfaga de logins se corta antes de llegar a
+bcrypt y las lecturas de vaults conservan CPU, hilos y conexiones.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.api.deps import get_current_user
+from app.models import User
+from app.services.admission import (
+    AUTH_ACCOUNT_LIMIT,
+    AUTH_IP_LIMIT,
+    NOTE_WRITE_LIMIT,
+    ConcurrencyLimiter,
+    RateLimit,
+    admission,
+    auth_concurrency,
+    note_write_concurrency,
+)
+
+
+def client_ip(request: Request) -> str:
+    # Detrás de un proxy, uvicorn debe correr con `--proxy-headers` para ver la IP real.
+    return request.client.host if request.client is not None else "unknown"
+
+
+async def _enforce_rate(scope: str, key: str, limit: RateLimit) -> None:
+    wait = await admission.check_rate(scope, key, limit)
+    if wait > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiadas solicitudes, reintenta más tarde",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
+@asynccontextmanager
+async def _admitted(
+    limiter: ConcurrencyLimiter, scope: str, key: str, limit: RateLimit
+) -> AsyncIterator[None]:
+    # Primero la concurrencia: es gratis y bajo saturación evita incluso consultar el almacén.
+    if not limiter.try_acquire():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado, reintenta en unos segundos",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        await _enforce_rate(scope, key, limit)
+        yield
+    finally:
+        limiter.release()
+
+
+async def admit_auth(request: Request) -> AsyncIterator[None]:
+    async with _admitted(auth_concurrency, "auth_ip", client_ip(request), AUTH_IP_LIMIT):
+        yield
+
+
+async def enforce_account_limit(email: str) -> None:
+    """Límite por cuenta de login/registro (frena el ataque a una cuenta desde muchas IPs)."""
+    await _enforce_rate("auth_account", email.strip().lower(), AUTH_ACCOUNT_LIMIT)
+
+
+async def admit_note_write(
+    current_user: User = Depends(get_current_user),
+) -> AsyncIterator[None]:
+    async with _admitted(
+        note_write_concurrency, "note_write", str(current_user.id), NOTE_WRITE_LIMIT
+    ):
+        yield
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import AsyncGenerator
 from typing import Annotated, cast
 from uuid import UUID
 
@@ -10,9 +11,10 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_session
+from app.db.session import async_session, get_session, replica_session
 from app.models import User
-from app.schemas import TokenPayload
+from app.services.principals import cache_user, decode_token_subject, get_cached_user
+from app.services.replica_routing import is_pinned
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_prefix}/auth/login")
 
@@ -20,28 +22,58 @@ SessionDep = Annotated[AsyncSession, Depends(get_session)]
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
 
 
-async def get_current_user(session: SessionDep, token: TokenDep) -> User:
+async def get_read_session(
+    session: SessionDep, token: TokenDep
+) -> AsyncGenerator[AsyncSession, None]:
+    """Sesión para handlers de solo lectura: una réplica, salvo que el usuario acabe de escribir.
+
+    Sin réplicas (o con el usuario fijado) es la misma sesión primaria de `SessionDep`.
+    """
+    try:
+        user_id = decode_token_subject(token)
+    except (jwt.InvalidTokenError, ValueError):
+        user_id = None
+    replica = None if user_id is None or is_pinned(user_id) else replica_session()
+    if replica is None:
+        yield session
+        return
+    async with replica:
+        yield replica
+
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
+
+
+async def get_current_user(session: ReadSessionDep, token: TokenDep) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Token inválido o expirado",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.auth_secret_key, algorithms=[settings.auth_algorithm])
-        token_data = TokenPayload(**payload)
-    except jwt.InvalidTokenError as exc:
+        user_id = decode_token_subject(token)
+    except (jwt.InvalidTokenError, ValueError) as exc:
         raise credentials_exception from exc
 
-    if not token_data.sub:
+    cached = get_cached_user(user_id)
+    if cached is not None:
+        return cached
+
+    user = await _load_user(session, user_id)
+    if user is None and session.info.get("replica"):
+        # Usuario recién creado que la réplica aún no tiene (p. ej. registrado en otro worker).
+        async with async_session() as primary:
+            user = await _load_user(primary, user_id)
+    if user is None:
         raise credentials_exception
+    cache_user(user)
+    return user
 
-    try:
-        user_id = UUID(token_data.sub)
-    except (TypeError, ValueError) as exc:
-        raise credentials_exception from exc
 
+async def _load_user(session: AsyncSession, user_id: UUID) -> User | None:
     result = await session.execute(select(User).where(User.id == user_id))
     user = cast(User | None, result.scalar_one_or_none())
-    if user is None:
-        raise credentials_exception
+    if user is not None:
+        # Desacoplado para poder compartirlo entre requests sin atarlo a esta sesión.
+        session.expunge(user)
     return user
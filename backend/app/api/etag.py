@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from fastapi import Response, status
+
+from app.models import Vault
+
+
+def vault_etag(vault: Vault) -> str:
+    return f'"{vault.id.hex}.{vault.version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {item.strip().removeprefix("W/") for item in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Los datos son del usuario: el navegador puede guardarlos pero debe revalidar siempre.
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
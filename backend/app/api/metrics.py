@@ -0,0 +1,78 @@
+"""Instrumentación HTTP (middleware ASGI) y endpoint `/metrics` para Prometheus."""
+
+from __future__ import annotations
+
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    HTTP_REQUEST_DB_DURATION,
+    HTTP_REQUEST_DB_STATEMENTS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    RequestDbStats,
+    current_request_db,
+    registry,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Las rutas sin coincidencia se agrupan para no disparar la cardinalidad de las etiquetas.
+UNMATCHED_ROUTE = "<unmatched>"
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def _route_template(scope: Scope) -> str:
+    # El router de FastAPI deja la ruta resuelta en el scope.
+    route = scope.get("route")
+    return str(getattr(route, "path_format", None) or UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """Latencia y uso de la base de datos por ruta (plantilla de path) y peticiones en curso.
+
+    La ruta solo se conoce después del enrutado, así que las peticiones en curso van por
+    método; la concurrencia media por ruta sale de `rate(http_request_duration_seconds_sum)`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        db_stats = RequestDbStats()
+        token = current_request_db.set(db_stats)
+        HTTP_REQUESTS_IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec(method)
+            current_request_db.reset(token)
+            route = _route_template(scope)
+            HTTP_REQUESTS.inc(method, route, str(status_code))
+            HTTP_REQUEST_DURATION.observe(method, route, value=elapsed)
+            HTTP_REQUEST_DB_STATEMENTS.observe(method, route, value=db_stats.statements)
+            HTTP_REQUEST_DB_DURATION.observe(method, route, value=db_stats.seconds)
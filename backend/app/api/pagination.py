@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(updated_at: datetime, item_id: UUID) -> str:
+    """Cursor opaco para paginación keyset sobre (updated_at, id)."""
+    raw = f"{updated_at.isoformat()}|{item_id.hex}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode()
+        timestamp, item_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), UUID(hex=item_id)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        ) from exc
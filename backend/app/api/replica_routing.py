@@ -0,0 +1,56 @@
+"""Fija a la primaria a quien acaba de escribir (middleware ASGI)."""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+import jwt
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.principals import decode_token_subject
+from app.services.replica_routing import pin_to_primary
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _bearer_subject(scope: Scope) -> UUID | None:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                return decode_token_subject(token)
+            except (jwt.InvalidTokenError, ValueError):
+                return None
+    return None
+
+
+class ReadYourWritesMiddleware:
+    """Tras cada petición que puede escribir, el usuario del token lee de la primaria.
+
+    Se fija al empezar la respuesta (el handler ya confirmó) y otra vez al terminarla, para
+    que las respuestas en streaming que escriben por lotes cuenten el margen desde el final.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        user_id = _bearer_subject(scope)
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                pin_to_primary(user_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            pin_to_primary(user_id)
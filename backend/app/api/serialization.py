@@ -0,0 +1,92 @@
+"""Serialización directa a JSON de notas y vaults a partir de columnas.
+
+Para vaults grandes el coste estaba en construir objetos ORM y modelos pydantic por nota y
+volver a validarlos contra `response_model`. Aquí se piden solo las columnas, ya ordenadas
+por la base, y se codifican con orjson. La forma del JSON es la de `NoteRead` /
+`VaultWithNotes`: esos modelos siguen como `response_model` para el esquema OpenAPI.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any, cast
+from uuid import UUID
+
+import orjson
+from fastapi import Response
+from sqlalchemy.engine import Row
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.etag import set_etag
+from app.models import Note, Vault
+
+# Mismo orden de campos que NoteRead (primero los heredados de NoteBase).
+NOTE_READ_COLUMNS: tuple[Any, ...] = (
+    Note.title,
+    Note.content,
+    Note.links,
+    Note.id,
+    Note.vault_id,
+    Note.created_at,
+    Note.updated_at,
+    Note.version,
+)
+# Datetimes UTC con "Z", igual que pydantic; `default=str` cubre el UUID propio de asyncpg.
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def _dumps(payload: Any) -> bytes:
+    return orjson.dumps(payload, default=str, option=_ORJSON_OPTIONS)
+
+
+def _vault_fields(vault: Vault) -> dict[str, Any]:
+    return {
+        "id": vault.id,
+        "name": vault.name,
+        "theme": vault.theme,
+        "created_at": vault.created_at,
+        "updated_at": vault.updated_at,
+    }
+
+
+def _note_dicts(rows: Iterable[Row[Any]]) -> list[dict[str, Any]]:
+    return [row._asdict() for row in rows]
+
+
+async def fetch_note_rows(session: AsyncSession, vault_ids: Sequence[UUID]) -> Sequence[Row[Any]]:
+    """Notas de los vaults como tuplas, por vault y de la más reciente a la más antigua."""
+    result = await session.execute(
+        select(*NOTE_READ_COLUMNS)
+        .where(cast(Any, Note.vault_id).in_(vault_ids))
+        .order_by(
+            cast(Any, Note.vault_id),
+            cast(Any, Note.updated_at).desc(),
+            cast(Any, Note.created_at).desc(),
+        )
+    )
+    return result.all()
+
+
+def json_response(body: bytes, etag: str | None = None, status_code: int = 200) -> Response:
+    response = Response(content=body, media_type="application/json", status_code=status_code)
+    if etag is not None:
+        set_etag(response, etag)
+    return response
+
+
+def encode_notes(rows: Iterable[Row[Any]]) -> bytes:
+    return _dumps(_note_dicts(rows))
+
+
+async def encode_vault_with_notes(session: AsyncSession, vault: Vault) -> bytes:
+    rows = await fetch_note_rows(session, [vault.id])
+    return _dumps({**_vault_fields(vault), "notes": _note_dicts(rows)})
+
+
+async def encode_vaults_with_notes(session: AsyncSession, vaults: Sequence[Vault]) -> bytes:
+    notes_by_vault: dict[Any, list[dict[str, Any]]] = {vault.id: [] for vault in vaults}
+    if vaults:
+        for row in await fetch_note_rows(session, [vault.id for vault in vaults]):
+            notes_by_vault[row.vault_id].append(row._asdict())
+    return _dumps([{**_vault_fields(vault), "notes": notes_by_vault[vault.id]} for vault in vaults])
@@ -1,18 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlmodel import select
 
+from app.api.admission import admit_auth, enforce_account_limit
 from app.api.deps import SessionDep, get_current_user
-from app.core.security import create_access_token, get_password_hash, verify_password
-from app.models import Note, User, Vault
+from app.core.security import create_access_token, hash_password, verify_and_update_password
+from app.models import User
 from app.schemas import LoginRequest, RegisterRequest, TokenResponse, UserRead
+from app.services.provisioning import create_user, run_user_provisioning
+from app.services.replica_routing import pin_to_primary
 
 router = APIRouter()
 MAX_BCRYPT_BYTES = 72
-DEFAULT_VAULT_NAME_KEY = "i18n:defaultVault.name"
-DEFAULT_NOTE_WELCOME_TITLE_KEY = "i18n:defaultNotes.welcome.title"
-DEFAULT_NOTE_WELCOME_CONTENT_KEY = "i18n:defaultNotes.welcome.content"
-DEFAULT_NOTE_QUICKSTART_TITLE_KEY = "i18n:defaultNotes.quickstart.title"
-DEFAULT_NOTE_QUICKSTART_CONTENT_KEY = "i18n:defaultNotes.quickstart.content"
 
 
 def _to_user_read(user: User) -> UserRead:
@@ -31,38 +29,17 @@ def _ensure_password_len(password: str) -> None:
         )
 
 
-async def _ensure_default_vault(session: SessionDep, user: User) -> None:
-    result = await session.execute(select(Vault.id).where(Vault.owner_id == user.id).limit(1))
-    if result.scalar_one_or_none():
-        return
-
-    vault = Vault(name=DEFAULT_VAULT_NAME_KEY, theme="violet", owner_id=user.id)
-    session.add(vault)
-    await session.commit()
-    await session.refresh(vault)
-
-    welcome_note = Note(
-        title=DEFAULT_NOTE_WELCOME_TITLE_KEY,
-        content=DEFAULT_NOTE_WELCOME_CONTENT_KEY,
-        vault_id=vault.id,
-        links=[],
-    )
-    quickstart_note = Note(
-        title=DEFAULT_NOTE_QUICKSTART_TITLE_KEY,
-        content=DEFAULT_NOTE_QUICKSTART_CONTENT_KEY,
-        vault_id=vault.id,
-        links=[],
-    )
-    welcome_note.links = [str(quickstart_note.id)]
-    quickstart_note.links = [str(welcome_note.id)]
-    session.add(welcome_note)
-    session.add(quickstart_note)
-    await session.commit()
-
-
-@router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-async def register(payload: RegisterRequest, session: SessionDep) -> TokenResponse:
+@router.post(
+    "/register",
+    response_model=TokenResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admit_auth)],
+)
+async def register(
+    payload: RegisterRequest, session: SessionDep, background_tasks: BackgroundTasks
+) -> TokenResponse:
     _ensure_password_len(payload.password)
+    await enforce_account_limit(payload.email)
 
     existing = await session.execute(select(User).where(User.email == payload.email))
     if existing.scalar_one_or_none():
@@ -70,34 +47,49 @@ async def register(payload: RegisterRequest, session: SessionDep) -> TokenRespon
             status_code=status.HTTP_400_BAD_REQUEST, detail="El correo ya está registrado"
         )
 
-    user = User(
+    user = await create_user(
+        session,
         email=payload.email,
         display_name=payload.display_name,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=await hash_password(payload.password),
     )
-    session.add(user)
     await session.commit()
-    await session.refresh(user)
-
-    await _ensure_default_vault(session, user)
+    # Sin token en la petición el middleware no sabe quién escribió: se fija aquí.
+    pin_to_primary(user.id)
+    # El vault por defecto se crea después de enviar la respuesta.
+    background_tasks.add_task(run_user_provisioning, user.id)
     token = create_access_token(str(user.id))
     return TokenResponse(access_token=token, token_type="bearer", user=_to_user_read(user))
 
 
-@router.post("/login", response_model=TokenResponse)
-async def login(payload: LoginRequest, session: SessionDep) -> TokenResponse:
+@router.post("/login", response_model=TokenResponse, dependencies=[Depends(admit_auth)])
+async def login(
+    payload: LoginRequest, session: SessionDep, background_tasks: BackgroundTasks
+) -> TokenResponse:
     _ensure_password_len(payload.password)
+    await enforce_account_limit(payload.email)
 
     result = await session.execute(select(User).where(User.email == payload.email))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user is not None:
+        valid, new_hash = await verify_and_update_password(payload.password, user.hashed_password)
+    if not user or not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales inválidas",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash is not None:
+        # El coste configurado cambió: se reescribe el hash de forma transparente.
+        user.hashed_password = new_hash
+        session.add(user)
+        await session.commit()
+        pin_to_primary(user.id)
+    if user.provisioned_at is None:
+        # El aprovisionamiento tras el registro falló o no terminó: se reintenta (idempotente).
+        background_tasks.add_task(run_user_provisioning, user.id)
 
-    await _ensure_default_vault(session, user)
     token = create_access_token(str(user.id))
     return TokenResponse(access_token=token, token_type="bearer", user=_to_user_read(user))
 
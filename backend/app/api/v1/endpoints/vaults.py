@@ -1,40 +1,103 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from typing import Any, cast
+from pathlib import Path
+from typing import Any, Literal, cast
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import selectinload
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
+from sqlalchemy.orm import undefer
 from sqlmodel import select
-
-from app.api.deps import SessionDep, get_current_user
-from app.models import Note, User, Vault
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.admission import admit_note_write
+from app.api.deps import ReadSessionDep, SessionDep, get_current_user
+from app.api.etag import etag_matches, not_modified, vault_etag
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.api.serialization import (
+    NOTE_READ_COLUMNS,
+    encode_notes,
+    encode_vault_with_notes,
+    encode_vaults_with_notes,
+    fetch_note_rows,
+    json_response,
+)
+from app.models import Note, NoteLink, User, Vault
 from app.schemas import (
+    NoteBatchRequest,
+    NoteBatchResult,
     NoteCreate,
+    NotePage,
+    NotePatchAck,
     NoteRead,
+    NoteRevisionPage,
+    NoteRevisionRead,
+    NoteSummary,
+    NoteSummaryPage,
     NoteUpdate,
+    SearchPage,
+    VaultChanges,
     VaultCreate,
+    VaultGraph,
+    VaultGraphLayout,
+    VaultRead,
     VaultUpdate,
     VaultWithNotes,
 )
+from app.services.export import stream_markdown_zip, stream_ndjson
+from app.services.graph import MAX_GRAPH_DEPTH, load_graph
+from app.services.links import detach_notes, insert_note_links, replace_note_links, resolve_links
+from app.services.note_batch import apply_note_batch
+from app.services.note_patch import apply_content_patch
+from app.services.provisioning import (
+    NEW_VAULT_NOTE_CONTENT,
+    NEW_VAULT_NOTE_TITLE,
+    add_vault,
+    build_vault,
+    run_user_provisioning,
+)
+from app.services.response_cache import response_cache
+from app.services.revisions import (
+    NoteState,
+    delete_revisions,
+    list_revisions,
+    load_revision,
+    record_revisions,
+)
+from app.services.search import index_notes, remove_notes, search_notes
+from app.services.sync import (
+    ensure_changes_available,
+    load_changes,
+    next_vault_version,
+    parse_since,
+    record_tombstones,
+)
+from app.services.vault_events import stream_vault_changes, vault_events
+from app.services.vault_import import ObsidianArchive, import_obsidian_vault
 
 router = APIRouter()
 
-
-def _clean_links(
-    raw_links: Iterable[str], allowed_ids: set[str], current_note_id: UUID | None
-) -> list[str]:
-    cleaned: list[str] = []
-    seen: set[str] = set()
-    for link in raw_links:
-        link_id = str(link)
-        if current_note_id and link_id == str(current_note_id):
-            continue
-        if link_id in allowed_ids and link_id not in seen:
-            cleaned.append(link_id)
-            seen.add(link_id)
-    return cleaned
+NOTE_SUMMARY_COLUMNS: tuple[Any, ...] = (
+    Note.id,
+    Note.vault_id,
+    Note.title,
+    Note.links,
+    Note.content_length,
+    Note.created_at,
+    Note.updated_at,
+)
 
 
 def _to_note_read(note: Note) -> NoteRead:
@@ -54,76 +117,150 @@ def _serialize_vault(vault: Vault) -> VaultWithNotes:
     )
 
 
-async def _get_vault_or_404(
-    session: SessionDep, vault_id: UUID, user: User, with_notes: bool = False
-) -> Vault:
-    query = select(Vault).where(Vault.id == vault_id, Vault.owner_id == user.id)
-    if with_notes:
-        query = query.options(selectinload(cast(Any, Vault.notes)))
-
-    result = await session.execute(query)
+async def _get_vault_or_404(session: SessionDep, vault_id: UUID, user: User) -> Vault:
+    result = await session.execute(
+        select(Vault).where(Vault.id == vault_id, Vault.owner_id == user.id)
+    )
     vault = cast(Vault | None, result.scalar_one_or_none())
     if vault is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bóveda no encontrada")
     return vault
 
 
-async def _get_note_or_404(session: SessionDep, vault_id: UUID, note_id: UUID, user: User) -> Note:
-    await _get_vault_or_404(session, vault_id, user, with_notes=False)
-    result = await session.execute(
-        select(Note).where(Note.id == note_id, Note.vault_id == vault_id)
+async def _fetch_note_page(
+    session: SessionDep, vault_id: UUID, columns: tuple[Any, ...], limit: int, cursor: str | None
+) -> tuple[list[Any], str | None]:
+    """Página keyset ordenada por (updated_at, id) descendente; pide limit+1 para saber si sigue."""
+    query = select(*columns).where(Note.vault_id == vault_id)
+    if cursor is not None:
+        cursor_updated_at, cursor_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(cast(Any, Note.updated_at), cast(Any, Note.id)) < (cursor_updated_at, cursor_id)
+        )
+    query = query.order_by(cast(Any, Note.updated_at).desc(), cast(Any, Note.id).desc()).limit(
+        limit + 1
     )
+
+    result = await session.execute(query)
+    rows = list(result.scalars().all() if len(columns) == 1 else result.all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.updated_at, last.id)
+
+
+async def _get_note_or_404(session: SessionDep, vault_id: UUID, note_id: UUID, user: User) -> Note:
+    await _get_vault_or_404(session, vault_id, user)
+    return await _find_note_or_404(session, vault_id, note_id)
+
+
+async def _find_note_or_404(
+    session: SessionDep, vault_id: UUID, note_id: UUID, *, with_content: bool = False
+) -> Note:
+    query = select(Note).where(Note.id == note_id, Note.vault_id == vault_id)
+    if with_content:
+        query = query.options(undefer(cast(Any, Note.content)))
+    result = await session.execute(query)
     note = cast(Note | None, result.scalar_one_or_none())
     if note is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nota no encontrada")
     return note
 
 
+async def _owned_vaults_session(
+    read_session: AsyncSession, session: AsyncSession, current_user: User
+) -> AsyncSession:
+    """Sesión para listar los vaults del usuario, creando antes el vault por defecto si falta.
+
+    Un cliente que lista justo después de registrarse puede adelantarse a la tarea en segundo
+    plano: se aprovisiona aquí (idempotente) y se lee de la primaria, que ya lo tiene.
+    """
+    if current_user.provisioned_at is None:
+        await run_user_provisioning(current_user.id)
+        return session
+    return read_session
+
+
 @router.get("", response_model=list[VaultWithNotes])
 async def list_vaults(
-    session: SessionDep, current_user: User = Depends(get_current_user)
-) -> list[VaultWithNotes]:
+    read_session: ReadSessionDep,
+    session: SessionDep,
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    session = await _owned_vaults_session(read_session, session, current_user)
+    result = await session.execute(
+        select(Vault).where(Vault.owner_id == current_user.id).order_by(cast(Any, Vault.created_at))
+    )
+    vaults = cast(list[Vault], result.scalars().all())
+    return json_response(await encode_vaults_with_notes(session, vaults))
+
+
+@router.get("/summary", response_model=list[VaultRead])
+async def list_vault_summaries(
+    read_session: ReadSessionDep,
+    session: SessionDep,
+    current_user: User = Depends(get_current_user),
+) -> list[VaultRead]:
+    session = await _owned_vaults_session(read_session, session, current_user)
     result = await session.execute(
-        select(Vault)
-        .where(Vault.owner_id == current_user.id)
-        .options(selectinload(cast(Any, Vault.notes)))
+        select(Vault).where(Vault.owner_id == current_user.id).order_by(cast(Any, Vault.created_at))
     )
-    vaults = cast(list[Vault], result.scalars().unique().all())
-    return [_serialize_vault(vault) for vault in vaults]
+    vaults = cast(list[Vault], result.scalars().all())
+    return [VaultRead.model_validate(vault) for vault in vaults]
 
 
 @router.post("", response_model=VaultWithNotes, status_code=status.HTTP_201_CREATED)
 async def create_vault(
     payload: VaultCreate, session: SessionDep, current_user: User = Depends(get_current_user)
 ) -> VaultWithNotes:
-    vault = Vault(
-        name=payload.name,
-        theme=payload.theme or "violet",
-        owner_id=current_user.id,
+    vault = build_vault(
+        current_user.id,
+        payload.name,
+        payload.theme or "violet",
+        [(NEW_VAULT_NOTE_TITLE, NEW_VAULT_NOTE_CONTENT)],
     )
-    session.add(vault)
+    await add_vault(session, vault)
     await session.commit()
-    await session.refresh(vault)
+    return _serialize_vault(vault)
 
-    welcome_note = Note(
-        title="Inicio",
-        content="Bienvenido a tu nueva bóveda.",
-        vault_id=vault.id,
-        links=[],
-    )
-    session.add(welcome_note)
-    await session.commit()
 
-    vault_with_notes = await _get_vault_or_404(session, vault.id, current_user, with_notes=True)
-    return _serialize_vault(vault_with_notes)
+@router.post("/import", response_class=StreamingResponse, dependencies=[Depends(admit_note_write)])
+async def import_vault(
+    file: UploadFile = File(description="Zip de un vault de Obsidian (archivos `.md`)."),
+    name: str | None = Form(default=None),
+    theme: str | None = Form(default=None),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Importa un zip de Obsidian; responde NDJSON con el progreso y el resultado final.
+
+    El zip se valida antes de responder (400 si no es válido). El archivo subido sigue
+    abierto hasta que termina la respuesta, mientras se procesa por lotes.
+    """
+    archive = ObsidianArchive(file.file)
+    vault_name = name or archive.root_name or Path(file.filename or "").stem or "Importado"
+    return StreamingResponse(
+        import_obsidian_vault(archive, current_user.id, vault_name, theme or "violet"),
+        media_type="application/x-ndjson",
+    )
 
 
 @router.get("/{vault_id}", response_model=VaultWithNotes)
 async def read_vault(
-    vault_id: UUID, session: SessionDep, current_user: User = Depends(get_current_user)
-) -> VaultWithNotes:
-    vault = await _get_vault_or_404(session, vault_id, current_user, with_notes=True)
-    return _serialize_vault(vault)
+    vault_id: UUID,
+    session: ReadSessionDep,
+    if_none_match: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    # Primero solo la fila del vault: si el ETag coincide no se cargan notas.
+    vault = await _get_vault_or_404(session, vault_id, current_user)
+    etag = vault_etag(vault)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    body = await response_cache.get_or_render(
+        "read_vault", vault, lambda: encode_vault_with_notes(session, vault)
+    )
+    return json_response(body, etag)
 
 
 @router.patch("/{vault_id}", response_model=VaultWithNotes)
@@ -132,8 +269,9 @@ async def update_vault(
     payload: VaultUpdate,
     session: SessionDep,
     current_user: User = Depends(get_current_user),
-) -> VaultWithNotes:
-    vault = await _get_vault_or_404(session, vault_id, current_user, with_notes=True)
+) -> Response:
+    vault = await _get_vault_or_404(session, vault_id, current_user)
+    version = await next_vault_version(session, vault_id)
 
     if payload.name is not None:
         vault.name = payload.name
@@ -142,25 +280,172 @@ async def update_vault(
 
     session.add(vault)
     await session.commit()
-    await session.refresh(vault)
-    return _serialize_vault(vault)
+    await response_cache.invalidate(vault_id)
+    await vault_events.publish(vault_id, version)
+    return json_response(await encode_vault_with_notes(session, vault))
+
+
+@router.get("/{vault_id}/graph", response_model=VaultGraph)
+async def read_vault_graph(
+    vault_id: UUID,
+    session: SessionDep,
+    note_id: UUID | None = None,
+    depth: int = Query(default=1, ge=1, le=MAX_GRAPH_DEPTH),
+    current_user: User = Depends(get_current_user),
+) -> VaultGraph:
+    """Grafo sin contenido; con `note_id` devuelve solo su vecindario a `depth` saltos."""
+    if note_id is None:
+        await _get_vault_or_404(session, vault_id, current_user)
+    else:
+        await _get_note_or_404(session, vault_id, note_id, current_user)
+    return await load_graph(session, vault_id, note_id, depth)
+
+
+@router.get("/{vault_id}/graph/layout", response_model=VaultGraphLayout)
+async def read_vault_graph_layout(
+    vault_id: UUID,
+    session: SessionDep,
+    if_none_match: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Grafo completo con posiciones calculadas en el servidor (cacheadas por versión)."""
+    vault = await _get_vault_or_404(session, vault_id, current_user)
+    etag = vault_etag(vault)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    # NumPy se carga con la primera petición de layout, no al arrancar el worker.
+    from app.services.graph_layout import vault_layout
+
+    return json_response(await vault_layout(session, vault), etag)
+
+
+@router.get("/{vault_id}/search", response_model=SearchPage)
+async def search_vault(
+    vault_id: UUID,
+    session: SessionDep,
+    q: str = Query(min_length=1, max_length=256),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=10_000),
+    current_user: User = Depends(get_current_user),
+) -> SearchPage:
+    await _get_vault_or_404(session, vault_id, current_user)
+    return await search_notes(session, vault_id, q, limit, offset)
+
+
+@router.get("/{vault_id}/changes", response_model=VaultChanges)
+async def read_vault_changes(
+    vault_id: UUID,
+    session: SessionDep,
+    since: str = Query(description="Versión devuelta por la llamada anterior o timestamp ISO."),
+    current_user: User = Depends(get_current_user),
+) -> VaultChanges:
+    """Notas creadas/editadas y tombstones de notas borradas desde `since`."""
+    vault = await _get_vault_or_404(session, vault_id, current_user)
+    return await load_changes(session, vault, parse_since(since))
+
+
+@router.get("/{vault_id}/events", response_class=StreamingResponse)
+async def stream_vault_events(
+    vault_id: UUID,
+    session: SessionDep,
+    since: int | None = Query(default=None, ge=0, description="Versión ya conocida."),
+    last_event_id: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Server-Sent Events con los cambios del vault (`event: changes`, `id` = versión).
+
+    Sin `since` ni `Last-Event-ID` empieza en la versión actual; al reconectar, el
+    navegador reenvía el último `id` y recibe lo que se perdió en un solo evento.
+    """
+    vault = await _get_vault_or_404(session, vault_id, current_user)
+    start = vault.version if since is None else since
+    if last_event_id is not None and last_event_id.isdigit():
+        start = int(last_event_id)
+    ensure_changes_available(vault, start)
+    # El stream puede durar horas: no debe retener la conexión del pool de la petición.
+    await session.close()
+    return StreamingResponse(
+        stream_vault_changes(vault_id, start),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{vault_id}/export", response_class=StreamingResponse)
+async def export_vault(
+    vault_id: UUID,
+    session: SessionDep,
+    fmt: Literal["ndjson", "markdown"] = Query(default="ndjson", alias="format"),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Exporta el vault en streaming: NDJSON (una nota por línea) o zip de Markdown."""
+    vault = await _get_vault_or_404(session, vault_id, current_user)
+    if fmt == "markdown":
+        body, media_type, extension = stream_markdown_zip(vault), "application/zip", "zip"
+    else:
+        body, media_type, extension = stream_ndjson(vault), "application/x-ndjson", "ndjson"
+    filename = f"vault-{vault.id.hex[:8]}.{extension}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{vault_id}/notes", response_model=list[NoteRead])
 async def list_notes(
-    vault_id: UUID, session: SessionDep, current_user: User = Depends(get_current_user)
-) -> list[NoteRead]:
+    vault_id: UUID,
+    session: ReadSessionDep,
+    if_none_match: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    vault = await _get_vault_or_404(session, vault_id, current_user)
+    etag = vault_etag(vault)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    async def render() -> bytes:
+        return encode_notes(await fetch_note_rows(session, [vault_id]))
+
+    return json_response(await response_cache.get_or_render("list_notes", vault, render), etag)
+
+
+@router.get("/{vault_id}/notes/page", response_model=NotePage)
+async def list_notes_page(
+    vault_id: UUID,
+    session: ReadSessionDep,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user),
+) -> NotePage:
     await _get_vault_or_404(session, vault_id, current_user)
-    result = await session.execute(
-        select(Note)
-        .where(Note.vault_id == vault_id)
-        .order_by(cast(Any, Note.updated_at).desc(), cast(Any, Note.created_at).desc())
+    rows, next_cursor = await _fetch_note_page(session, vault_id, NOTE_READ_COLUMNS, limit, cursor)
+    return NotePage(items=[NoteRead.model_validate(row) for row in rows], next_cursor=next_cursor)
+
+
+@router.get("/{vault_id}/notes/summary", response_model=NoteSummaryPage)
+async def list_note_summaries(
+    vault_id: UUID,
+    session: ReadSessionDep,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user),
+) -> NoteSummaryPage:
+    await _get_vault_or_404(session, vault_id, current_user)
+    rows, next_cursor = await _fetch_note_page(
+        session, vault_id, NOTE_SUMMARY_COLUMNS, limit, cursor
+    )
+    return NoteSummaryPage(
+        items=[NoteSummary.model_validate(row) for row in rows], next_cursor=next_cursor
     )
-    notes = cast(list[Note], result.scalars().all())
-    return [_to_note_read(note) for note in notes]
 
 
-@router.post("/{vault_id}/notes", response_model=NoteRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{vault_id}/notes",
+    response_model=NoteRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admit_note_write)],
+)
 async def create_note(
     vault_id: UUID,
     payload: NoteCreate,
@@ -173,49 +458,142 @@ async def create_note(
         content=payload.content or "",
         links=[],
         vault_id=vault_id,
+        version=await next_vault_version(session, vault_id),
     )
+    if payload.links:
+        note.links = await resolve_links(session, vault_id, payload.links, note.id)
     session.add(note)
+    await session.flush()
+    await insert_note_links(session, [note])
+    await index_notes(session, [note])
     await session.commit()
-    await session.refresh(note)
+    await response_cache.invalidate(vault_id)
+    await vault_events.publish(vault_id, note.version)
+    return _to_note_read(note)
 
-    if payload.links:
-        result = await session.execute(select(Note.id).where(Note.vault_id == vault_id))
-        allowed_ids = {str(row[0]) for row in result.all()}
-        note.links = _clean_links(payload.links, allowed_ids, note.id)
-        session.add(note)
-        await session.commit()
-        await session.refresh(note)
 
-    return _to_note_read(note)
+@router.post(
+    "/{vault_id}/notes/batch",
+    response_model=NoteBatchResult,
+    dependencies=[Depends(admit_note_write)],
+)
+async def batch_notes(
+    vault_id: UUID,
+    payload: NoteBatchRequest,
+    session: SessionDep,
+    current_user: User = Depends(get_current_user),
+) -> NoteBatchResult:
+    """Altas/ediciones/bajas de muchas notas con una verificación de vault y un solo commit."""
+    await _get_vault_or_404(session, vault_id, current_user)
+    result = await apply_note_batch(session, vault_id, payload)
+    await response_cache.invalidate(vault_id)
+    await vault_events.publish(vault_id, result.version)
+    return result
+
+
+@router.get("/{vault_id}/notes/{note_id}/backlinks", response_model=list[NoteSummary])
+async def list_backlinks(
+    vault_id: UUID,
+    note_id: UUID,
+    session: SessionDep,
+    current_user: User = Depends(get_current_user),
+) -> list[NoteSummary]:
+    await _get_note_or_404(session, vault_id, note_id, current_user)
+    result = await session.execute(
+        select(*NOTE_SUMMARY_COLUMNS)
+        .join(NoteLink, cast(Any, NoteLink.source_id) == Note.id)
+        .where(NoteLink.target_id == note_id)
+        .order_by(cast(Any, Note.updated_at).desc(), cast(Any, Note.id).desc())
+    )
+    return [NoteSummary.model_validate(row) for row in result.all()]
 
 
-@router.patch("/{vault_id}/notes/{note_id}", response_model=NoteRead)
+@router.get("/{vault_id}/notes/{note_id}/revisions", response_model=NoteRevisionPage)
+async def list_note_revisions(
+    vault_id: UUID,
+    note_id: UUID,
+    session: SessionDep,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user),
+) -> NoteRevisionPage:
+    """Revisiones anteriores, de la más nueva a la más antigua (sin contenido)."""
+    await _get_note_or_404(session, vault_id, note_id, current_user)
+    before = None
+    if cursor is not None:
+        if not cursor.isdigit():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+        before = int(cursor)
+    items, next_revision = await list_revisions(session, note_id, limit, before)
+    next_cursor = None if next_revision is None else str(next_revision)
+    return NoteRevisionPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/{vault_id}/notes/{note_id}/revisions/{revision}", response_model=NoteRevisionRead)
+async def read_note_revision(
+    vault_id: UUID,
+    note_id: UUID,
+    revision: int,
+    session: SessionDep,
+    current_user: User = Depends(get_current_user),
+) -> NoteRevisionRead:
+    await _get_note_or_404(session, vault_id, note_id, current_user)
+    found = await load_revision(session, note_id, revision)
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Revisión no encontrada")
+    return found
+
+
+@router.patch(
+    "/{vault_id}/notes/{note_id}",
+    response_model=NoteRead | NotePatchAck,
+    dependencies=[Depends(admit_note_write)],
+)
 async def update_note(
     vault_id: UUID,
     note_id: UUID,
     payload: NoteUpdate,
     session: SessionDep,
     current_user: User = Depends(get_current_user),
-) -> NoteRead:
-    note = await _get_note_or_404(session, vault_id, note_id, current_user)
-
+) -> NoteRead | NotePatchAck:
+    """Edita la nota. Con `content_patch` (autoguardado) responde solo `NotePatchAck`."""
+    await _get_vault_or_404(session, vault_id, current_user)
+    # La nota se lee después de versionar: en Postgres el UPDATE del vault serializa las
+    # escrituras, así un `content_patch` se compara con la última versión confirmada.
+    version = await next_vault_version(session, vault_id)
+    note = await _find_note_or_404(session, vault_id, note_id, with_content=True)
+    previous = NoteState.of(note)
+
+    content = payload.content
+    if payload.content_patch is not None:
+        content = apply_content_patch(note, payload.content_patch)
+    note.version = version
     if payload.title is not None:
         note.title = payload.title
-    if payload.content is not None:
-        note.content = payload.content
+    if content is not None:
+        note.content = content
 
     if payload.links is not None:
-        result = await session.execute(select(Note.id).where(Note.vault_id == vault_id))
-        allowed_ids = {str(row[0]) for row in result.all()}
-        note.links = _clean_links(payload.links, allowed_ids, note_id)
+        note.links = await resolve_links(session, vault_id, payload.links, note_id)
+        await replace_note_links(session, [note])
+    if payload.title is not None or content is not None:
+        await index_notes(session, [note])
+        await record_revisions(session, [(note, previous)])
 
     session.add(note)
     await session.commit()
-    await session.refresh(note)
+    await response_cache.invalidate(vault_id)
+    await vault_events.publish(vault_id, version)
+    if payload.content_patch is not None:
+        return NotePatchAck(id=note.id, version=note.version, content_hash=note.content_hash)
     return _to_note_read(note)
 
 
-@router.delete("/{vault_id}/notes/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{vault_id}/notes/{note_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admit_note_write)],
+)
 async def delete_note(
     vault_id: UUID,
     note_id: UUID,
@@ -223,5 +601,12 @@ async def delete_note(
     current_user: User = Depends(get_current_user),
 ) -> None:
     note = await _get_note_or_404(session, vault_id, note_id, current_user)
+    version = await next_vault_version(session, vault_id)
+    await detach_notes(session, [note.id], version)
+    await record_tombstones(session, vault_id, [note.id], version)
+    await remove_notes(session, [note.id])
+    await delete_revisions(session, [note.id])
     await session.delete(note)
     await session.commit()
+    await response_cache.invalidate(vault_id)
+    await vault_events.publish(vault_id, version)
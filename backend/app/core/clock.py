@@ -0,0 +1,6 @@
+from datetime import UTC, datetime
+
+
+def utcnow() -> datetime:
+    """Marca temporal generada en la app (precisión de microsegundos en todos los motores)."""
+    return datetime.now(UTC)
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -15,6 +16,45 @@ class Settings(BaseSettings):
         default="http://localhost:8080,http://localhost:4321,http://localhost:3000,http://127.0.0.1:8080,http://127.0.0.1:4321,http://127.0.0.1:3000",
         validation_alias="ALLOW_ORIGINS",
     )
+    # create: create_all al arrancar (dev); check: solo verifica la revisión head de Alembic.
+    db_schema_startup: Literal["create", "check", "skip"] = Field(
+        default="create", validation_alias="DB_SCHEMA_STARTUP"
+    )
+    # URLs separadas por comas; vacío = todas las lecturas van a `DATABASE_URL`.
+    database_replica_urls: str = Field(default="", validation_alias="DATABASE_REPLICA_URLS")
+    read_your_writes_seconds: float = Field(
+        default=5, ge=0, validation_alias="READ_YOUR_WRITES_SECONDS"
+    )
+    read_your_writes_cache_size: int = Field(
+        default=10000, validation_alias="READ_YOUR_WRITES_CACHE_SIZE"
+    )
+    # Perfil de Postgres (los del pool también aplican a SQLite en archivo).
+    db_pool_size: int = Field(default=10, ge=1, validation_alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, ge=0, validation_alias="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(
+        default=30, gt=0, validation_alias="DB_POOL_TIMEOUT_SECONDS"
+    )
+    db_pool_recycle_seconds: int = Field(default=1800, validation_alias="DB_POOL_RECYCLE_SECONDS")
+    db_statement_cache_size: int = Field(
+        default=256, ge=0, validation_alias="DB_STATEMENT_CACHE_SIZE"
+    )
+    db_statement_timeout_ms: int = Field(
+        default=30000, ge=0, validation_alias="DB_STATEMENT_TIMEOUT_MS"
+    )
+    # Perfil de SQLite.
+    sqlite_journal_mode: Literal["wal", "delete", "truncate"] = Field(
+        default="wal", validation_alias="SQLITE_JOURNAL_MODE"
+    )
+    sqlite_synchronous: Literal["off", "normal", "full"] = Field(
+        default="normal", validation_alias="SQLITE_SYNCHRONOUS"
+    )
+    sqlite_busy_timeout_ms: int = Field(
+        default=5000, ge=0, validation_alias="SQLITE_BUSY_TIMEOUT_MS"
+    )
+    sqlite_mmap_size: int = Field(
+        default=256 * 1024 * 1024, ge=0, validation_alias="SQLITE_MMAP_SIZE"
+    )
+    sqlite_writer_queue: bool = Field(default=True, validation_alias="SQLITE_WRITER_QUEUE")
     app_timezone: str = Field(default="UTC", validation_alias="APP_TIMEZONE")
     payment_webhook_token: str = Field(
         default="dev-webhook-token", validation_alias="PAYMENT_WEBHOOK_TOKEN"
@@ -24,6 +64,79 @@ class Settings(BaseSettings):
         default="dev-insecure-secret-change", validation_alias="AUTH_SECRET_KEY"
     )
     auth_algorithm: str = Field(default="HS256", validation_alias="AUTH_ALGORITHM")
+    password_bcrypt_rounds: int = Field(
+        default=12, ge=4, le=31, validation_alias="PASSWORD_BCRYPT_ROUNDS"
+    )
+    password_hash_workers: int = Field(default=2, ge=1, validation_alias="PASSWORD_HASH_WORKERS")
+    password_hash_max_queue: int = Field(
+        default=32, ge=0, validation_alias="PASSWORD_HASH_MAX_QUEUE"
+    )
+    auth_token_cache_size: int = Field(default=4096, validation_alias="AUTH_TOKEN_CACHE_SIZE")
+    auth_user_cache_size: int = Field(default=1024, validation_alias="AUTH_USER_CACHE_SIZE")
+    auth_user_cache_ttl_seconds: float = Field(
+        default=60, validation_alias="AUTH_USER_CACHE_TTL_SECONDS"
+    )
+    # Control de admisión de auth (bcrypt) y escrituras de notas.
+    rate_limit_enabled: bool = Field(default=True, validation_alias="RATE_LIMIT_ENABLED")
+    rate_limit_backend: Literal["local", "postgres"] = Field(
+        default="local", validation_alias="RATE_LIMIT_BACKEND"
+    )
+    rate_limit_max_keys: int = Field(default=100000, ge=1, validation_alias="RATE_LIMIT_MAX_KEYS")
+    auth_rate_limit_ip_per_minute: float = Field(
+        default=30, ge=0, validation_alias="AUTH_RATE_LIMIT_IP_PER_MINUTE"
+    )
+    auth_rate_limit_ip_burst: int = Field(
+        default=10, ge=0, validation_alias="AUTH_RATE_LIMIT_IP_BURST"
+    )
+    auth_rate_limit_account_per_minute: float = Field(
+        default=10, ge=0, validation_alias="AUTH_RATE_LIMIT_ACCOUNT_PER_MINUTE"
+    )
+    auth_rate_limit_account_burst: int = Field(
+        default=5, ge=0, validation_alias="AUTH_RATE_LIMIT_ACCOUNT_BURST"
+    )
+    auth_max_concurrency: int = Field(default=16, ge=0, validation_alias="AUTH_MAX_CONCURRENCY")
+    note_write_rate_limit_per_minute: float = Field(
+        default=600, ge=0, validation_alias="NOTE_WRITE_RATE_LIMIT_PER_MINUTE"
+    )
+    note_write_rate_limit_burst: int = Field(
+        default=120, ge=0, validation_alias="NOTE_WRITE_RATE_LIMIT_BURST"
+    )
+    note_write_max_concurrency: int = Field(
+        default=64, ge=0, validation_alias="NOTE_WRITE_MAX_CONCURRENCY"
+    )
+    metrics_enabled: bool = Field(default=True, validation_alias="METRICS_ENABLED")
+    events_backend: Literal["local", "postgres"] = Field(
+        default="local", validation_alias="EVENTS_BACKEND"
+    )
+    note_revisions_retention_days: int = Field(
+        default=90, ge=1, validation_alias="NOTE_REVISIONS_RETENTION_DAYS"
+    )
+    note_revisions_max: int = Field(default=200, ge=1, validation_alias="NOTE_REVISIONS_MAX")
+    note_revisions_prune_interval_seconds: float = Field(
+        default=3600, ge=0, validation_alias="NOTE_REVISIONS_PRUNE_INTERVAL_SECONDS"
+    )
+    note_tombstones_retention_days: int = Field(
+        default=30, ge=1, validation_alias="NOTE_TOMBSTONES_RETENTION_DAYS"
+    )
+    note_tombstones_prune_interval_seconds: float = Field(
+        default=3600, ge=0, validation_alias="NOTE_TOMBSTONES_PRUNE_INTERVAL_SECONDS"
+    )
+    user_provisioning_retry_interval_seconds: float = Field(
+        default=60, ge=0, validation_alias="USER_PROVISIONING_RETRY_INTERVAL_SECONDS"
+    )
+    response_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024, ge=0, validation_alias="RESPONSE_CACHE_MAX_BYTES"
+    )
+    response_cache_max_entry_bytes: int = Field(
+        default=1024 * 1024, ge=0, validation_alias="RESPONSE_CACHE_MAX_ENTRY_BYTES"
+    )
+    response_cache_backend: Literal["local", "postgres"] = Field(
+        default="local", validation_alias="RESPONSE_CACHE_BACKEND"
+    )
+    graph_layout_cache_size: int = Field(default=64, validation_alias="GRAPH_LAYOUT_CACHE_SIZE")
+    graph_layout_cache_ttl_seconds: float = Field(
+        default=86400, validation_alias="GRAPH_LAYOUT_CACHE_TTL_SECONDS"
+    )
     cors_allow_all: bool = Field(default=False, validation_alias="CORS_ALLOW_ALL")
 
     model_config = SettingsConfigDict(
@@ -40,6 +153,10 @@ class Settings(BaseSettings):
             return ["http://localhost:8080", "http://localhost:4321", "http://localhost:3000"]
         return [item.strip() for item in raw.split(",") if item.strip()]
 
+    @property
+    def database_replica_urls_list(self) -> list[str]:
+        return [item.strip() for item in self.database_replica_urls.split(",") if item.strip()]
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,299 @@
+"""Métricas en formato de texto de Prometheus, sin dependencias externas.
+
+Registro mínimo (contadores, gauges e histogramas con etiquetas) para un solo proceso: con
+varios workers cada uno expone las suyas y Prometheus las agrega.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+LabelValues = tuple[str, ...]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape(value: str) -> str:
+    return _escape_help(value).replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric(ABC):
+    """Base de cada métrica: cabeceras HELP/TYPE más las muestras de `samples`."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _check(self, labels: LabelValues) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} espera etiquetas {self.labelnames}, recibió {labels}")
+
+    def header(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {_escape_help(self.documentation)}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]: ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._check(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        self._check(labels)
+        with self._lock:
+            self._values[labels] = value
+
+
+class CallbackGauge(_Metric):
+    """Gauge sin etiquetas cuyo valor se calcula al hacer scrape."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]) -> None:
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def samples(self) -> Iterator[str]:
+        yield f"{self.name} {_format_value(self.callback())}"
+
+
+@dataclass(slots=True)
+class _HistogramSeries:
+    counts: list[int]
+    total: float = 0.0
+    count: int = 0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        self._check(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = _HistogramSeries([0] * len(self.buckets))
+            if index < len(self.buckets):
+                series.counts[index] += 1
+            series.total += value
+            series.count += 1
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            snapshot = [
+                (labels, list(series.counts), series.total, series.count)
+                for labels, series in self._series.items()
+            ]
+        names = (*self.labelnames, "le")
+        for labels, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                bucket_labels = _labels(names, (*labels, _format_value(bound)))
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_bucket{_labels(names, (*labels, '+Inf'))} {count}"
+            base = _labels(self.labelnames, labels)
+            yield f"{self.name}_sum{base} {_format_value(total)}"
+            yield f"{self.name}_count{base} {count}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "Peticiones HTTP completadas.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Latencia de las peticiones HTTP (hasta enviar el último byte).",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "Peticiones HTTP en curso.", ("method",)
+)
+HTTP_REQUEST_DB_STATEMENTS = registry.histogram(
+    "http_request_db_statements",
+    "Sentencias SQL emitidas por petición.",
+    ("method", "route"),
+    STATEMENT_COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_DURATION = registry.histogram(
+    "http_request_db_seconds",
+    "Tiempo total en la base de datos por petición.",
+    ("method", "route"),
+)
+DB_STATEMENT_DURATION = registry.histogram(
+    "db_statement_duration_seconds",
+    "Duración de cada sentencia SQL.",
+    ("operation",),
+    DB_LATENCY_BUCKETS,
+)
+DB_POOL_CHECKOUT_DURATION = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Espera para obtener una conexión del pool (incluye abrirla si hace falta).",
+    buckets=DB_LATENCY_BUCKETS,
+)
+DB_SQLITE_WRITER_WAIT = registry.histogram(
+    "db_sqlite_writer_wait_seconds",
+    "Espera en la cola de escritores de SQLite antes de la primera escritura.",
+    buckets=DB_LATENCY_BUCKETS,
+)
+ADMISSION_REJECTIONS = registry.counter(
+    "admission_rejections_total",
+    "Peticiones rechazadas por el control de admisión (rate = 429, concurrency = 503).",
+    ("scope", "reason"),
+)
+ADMISSION_IN_FLIGHT = registry.gauge(
+    "admission_in_flight", "Peticiones admitidas en curso por tipo.", ("scope",)
+)
+RESPONSE_CACHE_REQUESTS = registry.counter(
+    "response_cache_requests_total",
+    "Lecturas de vault servidas por la caché de respuestas (hit, shared_hit, miss).",
+    ("endpoint", "result"),
+)
+RESPONSE_CACHE_BYTES = registry.gauge(
+    "response_cache_bytes", "Bytes de respuestas en la caché local del worker."
+)
+USER_PROVISIONING = registry.counter(
+    "user_provisioning_total",
+    "Aprovisionamientos del vault por defecto en segundo plano (created, failed).",
+    ("result",),
+)
+APP_STARTUP_DURATION = registry.gauge(
+    "app_startup_seconds",
+    "Duración del arranque del worker por fase (import de la app, lifespan).",
+    ("phase",),
+)
+PASSWORD_HASH_DURATION = registry.histogram(
+    "password_hash_seconds", "Tiempo de cómputo de bcrypt por operación."
+)
+PASSWORD_HASH_QUEUE_DURATION = registry.histogram(
+    "password_hash_queue_seconds", "Espera de bcrypt en la cola del pool de hilos."
+)
+
+
+@dataclass(slots=True)
+class RequestDbStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# Acumulador de la petición en curso; los eventos del engine lo ven desde el greenlet de
+# SQLAlchemy porque comparte el contexto de la tarea.
+current_request_db: ContextVar[RequestDbStats | None] = ContextVar(
+    "current_request_db", default=None
+)
+
+
+def record_statement(statement: str, seconds: float) -> None:
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    if operation not in {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}:
+        operation = "OTHER"
+    DB_STATEMENT_DURATION.observe(operation, value=seconds)
+    stats = current_request_db.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += seconds
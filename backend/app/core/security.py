@@ -1,35 +1,154 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from types import SimpleNamespace
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 
-import bcrypt
 import jwt
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metrics import (
+    ADMISSION_REJECTIONS,
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_QUEUE_DURATION,
+    CallbackGauge,
+    registry,
+)
 
-# Parche para compatibilidad: algunas versiones de bcrypt no exponen __about__,
-# lo que rompe passlib. Normalizamos aquí.
-bcrypt_module = cast(Any, bcrypt)
-if not hasattr(bcrypt_module, "__about__"):
-    bcrypt_module.__about__ = SimpleNamespace(__version__=getattr(bcrypt_module, "__version__", ""))
-bcrypt_backend = getattr(bcrypt_module, "_bcrypt", None)
-if bcrypt_backend is not None and not hasattr(bcrypt_backend, "__about__"):
-    bcrypt_backend.__about__ = bcrypt_module.__about__
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bool(pwd_context.verify(plain_password, hashed_password))
+@lru_cache(maxsize=1)
+def password_context() -> CryptContext:
+    """Contexto de passlib, creado en el primer uso: passlib y bcrypt no cargan al importar."""
+    import bcrypt
+    from passlib.context import CryptContext
+
+    # Parche para compatibilidad: algunas versiones de bcrypt no exponen __about__,
+    # lo que rompe passlib. Normalizamos aquí.
+    bcrypt_module = cast(Any, bcrypt)
+    if not hasattr(bcrypt_module, "__about__"):
+        bcrypt_module.__about__ = SimpleNamespace(
+            __version__=getattr(bcrypt_module, "__version__", "")
+        )
+    bcrypt_backend = getattr(bcrypt_module, "_bcrypt", None)
+    if bcrypt_backend is not None and not hasattr(bcrypt_backend, "__about__"):
+        bcrypt_backend.__about__ = bcrypt_module.__about__
+
+    # min = max = default: cualquier hash con otro coste se marca para rehash en el login.
+    rounds = settings.password_bcrypt_rounds
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+@dataclass(slots=True)
+class HashingStats:
+    """Operaciones bcrypt en cola o en ejecución (acota la cola del pool)."""
+
+    in_flight: int = 0
+
+
+hashing_stats = HashingStats()
+registry.register(
+    CallbackGauge(
+        "password_hash_in_flight",
+        "Operaciones bcrypt en cola o en ejecución.",
+        lambda: hashing_stats.in_flight,
+    )
+)
+_in_flight_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.password_hash_workers, thread_name_prefix="bcrypt"
+        )
+    return _executor
+
+
+def shutdown_password_hasher() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run_in_hash_pool(func: Callable[..., T], *args: Any) -> T:
+    """Ejecuta bcrypt fuera del event loop; el tamaño del pool limita la concurrencia.
+
+    La cola del pool también está acotada: con `PASSWORD_HASH_MAX_QUEUE` operaciones ya
+    esperando se responde 503 en lugar de encolar sin límite.
+    """
+    if hashing_stats.in_flight >= settings.password_hash_workers + settings.password_hash_max_queue:
+        ADMISSION_REJECTIONS.inc("password_hash", "queue")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado, reintenta en unos segundos",
+            headers={"Retry-After": "1"},
+        )
+    submitted = time.perf_counter()
+
+    def timed() -> T:
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            queued = started - submitted
+            PASSWORD_HASH_QUEUE_DURATION.observe(value=queued)
+            PASSWORD_HASH_DURATION.observe(value=time.perf_counter() - started)
+            if queued > 1.0:
+                logger.warning("bcrypt esperó %.2fs en cola (pool saturado)", queued)
+
+    future = _get_executor().submit(timed)
+    with _in_flight_lock:
+        hashing_stats.in_flight += 1
+    # Se libera cuando el trabajo termina en el pool (o se cancela antes de empezar), no
+    # cuando se cancela quien espera: un cliente que se desconecta no lo saca de la cola.
+    future.add_done_callback(_release_hash_slot)
+    return await asyncio.wrap_future(future)
+
+
+def _release_hash_slot(_future: Future[Any]) -> None:
+    with _in_flight_lock:
+        hashing_stats.in_flight -= 1
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    valid, new_hash = password_context().verify_and_update(plain_password, hashed_password)
+    return bool(valid), None if new_hash is None else str(new_hash)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verifica en el pool; si el hash usa otro coste devuelve también el nuevo hash."""
+    return await _run_in_hash_pool(_verify_and_update, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     try:
-        return str(pwd_context.hash(password))
+        return str(password_context().hash(password))
     except ValueError as exc:
         # bcrypt errors (e.g., len >72 bytes) se devuelven como 400
         raise HTTPException(
@@ -38,6 +157,10 @@ def get_password_hash(password: str) -> str:
         ) from exc
 
 
+async def hash_password(password: str) -> str:
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
 def create_access_token(subject: str) -> str:
     expire_minutes = settings.auth_token_ttl_minutes
     expire = datetime.now(UTC) + timedelta(minutes=expire_minutes)
@@ -0,0 +1,142 @@
+"""Perfiles de engine por backend: opciones del pool y del driver, PRAGMAs de SQLite.
+
+SQLite en archivo usa WAL (lectores y un escritor en paralelo), `synchronous=NORMAL`
+(seguro con WAL: solo arriesga la última transacción ante un corte de luz), `busy_timeout`
+y `mmap_size`. Además las escrituras del proceso pasan por una cola FIFO: SQLite admite un
+solo escritor y, sin cola, las transacciones concurrentes compiten en el busy handler de
+SQLite (sondeo con esperas crecientes, sin orden) hasta agotar el timeout con
+"database is locked".
+
+Postgres usa un pool dimensionado por configuración, caché de sentencias preparadas de
+asyncpg (0 para PgBouncer en modo transacción) y `statement_timeout` de servidor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+import weakref
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.util import await_only
+
+from app.core.config import Settings
+from app.core.metrics import DB_SQLITE_WRITER_WAIT
+
+_WRITE_STATEMENT = re.compile(r"\s*(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+_WRITER_KEY = "sqlite_writer_lock"
+
+
+def is_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(url: URL, settings: Settings) -> dict[str, Any]:
+    """Argumentos de `create_async_engine` para el backend de `url` (sin `poolclass`)."""
+    if is_memory_sqlite(url):
+        # SQLite en memoria necesita su StaticPool (una única conexión compartida).
+        return {}
+    options: dict[str, Any] = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "asyncpg":
+        server_settings = {}
+        if settings.db_statement_timeout_ms:
+            server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+        options["connect_args"] = {
+            # Caché del dialecto de SQLAlchemy y caché propia de asyncpg.
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "statement_cache_size": settings.db_statement_cache_size,
+            "server_settings": server_settings,
+        }
+    return options
+
+
+class SQLiteWriterQueue:
+    """Un escritor a la vez por proceso, en orden de llegada.
+
+    La conexión toma el turno en su primer INSERT/UPDATE/DELETE (donde el driver abre la
+    transacción) y lo suelta al volver al pool, ya confirmada o deshecha. Las lecturas no
+    esperan. Con varios procesos sobre el mismo archivo sigue mandando `busy_timeout`.
+    Ningún escritor debe mantener la transacción abierta mientras espera al cliente (p. ej.
+    entre eventos de una respuesta en streaming): confirma antes de ceder el control.
+    """
+
+    def __init__(self, timeout: float | None) -> None:
+        self.timeout = timeout
+        # Un lock por event loop: los tests y scripts crean loops nuevos.
+        self._locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+    def acquire(self, info: dict[Any, Any]) -> None:
+        """Se llama desde eventos síncronos del engine, dentro del greenlet de asyncio."""
+        if _WRITER_KEY in info:
+            return
+        lock = self._lock()
+        started = time.perf_counter()
+        try:
+            await_only(asyncio.wait_for(lock.acquire(), self.timeout))
+        except TimeoutError as error:
+            raise exc.TimeoutError(
+                f"Sin turno de escritura en SQLite tras {self.timeout} s"
+            ) from error
+        finally:
+            DB_SQLITE_WRITER_WAIT.observe(value=time.perf_counter() - started)
+        info[_WRITER_KEY] = lock
+
+    def release(self, info: dict[Any, Any]) -> None:
+        lock = info.pop(_WRITER_KEY, None)
+        if lock is not None:
+            lock.release()
+
+
+def configure_sqlite(sync_engine: Engine, settings: Settings) -> SQLiteWriterQueue | None:
+    """PRAGMAs por conexión y, si está activa, la cola de escritores."""
+    memory = is_memory_sqlite(sync_engine.url)
+    pragmas = [
+        f"PRAGMA busy_timeout = {settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA synchronous = {settings.sqlite_synchronous.upper()}",
+    ]
+    if not memory:
+        pragmas += [
+            f"PRAGMA journal_mode = {settings.sqlite_journal_mode.upper()}",
+            f"PRAGMA mmap_size = {settings.sqlite_mmap_size}",
+        ]
+
+    @event.listens_for(sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection: Any, _record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    if memory or not settings.sqlite_writer_queue:
+        return None
+    timeout = settings.sqlite_busy_timeout_ms / 1000 or None
+    queue = SQLiteWriterQueue(timeout)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _wait_for_writer_turn(conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+        if _WRITE_STATEMENT.match(statement):
+            queue.acquire(conn.info)
+
+    @event.listens_for(sync_engine, "checkin")
+    def _release_writer_turn(_dbapi_connection: Any, record: Any) -> None:
+        if record is not None:
+            queue.release(record.info)
+
+    return queue
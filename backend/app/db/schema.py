@@ -0,0 +1,89 @@
+"""Preparación del esquema al arrancar: `create_all` (dev) o verificación contra Alembic.
+
+En modo `check` cada worker hace una sola consulta (`alembic_version`) y no arranca si la
+base no está en la revisión head; las migraciones se aplican antes del despliegue con
+`alembic upgrade head`. Las bases creadas con `create_all` se adoptan con `alembic stamp head`
+solo cuando ya tienen el esquema de los modelos actuales; si son anteriores, primero hay que
+aplicar los scripts de `app/scripts` (ver README).
+"""
+
+from __future__ import annotations
+
+import ast
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import cast
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.db.session import engine, init_db
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+
+class SchemaOutOfDateError(RuntimeError):
+    pass
+
+
+def _revision_ids(value: object) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(cast(Sequence[str], value))
+
+
+@lru_cache(maxsize=1)
+def alembic_heads() -> frozenset[str]:
+    """Revisiones head de `alembic/versions`.
+
+    Lee `revision`/`down_revision` de cada archivo con `ast` en lugar de cargar Alembic, que
+    solo importarlo cuesta más que el resto del arranque.
+    """
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in (MIGRATIONS_DIR / "versions").glob("*.py"):
+        values = {
+            node.target.id: ast.literal_eval(node.value)
+            for node in ast.parse(path.read_text(encoding="utf-8")).body
+            if isinstance(node, ast.AnnAssign)
+            and isinstance(node.target, ast.Name)
+            and node.target.id in ("revision", "down_revision")
+            and node.value is not None
+        }
+        if "revision" in values:
+            revisions.update(_revision_ids(values["revision"]))
+            parents.update(_revision_ids(values.get("down_revision")))
+    return frozenset(revisions - parents)
+
+
+async def database_revisions() -> frozenset[str]:
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except DBAPIError:
+            # Sin tabla `alembic_version`: la base nunca se migró (o se creó con create_all).
+            return frozenset()
+        return frozenset(result.scalars())
+
+
+async def verify_schema() -> None:
+    expected = alembic_heads()
+    current = await database_revisions()
+    if current != expected:
+        raise SchemaOutOfDateError(
+            "El esquema de la base no está en la revisión esperada "
+            f"(base: {sorted(current) or 'sin versión'}, código: {sorted(expected)}). "
+            "Ejecuta `alembic upgrade head`; si se creó con create_all, ponla al día con los "
+            "scripts de `app/scripts` y luego `alembic stamp head` (ver README)."
+        )
+
+
+async def prepare_schema() -> None:
+    if settings.db_schema_startup == "create":
+        await init_db()
+    elif settings.db_schema_startup == "check":
+        await verify_schema()
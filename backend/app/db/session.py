@@ -1,13 +1,117 @@
+import itertools
+import time
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKOUT_DURATION, CallbackGauge, record_statement, registry
+from app.db.profiles import configure_sqlite, engine_options, is_memory_sqlite
 
-engine = create_async_engine(settings.database_url, echo=False, future=True, pool_pre_ping=True)
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Pool por defecto de los drivers async que además mide la espera del checkout.
+
+    El evento `checkout` del pool llega con la conexión ya obtenida y no hay uno previo a
+    la espera, así que se mide alrededor de `connect()`, la API pública que usa el engine.
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_DURATION.observe(value=time.perf_counter() - started)
+
+
+def _engine_options(database_url: str) -> dict[str, Any]:
+    url = make_url(database_url)
+    options = engine_options(url, settings)
+    if not is_memory_sqlite(url):
+        options["poolclass"] = TimedQueuePool
+    return options
+
+
+def _create_engine(database_url: str) -> AsyncEngine:
+    created = create_async_engine(
+        database_url,
+        echo=False,
+        future=True,
+        pool_pre_ping=True,
+        **_engine_options(database_url),
+    )
+    # Antes que los listeners de métricas: la espera del turno de escritura no cuenta como SQL.
+    if created.dialect.name == "sqlite":
+        configure_sqlite(created.sync_engine, settings)
+    event.listen(created.sync_engine, "before_cursor_execute", _start_statement_timer)
+    event.listen(created.sync_engine, "after_cursor_execute", _record_statement)
+    event.listen(created.sync_engine, "handle_error", _discard_statement_timer)
+    return created
+
+
+def _start_statement_timer(conn: Any, *_args: Any) -> None:
+    conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+
+def _record_statement(conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+    started = conn.info["statement_started"].pop()
+    record_statement(statement, time.perf_counter() - started)
+
+
+def _discard_statement_timer(context: Any) -> None:
+    started = context.connection.info.get("statement_started") if context.connection else None
+    if started:
+        started.pop()
+
+
+engine = _create_engine(settings.database_url)
 async_session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+# Réplicas de solo lectura; las sesiones llevan `info["replica"]` para distinguirlas.
+replica_engines = [_create_engine(url) for url in settings.database_replica_urls_list]
+replica_sessions = [
+    async_sessionmaker(replica, expire_on_commit=False, class_=AsyncSession, info={"replica": True})
+    for replica in replica_engines
+]
+_next_replica = itertools.count()
+
+
+def replica_session() -> AsyncSession | None:
+    """Sesión sobre la siguiente réplica (round-robin), o None si no hay réplicas."""
+    if not replica_sessions:
+        return None
+    return replica_sessions[next(_next_replica) % len(replica_sessions)]()
+
+
+def _pool_stat(name: str) -> float:
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0.0
+    if name == "checked_out":
+        return float(pool.checkedout())
+    # Capacidad = tamaño fijo + overflow configurado.
+    return float(pool.size() + settings.db_max_overflow)
+
+
+registry.register(
+    CallbackGauge(
+        "db_pool_checked_out",
+        "Conexiones del pool en uso.",
+        lambda: _pool_stat("checked_out"),
+    )
+)
+registry.register(
+    CallbackGauge(
+        "db_pool_capacity",
+        "Conexiones máximas del pool (tamaño + overflow).",
+        lambda: _pool_stat("capacity"),
+    )
+)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -0,0 +1,44 @@
+"""Tipos de columna propios."""
+
+from __future__ import annotations
+
+import zlib
+from typing import Any
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+# Por debajo de esto zlib apenas gana y solo añade CPU.
+COMPRESSION_MIN_BYTES = 4096
+COMPRESSION_LEVEL = 6
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+
+
+class CompressedText(TypeDecorator[str]):
+    """Texto guardado como bytes; los cuerpos grandes viajan y se guardan comprimidos.
+
+    El primer byte indica el formato (0 = UTF-8 tal cual, 1 = zlib). Las filas escritas
+    antes del cambio en columnas TEXT de SQLite llegan como `str` y se devuelven igual.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: str | None, dialect: Dialect) -> bytes | None:
+        if value is None:
+            return None
+        raw = value.encode("utf-8", "surrogatepass")
+        if len(raw) >= COMPRESSION_MIN_BYTES:
+            packed = zlib.compress(raw, COMPRESSION_LEVEL)
+            if len(packed) < len(raw):
+                return _ZLIB + packed
+        return _RAW + raw
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> str | None:
+        if value is None or isinstance(value, str):
+            return value
+        data = bytes(value)
+        body = zlib.decompress(data[1:]) if data[:1] == _ZLIB else data[1:]
+        return body.decode("utf-8", "surrogatepass")
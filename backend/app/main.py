@@ -1,21 +1,71 @@
+import asyncio
+import contextlib
 import logging
+import time
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+import app as app_package
+from app.api.metrics import MetricsMiddleware
+from app.api.metrics import router as metrics_router
+from app.api.replica_routing import ReadYourWritesMiddleware
 from app.api.routes import api_router
 from app.core.config import settings
-from app.db.session import init_db
+from app.core.metrics import APP_STARTUP_DURATION
+from app.core.security import shutdown_password_hasher
+from app.db.schema import prepare_schema
+from app.services.provisioning import run_provisioning_retries
+from app.services.response_cache import response_cache
+from app.services.revisions import run_revision_retention
+from app.services.sync import run_tombstone_retention
+from app.services.vault_events import vault_events
 
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    await init_db()
+    started = time.perf_counter()
+    await prepare_schema()
+    await vault_events.start()
+    background: list[asyncio.Task[None]] = []
+    if settings.note_revisions_prune_interval_seconds > 0:
+        background.append(
+            asyncio.create_task(
+                run_revision_retention(settings.note_revisions_prune_interval_seconds)
+            )
+        )
+    if settings.note_tombstones_prune_interval_seconds > 0:
+        background.append(
+            asyncio.create_task(
+                run_tombstone_retention(settings.note_tombstones_prune_interval_seconds)
+            )
+        )
+    if settings.user_provisioning_retry_interval_seconds > 0:
+        background.append(
+            asyncio.create_task(
+                run_provisioning_retries(settings.user_provisioning_retry_interval_seconds)
+            )
+        )
+    startup_seconds = time.perf_counter() - started
+    APP_STARTUP_DURATION.set("lifespan", value=startup_seconds)
+    logger.info(
+        "Worker listo: import %.0f ms, arranque %.0f ms (esquema: %s)",
+        IMPORT_SECONDS * 1000,
+        startup_seconds * 1000,
+        settings.db_schema_startup,
+    )
     yield
+    for task in background:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await response_cache.flush()
+    await vault_events.stop()
+    shutdown_password_hasher()
 
 
 def create_app() -> FastAPI:
@@ -50,8 +100,14 @@ def create_app() -> FastAPI:
         return {"status": "ok", "app": settings.app_name, "environment": settings.environment}
 
     app.include_router(api_router, prefix=settings.api_prefix)
+    app.add_middleware(ReadYourWritesMiddleware)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics_router)
 
     return app
 
 
 app = create_app()
+IMPORT_SECONDS = time.perf_counter() - app_package.IMPORT_STARTED
+APP_STARTUP_DURATION.set("import", value=IMPORT_SECONDS)
@@ -1,5 +1,22 @@
-from app.models.note import Note
+from app.models.note import Note, content_digest
+from app.models.note_link import NoteLink
+from app.models.note_revision import NoteRevision
+from app.models.note_search import NoteSearchDocument
+from app.models.note_tombstone import NoteTombstone
+from app.models.rate_limit import RateLimitBucket
+from app.models.response_cache import ResponseCacheEntry
 from app.models.user import User
 from app.models.vault import Vault
 
-__all__ = ["Note", "User", "Vault"]
+__all__ = [
+    "Note",
+    "NoteLink",
+    "NoteRevision",
+    "NoteSearchDocument",
+    "NoteTombstone",
+    "RateLimitBucket",
+    "ResponseCacheEntry",
+    "User",
+    "Vault",
+    "content_digest",
+]
@@ -1,37 +1,107 @@
+import hashlib
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, cast
 from uuid import UUID, uuid4
 
-from sqlalchemy import JSON, Column, DateTime, String, Text, func
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, event, func, inspect
+from sqlalchemy.orm import InstanceState, deferred
 from sqlmodel import Field, Relationship, SQLModel
 
+from app.core.clock import utcnow
+from app.db.types import CompressedText
+
 if TYPE_CHECKING:
     from app.models.vault import Vault
 
 
+def content_digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _content_length_default(context: Any) -> int:
+    return len(context.get_current_parameters().get("content") or "")
+
+
+def _content_hash_default(context: Any) -> str:
+    return content_digest(context.get_current_parameters().get("content") or "")
+
+
+_content_column = Column("content", CompressedText, nullable=False)
+
+
 class Note(SQLModel, table=True):
     __tablename__ = "notes"
+    # Índice para el listado paginado por keyset (updated_at, id) dentro de un vault.
+    __table_args__ = (
+        Index("ix_notes_vault_updated_id", "vault_id", "updated_at", "id"),
+        Index("ix_notes_vault_version", "vault_id", "version"),
+    )
+    # raiseload: acceder a un `content` no cargado falla en vez de hacer IO implícita.
+    __mapper_args__ = {"properties": {"content": deferred(_content_column, raiseload=True)}}
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, nullable=False)
     title: str = Field(default="", sa_column=Column(String, nullable=False))
-    content: str = Field(default="", sa_column=Column(Text, nullable=False))
+    # Diferida: solo se lee si la consulta pide `undefer(Note.content)` o la columna.
+    content: str = Field(default="", sa_column=_content_column)
+    content_length: int = Field(
+        default=0,
+        sa_column=Column(
+            Integer, nullable=False, server_default="0", default=_content_length_default
+        ),
+        description="Caracteres de `content`, para no leer el cuerpo en rutas de metadatos.",
+    )
+    # SHA-256 de `content`; "" en filas anteriores a la columna sin migrar.
+    content_hash: str = Field(
+        default="",
+        sa_column=Column(
+            String(64), nullable=False, server_default="", default=_content_hash_default
+        ),
+    )
     links: list[str] = Field(
         default_factory=list,
         sa_column=Column(JSON, nullable=False, server_default="[]"),
-        description="IDs de notas conectadas dentro del mismo vault",
+        description=(
+            "IDs de notas conectadas dentro del mismo vault (copia ordenada de note_links)"
+        ),
     )
     vault_id: UUID = Field(foreign_key="vaults.id", nullable=False)
+    # Valor de Vault.version en la última escritura de la nota.
+    version: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    # Versión de la última escritura que cambió `content` (0 si no cambió desde el alta): los
+    # `content_patch` solo chocan con cambios de contenido, no con los de enlaces o título.
+    content_version: int = Field(
+        default=0, sa_column=Column(Integer, nullable=False, server_default="0")
+    )
+    # Timestamps generados en la app: CURRENT_TIMESTAMP de SQLite solo tiene segundos y
+    # rompe el orden estable que necesitan los cursores.
     created_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+        default_factory=utcnow,
+        sa_column=Column(
+            DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
+        ),
     )
     updated_at: datetime = Field(
+        default_factory=utcnow,
         sa_column=Column(
             DateTime(timezone=True),
+            default=utcnow,
             server_default=func.now(),
-            onupdate=func.now(),
+            onupdate=utcnow,
             nullable=False,
-        )
+        ),
     )
 
     # Relacion obligatoria al vault (no opcional para evitar problemas de resolucion)
     vault: "Vault" = Relationship(back_populates="notes")
+
+
+# Inserts/updates del ORM; los inserts Core sin estas claves usan los defaults de columna.
+@event.listens_for(Note, "before_insert")
+@event.listens_for(Note, "before_update")
+def _stamp_content_metadata(_mapper: Any, _connection: Any, note: Note) -> None:
+    state = cast(InstanceState[Note], inspect(note))
+    if "content" in state.dict and (state.pending or state.attrs.content.history.has_changes()):
+        note.content_length = len(note.content)
+        note.content_hash = content_digest(note.content)
+        if not state.pending:
+            note.content_version = note.version
@@ -0,0 +1,18 @@
+from uuid import UUID
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class NoteLink(SQLModel, table=True):
+    """Arista dirigida source -> target entre notas del mismo vault."""
+
+    __tablename__ = "note_links"
+    __table_args__ = (
+        Index("ix_note_links_target_source", "target_id", "source_id"),
+        Index("ix_note_links_vault_id", "vault_id"),
+    )
+
+    source_id: UUID = Field(foreign_key="notes.id", primary_key=True, ondelete="CASCADE")
+    target_id: UUID = Field(foreign_key="notes.id", primary_key=True, ondelete="CASCADE")
+    vault_id: UUID = Field(foreign_key="vaults.id", nullable=False, ondelete="CASCADE")
@@ -0,0 +1,34 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String
+from sqlmodel import Field, SQLModel
+
+from app.db.types import CompressedText
+
+
+class NoteRevision(SQLModel, table=True):
+    """Estado anterior de una nota: copia completa o delta inverso contra la siguiente.
+
+    La revisión más reciente no se guarda aquí: es la propia nota. Cada fila `snapshot`
+    corta la cadena de deltas, así que reconstruir una revisión aplica como mucho
+    `SNAPSHOT_INTERVAL - 1` deltas.
+    """
+
+    __tablename__ = "note_revisions"
+    __table_args__ = (Index("ix_note_revisions_superseded_at", "superseded_at"),)
+
+    note_id: UUID = Field(foreign_key="notes.id", primary_key=True, ondelete="CASCADE")
+    revision: int = Field(sa_column=Column(Integer, primary_key=True, autoincrement=False))
+    vault_id: UUID = Field(foreign_key="vaults.id", nullable=False, ondelete="CASCADE")
+    title: str = Field(sa_column=Column(String, nullable=False))
+    snapshot: bool = Field(sa_column=Column(Boolean, nullable=False))
+    # Contenido completo si `snapshot`; si no, delta JSON que reconstruye esta revisión
+    # a partir del contenido de la siguiente.
+    data: str = Field(sa_column=Column(CompressedText, nullable=False))
+    content_length: int = Field(sa_column=Column(Integer, nullable=False))
+    content_hash: str = Field(sa_column=Column(String(64), nullable=False))
+    # Versión y fecha de la escritura que produjo este estado, y cuándo fue reemplazado.
+    version: int = Field(sa_column=Column(Integer, nullable=False))
+    saved_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    superseded_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
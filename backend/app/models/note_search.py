@@ -0,0 +1,64 @@
+from typing import Any, cast
+from uuid import UUID
+
+from sqlalchemy import DDL, Column, Text, event
+from sqlmodel import Field, SQLModel
+
+
+class NoteSearchDocument(SQLModel, table=True):
+    """Copia en texto plano de título/contenido que alimenta el índice de búsqueda.
+
+    `content` guarda solo el principio de la nota (`search.INDEXED_CONTENT_MAX_CHARS`).
+
+    SQLite indexa esta tabla con FTS5 (external content) y Postgres con un `tsvector`
+    generado + GIN; ambos se crean vía DDL al crear la tabla.
+    """
+
+    __tablename__ = "note_search"
+
+    # INTEGER PRIMARY KEY = alias estable del rowid en SQLite (lo usa FTS5 como content_rowid).
+    id: int | None = Field(default=None, primary_key=True)
+    note_id: UUID = Field(foreign_key="notes.id", unique=True, nullable=False, ondelete="CASCADE")
+    vault_id: UUID = Field(foreign_key="vaults.id", index=True, nullable=False, ondelete="CASCADE")
+    title: str = Field(default="", sa_column=Column(Text, nullable=False))
+    content: str = Field(default="", sa_column=Column(Text, nullable=False))
+
+
+_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS note_search_fts USING fts5("
+    "title, content, content='note_search', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS note_search_ai AFTER INSERT ON note_search BEGIN "
+    "INSERT INTO note_search_fts(rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS note_search_ad AFTER DELETE ON note_search BEGIN "
+    "INSERT INTO note_search_fts(note_search_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS note_search_au AFTER UPDATE ON note_search BEGIN "
+    "INSERT INTO note_search_fts(note_search_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO note_search_fts(rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+)
+
+# `left()` evita superar el límite de 1MB de tsvector con notas enormes.
+_POSTGRES_DDL = (
+    "ALTER TABLE note_search ADD COLUMN IF NOT EXISTS document tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', left(content, 262144)), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_note_search_document ON note_search USING GIN (document)",
+)
+
+_table = cast(Any, NoteSearchDocument).__table__
+for _statement in _SQLITE_DDL:
+    event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in _POSTGRES_DDL:
+    event.listen(_table, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(
+    _table,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS note_search_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,24 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Column, DateTime, Index, Integer
+from sqlmodel import Field, SQLModel
+
+from app.core.clock import utcnow
+
+
+class NoteTombstone(SQLModel, table=True):
+    """Registro de notas borradas para la sincronización incremental (`/changes`)."""
+
+    __tablename__ = "note_tombstones"
+    __table_args__ = (
+        Index("ix_note_tombstones_vault_version", "vault_id", "version"),
+        Index("ix_note_tombstones_vault_deleted_at", "vault_id", "deleted_at"),
+    )
+
+    note_id: UUID = Field(primary_key=True, nullable=False)
+    vault_id: UUID = Field(foreign_key="vaults.id", nullable=False, ondelete="CASCADE")
+    version: int = Field(sa_column=Column(Integer, nullable=False))
+    deleted_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), default=utcnow, nullable=False)
+    )
@@ -0,0 +1,26 @@
+from typing import Any, cast
+
+from sqlalchemy import DDL, Boolean, Column, Double, event
+from sqlmodel import Field, SQLModel
+
+
+class RateLimitBucket(SQLModel, table=True):
+    """Estado GCRA de un límite de tasa compartido entre workers (`RATE_LIMIT_BACKEND=postgres`).
+
+    En Postgres la tabla es UNLOGGED: no genera WAL y tras una caída se vacía, lo que solo
+    equivale a empezar con los buckets llenos.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+
+    key: str = Field(primary_key=True)
+    # Instante Unix teórico de la próxima petición admitida.
+    tat: float = Field(sa_column=Column(Double, nullable=False))
+    allowed: bool = Field(sa_column=Column(Boolean, nullable=False))
+
+
+event.listen(
+    cast(Any, RateLimitBucket).__table__,
+    "after_create",
+    DDL("ALTER TABLE rate_limit_buckets SET UNLOGGED").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,28 @@
+from typing import Any, cast
+from uuid import UUID
+
+from sqlalchemy import DDL, Column, Integer, LargeBinary, event
+from sqlmodel import Field, SQLModel
+
+
+class ResponseCacheEntry(SQLModel, table=True):
+    """Respuesta JSON ya codificada de una lectura de vault (`RESPONSE_CACHE_BACKEND=postgres`).
+
+    Una fila por (vault, endpoint) con la última versión cacheada. En Postgres la tabla es
+    UNLOGGED: no genera WAL y tras una caída se vacía, lo que solo equivale a una caché fría.
+    """
+
+    __tablename__ = "response_cache_entries"
+
+    # Sin FK a `vaults`: es una caché, las filas huérfanas solo ocupan sitio hasta invalidarse.
+    vault_id: UUID = Field(primary_key=True)
+    kind: str = Field(primary_key=True)
+    version: int = Field(sa_column=Column(Integer, nullable=False))
+    body: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+
+
+event.listen(
+    cast(Any, ResponseCacheEntry).__table__,
+    "after_create",
+    DDL("ALTER TABLE response_cache_entries SET UNLOGGED").execute_if(dialect="postgresql"),
+)
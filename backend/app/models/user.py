@@ -2,15 +2,26 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, DateTime, String, func
+from sqlalchemy import Column, DateTime, Index, String, func, text
 from sqlmodel import Field, Relationship, SQLModel
 
+from app.core.clock import utcnow
+
 if TYPE_CHECKING:
     from app.models.vault import Vault
 
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        # Solo los usuarios a medio aprovisionar: lo que recorre el reintento en segundo plano.
+        Index(
+            "ix_users_unprovisioned",
+            "created_at",
+            postgresql_where=text("provisioned_at IS NULL"),
+            sqlite_where=text("provisioned_at IS NULL"),
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, nullable=False)
     email: str = Field(
@@ -21,16 +32,27 @@ class User(SQLModel, table=True):
     display_name: str | None = Field(
         default=None, sa_column=Column(String, nullable=True, comment="Nombre visible del usuario")
     )
+    # Timestamps generados en la app para que los agregados creados en memoria no necesiten
+    # refresh tras el commit.
     created_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+        default_factory=utcnow,
+        sa_column=Column(
+            DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
+        ),
     )
     updated_at: datetime = Field(
+        default_factory=utcnow,
         sa_column=Column(
             DateTime(timezone=True),
+            default=utcnow,
             server_default=func.now(),
-            onupdate=func.now(),
+            onupdate=utcnow,
             nullable=False,
-        )
+        ),
+    )
+    # Vault por defecto creado (en segundo plano tras el registro); NULL = pendiente.
+    provisioned_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
     )
 
     vaults: list["Vault"] = Relationship(back_populates="owner")
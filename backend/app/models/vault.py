@@ -2,9 +2,11 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, DateTime, String, func
+from sqlalchemy import Column, DateTime, Integer, String, func
 from sqlmodel import Field, Relationship, SQLModel
 
+from app.core.clock import utcnow
+
 if TYPE_CHECKING:
     from app.models.note import Note
     from app.models.user import User
@@ -16,17 +18,30 @@ class Vault(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True, nullable=False)
     name: str = Field(sa_column=Column(String, nullable=False))
     theme: str = Field(default="violet", sa_column=Column(String, nullable=False))
-    owner_id: UUID = Field(foreign_key="users.id", nullable=False)
+    # Contador que avanza con cada escritura del vault o sus notas (ETag y sync incremental).
+    version: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    # Versión hasta la que se podaron tombstones: un `since` anterior ya no tiene delta.
+    tombstones_pruned_version: int = Field(
+        default=0, sa_column=Column(Integer, nullable=False, server_default="0")
+    )
+    owner_id: UUID = Field(foreign_key="users.id", nullable=False, index=True)
+    # Timestamps generados en la app para que los agregados creados en memoria no necesiten
+    # refresh tras el commit.
     created_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+        default_factory=utcnow,
+        sa_column=Column(
+            DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
+        ),
     )
     updated_at: datetime = Field(
+        default_factory=utcnow,
         sa_column=Column(
             DateTime(timezone=True),
+            default=utcnow,
             server_default=func.now(),
-            onupdate=func.now(),
+            onupdate=utcnow,
             nullable=False,
-        )
+        ),
     )
 
     owner: "User" = Relationship(back_populates="vaults")
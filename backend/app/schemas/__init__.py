@@ -1,21 +1,75 @@
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenPayload, TokenResponse
+from app.schemas.graph import (
+    GraphEdge,
+    GraphLayoutNode,
+    GraphNode,
+    VaultGraph,
+    VaultGraphLayout,
+)
 from app.schemas.health import HealthStatus
-from app.schemas.notes import NoteBase, NoteCreate, NoteRead, NoteUpdate
+from app.schemas.imports import ImportFailure, ImportProgress, ImportResult
+from app.schemas.notes import (
+    NoteBase,
+    NoteBatchCreate,
+    NoteBatchDelete,
+    NoteBatchOperation,
+    NoteBatchRequest,
+    NoteBatchResult,
+    NoteBatchUpdate,
+    NoteContentEdit,
+    NoteContentPatch,
+    NoteCreate,
+    NotePage,
+    NotePatchAck,
+    NoteRead,
+    NoteSummary,
+    NoteSummaryPage,
+    NoteUpdate,
+)
+from app.schemas.revisions import NoteRevisionPage, NoteRevisionRead, NoteRevisionSummary
+from app.schemas.search import SearchHit, SearchPage
+from app.schemas.sync import VaultChanges
 from app.schemas.users import UserRead
 from app.schemas.vaults import VaultCreate, VaultRead, VaultUpdate, VaultWithNotes
 
 __all__ = [
+    "GraphEdge",
+    "GraphLayoutNode",
+    "GraphNode",
     "HealthStatus",
+    "ImportFailure",
+    "ImportProgress",
+    "ImportResult",
     "LoginRequest",
     "NoteBase",
+    "NoteBatchCreate",
+    "NoteBatchDelete",
+    "NoteBatchOperation",
+    "NoteBatchRequest",
+    "NoteBatchResult",
+    "NoteBatchUpdate",
+    "NoteContentEdit",
+    "NoteContentPatch",
     "NoteCreate",
+    "NotePage",
+    "NotePatchAck",
     "NoteRead",
+    "NoteRevisionPage",
+    "NoteRevisionRead",
+    "NoteRevisionSummary",
+    "NoteSummary",
+    "NoteSummaryPage",
     "NoteUpdate",
     "RegisterRequest",
+    "SearchHit",
+    "SearchPage",
     "TokenPayload",
     "TokenResponse",
     "UserRead",
+    "VaultChanges",
     "VaultCreate",
+    "VaultGraph",
+    "VaultGraphLayout",
     "VaultRead",
     "VaultUpdate",
     "VaultWithNotes",
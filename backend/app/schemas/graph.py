@@ -0,0 +1,29 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class GraphNode(BaseModel):
+    id: UUID
+    title: str
+
+
+class GraphEdge(BaseModel):
+    source: UUID
+    target: UUID
+
+
+class VaultGraph(BaseModel):
+    nodes: list[GraphNode] = Field(default_factory=list)
+    edges: list[GraphEdge] = Field(default_factory=list)
+
+
+class GraphLayoutNode(GraphNode):
+    x: float
+    y: float
+
+
+class VaultGraphLayout(BaseModel):
+    version: int = Field(description="Versión del vault para la que se calcularon las posiciones.")
+    nodes: list[GraphLayoutNode] = Field(default_factory=list)
+    edges: list[GraphEdge] = Field(default_factory=list)
@@ -0,0 +1,24 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+from app.schemas.vaults import VaultRead
+
+
+class ImportProgress(BaseModel):
+    type: Literal["progress"] = "progress"
+    processed: int
+    total: int
+
+
+class ImportResult(BaseModel):
+    type: Literal["done"] = "done"
+    vault: VaultRead
+    notes: int
+    links: int
+    unresolved_links: int
+
+
+class ImportFailure(BaseModel):
+    type: Literal["error"] = "error"
+    detail: str
@@ -1,7 +1,8 @@
 from datetime import datetime
+from typing import Annotated, Literal, Self
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class NoteBase(BaseModel):
@@ -14,16 +15,136 @@ class NoteCreate(NoteBase):
     pass
 
 
+class NoteContentEdit(BaseModel):
+    """Sustituye `content[start:end]` de la versión base por `text`.
+
+    Los offsets cuentan unidades UTF-16, como los índices de string del editor.
+    """
+
+    start: int = Field(ge=0)
+    end: int = Field(ge=0)
+    text: str = ""
+
+    @model_validator(mode="after")
+    def _check_range(self) -> Self:
+        if self.end < self.start:
+            raise ValueError("`end` no puede ser menor que `start`")
+        return self
+
+
+class NoteContentPatch(BaseModel):
+    """Edición incremental de `content` contra una versión base de la nota."""
+
+    base_version: int | None = Field(
+        default=None, description="`version` de la nota sobre la que se calculó el parche."
+    )
+    base_hash: str | None = Field(
+        default=None, description="SHA-256 (hex) del contenido base, alternativa a la versión."
+    )
+    edits: list[NoteContentEdit] = Field(
+        max_length=1000,
+        description="Ediciones ordenadas y sin solapes, con offsets del contenido base.",
+    )
+
+    @model_validator(mode="after")
+    def _check_patch(self) -> Self:
+        if self.base_version is None and self.base_hash is None:
+            raise ValueError("El parche necesita `base_version` o `base_hash`")
+        for previous, edit in zip(self.edits, self.edits[1:], strict=False):
+            if edit.start < previous.end:
+                raise ValueError("Las ediciones deben estar ordenadas y no solaparse")
+        return self
+
+
 class NoteUpdate(BaseModel):
     title: str | None = None
     content: str | None = None
+    content_patch: NoteContentPatch | None = None
     links: list[str] | None = None
 
+    @model_validator(mode="after")
+    def _check_content(self) -> Self:
+        if self.content is not None and self.content_patch is not None:
+            raise ValueError("Envía `content` o `content_patch`, no ambos")
+        return self
+
 
 class NoteRead(NoteBase):
     id: UUID
     vault_id: UUID
     created_at: datetime
     updated_at: datetime
+    version: int = Field(
+        default=0, description="Versión del vault en la última escritura de la nota."
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NotePatchAck(BaseModel):
+    """Respuesta de un `content_patch`: no repite el contenido, que ya tiene el cliente."""
+
+    id: UUID
+    version: int = Field(description="Nueva versión; sirve como `base_version` del siguiente.")
+    content_hash: str = Field(description="SHA-256 (hex) del contenido resultante.")
+
+
+class NoteSummary(BaseModel):
+    """Proyección sin `content` para listados de vaults grandes."""
+
+    id: UUID
+    vault_id: UUID
+    title: str
+    links: list[str] = Field(default_factory=list)
+    content_length: int = 0
+    created_at: datetime
+    updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class NotePage(BaseModel):
+    items: list[NoteRead]
+    next_cursor: str | None = None
+
+
+class NoteSummaryPage(BaseModel):
+    items: list[NoteSummary]
+    next_cursor: str | None = None
+
+
+class NoteBatchCreate(NoteBase):
+    op: Literal["create"]
+    temp_id: str | None = Field(
+        default=None,
+        description="ID temporal del cliente; otros `links` del mismo lote pueden usarlo.",
+    )
+
+
+class NoteBatchUpdate(NoteUpdate):
+    op: Literal["update"]
+    id: UUID
+
+
+class NoteBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+NoteBatchOperation = Annotated[
+    NoteBatchCreate | NoteBatchUpdate | NoteBatchDelete, Field(discriminator="op")
+]
+
+
+class NoteBatchRequest(BaseModel):
+    operations: list[NoteBatchOperation] = Field(min_length=1, max_length=500)
+
+
+class NoteBatchResult(BaseModel):
+    version: int = Field(default=0, description="Versión del vault tras aplicar el lote.")
+    created: list[NoteRead] = Field(default_factory=list)
+    updated: list[NoteRead] = Field(default_factory=list)
+    deleted: list[UUID] = Field(default_factory=list)
+    temp_ids: dict[str, UUID] = Field(
+        default_factory=dict, description="Mapa temp_id -> ID definitivo de las notas creadas."
+    )
@@ -0,0 +1,26 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class NoteRevisionSummary(BaseModel):
+    revision: int
+    title: str
+    content_length: int
+    content_hash: str = Field(description="SHA-256 del contenido de la revisión.")
+    version: int = Field(description="Versión del vault en la escritura que produjo el estado.")
+    saved_at: datetime
+    superseded_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NoteRevisionRead(NoteRevisionSummary):
+    note_id: UUID
+    content: str
+
+
+class NoteRevisionPage(BaseModel):
+    items: list[NoteRevisionSummary]
+    next_cursor: str | None = None
@@ -0,0 +1,15 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class SearchHit(BaseModel):
+    id: UUID
+    title: str
+    snippet: str = Field(description="Fragmento HTML-escapado con coincidencias en <mark>.")
+    rank: float = Field(description="Relevancia; mayor es mejor.")
+
+
+class SearchPage(BaseModel):
+    items: list[SearchHit] = Field(default_factory=list)
+    next_offset: int | None = None
@@ -0,0 +1,11 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.schemas.notes import NoteRead
+
+
+class VaultChanges(BaseModel):
+    version: int = Field(description="Versión actual del vault; úsala como `since` en la próxima.")
+    notes: list[NoteRead] = Field(default_factory=list)
+    deleted: list[UUID] = Field(default_factory=list)
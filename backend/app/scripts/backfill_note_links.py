@@ -0,0 +1,66 @@
+"""Rebuild the `note_links` edge table from the `links` JSON column of every note.
+
+Needed once for databases created before `note_links` existed. Idempotent: existing
+edges are dropped and rebuilt vault by vault. Dangling IDs and self-links are skipped.
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Any, cast
+from uuid import UUID
+
+from sqlalchemy import delete, insert
+from sqlmodel import select
+
+from app.db.session import async_session, engine
+from app.models import Note, NoteLink, Vault
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_vault(vault_id: UUID) -> int:
+    async with async_session() as session:
+        result = await session.execute(select(Note.id, Note.links).where(Note.vault_id == vault_id))
+        rows = result.all()
+        note_ids = {str(row.id) for row in rows}
+        edges = [
+            {"source_id": row.id, "target_id": UUID(target), "vault_id": vault_id}
+            for row in rows
+            for target in dict.fromkeys(row.links or [])
+            if target in note_ids and target != str(row.id)
+        ]
+        await session.execute(delete(NoteLink).where(cast(Any, NoteLink.vault_id) == vault_id))
+        if edges:
+            await session.execute(insert(NoteLink), edges)
+        await session.commit()
+        return len(edges)
+
+
+async def backfill() -> None:
+    async with async_session() as session:
+        result = await session.execute(select(Vault.id))
+        vault_ids = list(result.scalars().all())
+
+    total = 0
+    for vault_id in vault_ids:
+        total += await backfill_vault(vault_id)
+    logger.info("Rebuilt %d note links across %d vaults", total, len(vault_ids))
+    await engine.dispose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Rebuild note_links from Note.links using the configured DATABASE_URL."
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parse_args()
+    asyncio.run(backfill())
+
+
+if __name__ == "__main__":
+    main()
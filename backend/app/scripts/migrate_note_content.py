@@ -0,0 +1,103 @@
+"""Move `notes.content` to the compressed binary format and fill `content_length`/`content_hash`.
+
+Needed once for databases created before those columns existed. Adds the missing columns,
+converts the Postgres column from TEXT to BYTEA (SQLite keeps its column: old TEXT values
+are read as-is) and rewrites pending notes in batches ordered by id. Idempotent: only
+notes with an empty `content_hash` are rewritten.
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Any, cast
+
+from sqlalchemy import inspect, update
+from sqlalchemy.engine import Connection
+from sqlmodel import select
+
+from app.db.session import async_session, engine
+from app.models import Note, content_digest
+
+logger = logging.getLogger(__name__)
+
+
+def _column_types(connection: Connection) -> dict[str, str]:
+    columns = inspect(connection).get_columns("notes")
+    return {column["name"]: str(column["type"]).upper() for column in columns}
+
+
+async def migrate_schema() -> None:
+    async with engine.begin() as conn:
+        columns = await conn.run_sync(_column_types)
+        if "content_length" not in columns:
+            await conn.exec_driver_sql(
+                "ALTER TABLE notes ADD COLUMN content_length INTEGER NOT NULL DEFAULT 0"
+            )
+        if "content_hash" not in columns:
+            await conn.exec_driver_sql(
+                "ALTER TABLE notes ADD COLUMN content_hash VARCHAR(64) NOT NULL DEFAULT ''"
+            )
+        if conn.dialect.name == "postgresql" and columns["content"] != "BYTEA":
+            # 0x00 prefix = uncompressed UTF-8 (see CompressedText).
+            await conn.exec_driver_sql(
+                "ALTER TABLE notes ALTER COLUMN content TYPE BYTEA "
+                "USING '\\x00'::bytea || convert_to(content, 'UTF8')"
+            )
+
+
+async def backfill(batch_size: int) -> None:
+    total = 0
+    last_id = None
+    while True:
+        async with async_session() as session:
+            query = (
+                select(Note.id, Note.content)
+                .where(Note.content_hash == "")
+                .order_by(cast(Any, Note.id))
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                query = query.where(cast(Any, Note.id) > last_id)
+            rows = (await session.execute(query)).all()
+            if not rows:
+                break
+            for row in rows:
+                # Rewriting `content` compresses it above the threshold; `updated_at` is kept.
+                await session.execute(
+                    update(Note)
+                    .where(cast(Any, Note.id) == row.id)
+                    .values(
+                        content=row.content,
+                        content_length=len(row.content),
+                        content_hash=content_digest(row.content),
+                        updated_at=Note.updated_at,
+                    )
+                )
+            await session.commit()
+        total += len(rows)
+        last_id = rows[-1].id
+    logger.info("Rewrote %d notes", total)
+
+
+async def migrate(batch_size: int) -> None:
+    await migrate_schema()
+    await backfill(batch_size)
+    await engine.dispose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compress note bodies and fill content metadata using DATABASE_URL."
+    )
+    parser.add_argument("--batch-size", type=int, default=200, help="Notes per transaction.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    args = parse_args()
+    asyncio.run(migrate(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
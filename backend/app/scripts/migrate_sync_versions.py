@@ -0,0 +1,73 @@
+"""Add `vaults.version`, `notes.version` and `note_tombstones` for delta sync and ETags.
+
+Also adds `vaults.tombstones_pruned_version`, used by tombstone retention, and
+`notes.content_version`, which content patches compare against (set to the note version
+when the column is added).
+
+Needed once for databases created before those columns existed (`create_all` does not add
+columns to existing tables). Existing vaults and notes start at version 1, so a client
+polling `/changes?since=0` receives every note once. Idempotent: missing columns, indexes
+and tables are created, and only rows still at version 0 are updated.
+"""
+
+import asyncio
+import logging
+from typing import Any, cast
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+
+from app.db.session import engine
+from app.models import Note, NoteTombstone
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    ("vaults", "version"),
+    ("notes", "version"),
+    ("vaults", "tombstones_pruned_version"),
+    ("notes", "content_version"),
+)
+
+
+def _missing(connection: Connection) -> list[tuple[str, str]]:
+    inspector = inspect(connection)
+    existing = {
+        table: {column["name"] for column in inspector.get_columns(table)}
+        for table in ("vaults", "notes")
+    }
+    return [(table, column) for table, column in _COLUMNS if column not in existing[table]]
+
+
+def _create_indexes_and_tables(connection: Connection) -> None:
+    notes_table = cast(Any, Note).__table__
+    existing = {index["name"] for index in inspect(connection).get_indexes("notes")}
+    for index in notes_table.indexes:
+        if index.name == "ix_notes_vault_version" and index.name not in existing:
+            index.create(connection)
+    cast(Any, NoteTombstone).__table__.create(connection, checkfirst=True)
+
+
+async def migrate() -> None:
+    async with engine.begin() as conn:
+        missing = await conn.run_sync(_missing)
+        for table, column in missing:
+            await conn.exec_driver_sql(
+                f"ALTER TABLE {table} ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+            )
+        await conn.run_sync(_create_indexes_and_tables)
+        vaults = await conn.exec_driver_sql("UPDATE vaults SET version = 1 WHERE version = 0")
+        notes = await conn.exec_driver_sql("UPDATE notes SET version = 1 WHERE version = 0")
+        if ("notes", "content_version") in missing:
+            await conn.exec_driver_sql("UPDATE notes SET content_version = version")
+    logger.info("Versioned %d vaults and %d notes", vaults.rowcount, notes.rowcount)
+    await engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    asyncio.run(migrate())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Rebuild the full-text search documents (`note_search`) from the notes table.
+
+Needed once for databases created before search existed, or after restoring data
+outside the API. Idempotent: documents are replaced in batches ordered by note id.
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Any, cast
+
+from sqlalchemy.orm import undefer
+from sqlmodel import select
+
+from app.db.session import async_session, engine
+from app.models import Note
+from app.services.search import index_notes
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(batch_size: int) -> None:
+    total = 0
+    last_id = None
+    while True:
+        async with async_session() as session:
+            query = (
+                select(Note)
+                .options(undefer(cast(Any, Note.content)))
+                .order_by(cast(Any, Note.id))
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                query = query.where(cast(Any, Note.id) > last_id)
+            result = await session.execute(query)
+            notes = list(result.scalars().all())
+            if not notes:
+                break
+            await index_notes(session, notes)
+            await session.commit()
+        total += len(notes)
+        last_id = notes[-1].id
+    logger.info("Indexed %d notes", total)
+    await engine.dispose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Rebuild the search index from notes using the configured DATABASE_URL."
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Notes per transaction.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    args = parse_args()
+    asyncio.run(rebuild(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Control de admisión: rate limiting por clave y límite de concurrencia por worker.
+
+Los límites de tasa son token buckets expresados como GCRA: por clave solo se guarda el
+instante teórico de la próxima llegada (`tat`). Con `rate` peticiones por segundo y ráfaga
+`burst`, una petición entra si `max(tat, ahora) - ahora <= (burst - 1) / rate`, y entonces
+`tat` avanza `1 / rate`. Es el mismo comportamiento que un bucket de `burst` fichas que se
+rellena a `rate`, pero el estado es un único número y la actualización es atómica en SQL.
+
+El almacén `local` vive en el proceso (cada worker cuenta por su cuenta); `postgres`
+comparte los buckets entre workers con un upsert por petición.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+
+from sqlalchemy import Float, bindparam, text
+
+from app.core.config import settings
+from app.core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_REJECTIONS
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Cada cuánto el almacén de Postgres borra buckets ya llenos (equivalen a no tener fila).
+_PRUNE_INTERVAL_SECONDS = 60.0
+
+
+@dataclass(slots=True, frozen=True)
+class RateLimit:
+    per_minute: float
+    burst: int
+
+    @property
+    def interval(self) -> float:
+        return 60.0 / self.per_minute
+
+    @property
+    def tolerance(self) -> float:
+        return (self.burst - 1) * self.interval
+
+    @property
+    def enabled(self) -> bool:
+        return self.per_minute > 0 and self.burst > 0
+
+
+def gcra(tat: float | None, now: float, limit: RateLimit) -> tuple[float, float]:
+    """Nuevo `tat` y segundos de espera (0 si la petición entra)."""
+    start = now if tat is None else max(tat, now)
+    wait = start - now - limit.tolerance
+    if wait > 0:
+        return start, wait
+    return start + limit.interval, 0.0
+
+
+class RateLimitStore(Protocol):
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """Consume una ficha de `key`; devuelve los segundos hasta poder reintentar (0 = ok)."""
+        ...
+
+    def clear(self) -> None: ...
+
+
+class LocalRateLimitStore:
+    """Buckets en memoria del proceso, LRU acotado a `max_keys` claves."""
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._tats: OrderedDict[str, float] = OrderedDict()
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        tat, wait = gcra(self._tats.get(key), now, limit)
+        self._tats[key] = tat
+        self._tats.move_to_end(key)
+        while len(self._tats) > self.max_keys:
+            # La clave más antigua vuelve a empezar con el bucket lleno.
+            self._tats.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        self._tats.clear()
+
+
+_POSTGRES_TAKE = text(
+    """
+    INSERT INTO rate_limit_buckets AS b (key, tat, allowed)
+    VALUES (:key, :now + :interval, true)
+    ON CONFLICT (key) DO UPDATE SET
+        allowed = GREATEST(b.tat, :now) - :now <= :tolerance,
+        tat = CASE
+            WHEN GREATEST(b.tat, :now) - :now <= :tolerance
+            THEN GREATEST(b.tat, :now) + :interval
+            ELSE b.tat
+        END
+    RETURNING tat, allowed
+    """
+).bindparams(
+    bindparam("now", type_=Float),
+    bindparam("interval", type_=Float),
+    bindparam("tolerance", type_=Float),
+)
+
+
+class PostgresRateLimitStore:
+    """Buckets compartidos en la tabla `rate_limit_buckets` (un upsert atómico por petición).
+
+    `tat` es tiempo Unix: los relojes de los workers deben estar sincronizados (NTP).
+    """
+
+    def __init__(self) -> None:
+        self._last_prune = 0.0
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        now = time.time()
+        try:
+            return await self._take(key, limit, now)
+        except Exception:
+            # Sin almacén compartido se admite: el límite de concurrencia sigue protegiendo.
+            logger.warning("No se pudo consultar el límite de tasa %s", key, exc_info=True)
+            return 0.0
+
+    async def _take(self, key: str, limit: RateLimit, now: float) -> float:
+        async with engine.begin() as conn:
+            row = (
+                await conn.execute(
+                    _POSTGRES_TAKE,
+                    {
+                        "key": key,
+                        "now": now,
+                        "interval": limit.interval,
+                        "tolerance": limit.tolerance,
+                    },
+                )
+            ).one()
+            if now - self._last_prune > _PRUNE_INTERVAL_SECONDS:
+                self._last_prune = now
+                await conn.execute(
+                    text("DELETE FROM rate_limit_buckets WHERE tat < :now"), {"now": now}
+                )
+        if row.allowed:
+            return 0.0
+        return max(float(row.tat) - now - limit.tolerance, 0.0)
+
+    def clear(self) -> None:
+        return None
+
+
+class ConcurrencyLimiter:
+    """Peticiones en curso de un tipo por worker; por encima del límite se rechaza sin esperar.
+
+    Esperar en cola solo alarga la latencia de todas (y ocupa conexiones y memoria): con el
+    worker saturado es mejor un 503 inmediato y que el cliente reintente.
+    """
+
+    def __init__(self, scope: str, limit: int) -> None:
+        self.scope = scope
+        self.limit = limit
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        if self.limit > 0 and self.in_flight >= self.limit:
+            ADMISSION_REJECTIONS.inc(self.scope, "concurrency")
+            return False
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.set(self.scope, value=self.in_flight)
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.set(self.scope, value=self.in_flight)
+
+
+class AdmissionController:
+    def __init__(self, store: RateLimitStore, enabled: bool = True) -> None:
+        self.store = store
+        self.enabled = enabled
+
+    async def check_rate(self, scope: str, key: str, limit: RateLimit) -> float:
+        """Segundos que debe esperar `key` antes de reintentar en `scope` (0 = admitida)."""
+        if not self.enabled or not limit.enabled:
+            return 0.0
+        wait = await self.store.take(f"{scope}:{key}", limit)
+        if wait > 0:
+            ADMISSION_REJECTIONS.inc(scope, "rate")
+        return wait
+
+
+def build_store(backend: str) -> RateLimitStore:
+    if backend == "postgres":
+        return PostgresRateLimitStore()
+    return LocalRateLimitStore(settings.rate_limit_max_keys)
+
+
+AUTH_IP_LIMIT = RateLimit(settings.auth_rate_limit_ip_per_minute, settings.auth_rate_limit_ip_burst)
+AUTH_ACCOUNT_LIMIT = RateLimit(
+    settings.auth_rate_limit_account_per_minute, settings.auth_rate_limit_account_burst
+)
+NOTE_WRITE_LIMIT = RateLimit(
+    settings.note_write_rate_limit_per_minute, settings.note_write_rate_limit_burst
+)
+
+admission = AdmissionController(
+    build_store(settings.rate_limit_backend), enabled=settings.rate_limit_enabled
+)
+auth_concurrency = ConcurrencyLimiter("auth", settings.auth_max_concurrency)
+note_write_concurrency = ConcurrencyLimiter("note_write", settings.note_write_max_concurrency)
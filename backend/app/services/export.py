@@ -0,0 +1,200 @@
+"""Exportación en streaming de un vault (NDJSON o zip de Markdown).
+
+Las notas se leen con cursores del servidor (`yield_per`) en sesiones propias, porque la
+sesión del request se cierra antes de que termine la respuesta en streaming.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+import zipfile
+from collections import Counter
+from collections.abc import AsyncIterator
+from typing import Any, cast
+from uuid import UUID
+
+import orjson
+from sqlalchemy.engine import Row
+from sqlmodel import select
+
+from app.db.session import async_session
+from app.models import Note, NoteLink, Vault
+
+EXPORT_BATCH_SIZE = 500
+_UNSAFE_FILENAME_RE = re.compile(r'[\\/:*?"<>|#^\[\]\x00-\x1f]+')
+_MAX_STEM_LENGTH = 120
+
+_NOTE_COLUMNS: tuple[Any, ...] = (
+    Note.id,
+    Note.vault_id,
+    Note.title,
+    Note.content,
+    Note.links,
+    Note.created_at,
+    Note.updated_at,
+)
+
+
+def _dumps_line(payload: dict[str, Any]) -> bytes:
+    # asyncpg devuelve su propio tipo UUID, que orjson no reconoce.
+    return orjson.dumps(payload, default=str) + b"\n"
+
+
+def _stream_options() -> dict[str, Any]:
+    return {"yield_per": EXPORT_BATCH_SIZE}
+
+
+async def stream_ndjson(vault: Vault) -> AsyncIterator[bytes]:
+    """Una línea `vault` seguida de una línea `note` por nota, en orden de id."""
+    yield _dumps_line(
+        {
+            "type": "vault",
+            "id": vault.id,
+            "name": vault.name,
+            "theme": vault.theme,
+            "created_at": vault.created_at,
+            "updated_at": vault.updated_at,
+        }
+    )
+
+    async with async_session() as session:
+        result = await session.stream(
+            select(*_NOTE_COLUMNS)
+            .where(Note.vault_id == vault.id)
+            .order_by(cast(Any, Note.id))
+            .execution_options(**_stream_options())
+        )
+        async for partition in result.partitions():
+            yield b"".join(_dumps_line({"type": "note", **row._asdict()}) for row in partition)
+
+
+class _ZipSink(io.RawIOBase):
+    """Destino no seekable para `zipfile`: acumula bytes hasta que se drenan."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._buffer += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class _TargetTitles:
+    """Merge-join de aristas (ordenadas por source_id) con las notas (ordenadas por id)."""
+
+    def __init__(self, rows: AsyncIterator[Row[Any]]) -> None:
+        self._rows = rows
+        self._pending: Row[Any] | None = None
+        self._exhausted = False
+
+    async def for_source(self, source_id: UUID) -> dict[UUID, str]:
+        titles: dict[UUID, str] = {}
+        while True:
+            if self._pending is None:
+                if self._exhausted:
+                    return titles
+                try:
+                    self._pending = await anext(self._rows)
+                except StopAsyncIteration:
+                    self._exhausted = True
+                    return titles
+            if self._pending.source_id > source_id:
+                return titles
+            if self._pending.source_id == source_id:
+                titles[self._pending.target_id] = self._pending.title
+            self._pending = None
+
+
+def _base_stem(title: str) -> str:
+    return _UNSAFE_FILENAME_RE.sub("-", title).strip(" .")[:_MAX_STEM_LENGTH].strip(" .")
+
+
+def note_file_stem(note_id: UUID, title: str, colliding: set[str]) -> str:
+    """Nombre de archivo (sin `.md`) y destino de wikilink para una nota.
+
+    Si el nombre saneado se repite en el vault (sin distinguir mayúsculas, ver
+    `_colliding_stems`) o queda vacío, lleva un sufijo del id: así es único y se calcula
+    nota a nota, sin guardar el nombre de cada nota en memoria.
+    """
+    stem = _base_stem(title)
+    if not stem or stem.casefold() in colliding:
+        stem = f"{stem or 'Sin título'} ({note_id.hex[:8]})"
+    return stem
+
+
+def _render_markdown(row: Row[Any], target_titles: dict[UUID, str], colliding: set[str]) -> str:
+    lines = [
+        "---",
+        f"id: {row.id}",
+        f"title: {orjson.dumps(row.title).decode()}",
+        f"created: {row.created_at.isoformat()}",
+        f"updated: {row.updated_at.isoformat()}",
+    ]
+    wikilinks = []
+    for link in row.links or []:
+        target_id = UUID(link)
+        if target_id in target_titles:
+            stem = note_file_stem(target_id, target_titles[target_id], colliding)
+            wikilinks.append(f"[[{stem}]]")
+    if wikilinks:
+        lines.append("links:")
+        lines.extend(f"  - {orjson.dumps(wikilink).decode()}" for wikilink in wikilinks)
+    lines.extend(["---", "", row.content])
+    return "\n".join(lines)
+
+
+async def _colliding_stems(session: Any, vault_id: UUID) -> set[str]:
+    """Nombres saneados (en `casefold`) que comparten dos o más notas del vault.
+
+    Se calcula en Python sobre el nombre final: títulos distintos como "a/b" y "a:b" dan
+    el mismo archivo, y el `lower()` de SQLite solo convierte ASCII.
+    """
+    counts: Counter[str] = Counter()
+    result = await session.stream(
+        select(Note.title).where(Note.vault_id == vault_id).execution_options(**_stream_options())
+    )
+    async for title in result.scalars():
+        counts[_base_stem(title).casefold()] += 1
+    return {stem for stem, count in counts.items() if count > 1}
+
+
+async def stream_markdown_zip(vault: Vault) -> AsyncIterator[bytes]:
+    """Zip con un `.md` por nota (front-matter + `[[wikilinks]]` de `Note.links`).
+
+    Memoria: un lote de filas, la nota en curso y los nombres repetidos. Solo crece el
+    directorio central del zip (metadatos por archivo, exigidos por el formato).
+    """
+    sink = _ZipSink()
+    async with async_session() as notes_session, async_session() as links_session:
+        colliding = await _colliding_stems(notes_session, vault.id)
+        notes = await notes_session.stream(
+            select(*_NOTE_COLUMNS)
+            .where(Note.vault_id == vault.id)
+            .order_by(cast(Any, Note.id))
+            .execution_options(**_stream_options())
+        )
+        edges = await links_session.stream(
+            select(NoteLink.source_id, NoteLink.target_id, Note.title)
+            .join(Note, cast(Any, Note.id) == NoteLink.target_id)
+            .where(NoteLink.vault_id == vault.id)
+            .order_by(cast(Any, NoteLink.source_id))
+            .execution_options(**_stream_options())
+        )
+        targets = _TargetTitles(aiter(cast(Any, edges)))
+
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            async for row in notes:
+                stem = note_file_stem(row.id, row.title, colliding)
+                markdown = _render_markdown(row, await targets.for_source(row.id), colliding)
+                archive.writestr(f"{stem}.md", markdown)
+                yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any, cast
+from uuid import UUID
+
+from sqlalchemy import Uuid, case, literal, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Note, NoteLink
+from app.schemas.graph import GraphEdge, GraphNode, VaultGraph
+
+MAX_GRAPH_DEPTH = 5
+
+_links = cast(Any, NoteLink).__table__
+_notes = cast(Any, Note).__table__
+
+
+def _neighborhood_cte(vault_id: UUID, note_id: UUID, depth: int) -> Any:
+    """CTE recursiva con los IDs a <= `depth` saltos de `note_id`, sin importar la dirección."""
+    seed = select(literal(note_id, type_=Uuid()).label("note_id"), literal(0).label("depth")).cte(
+        "neighborhood", recursive=True
+    )
+    neighbor = case(
+        (_links.c.source_id == seed.c.note_id, _links.c.target_id),
+        else_=_links.c.source_id,
+    )
+    step = (
+        select(neighbor.label("note_id"), (seed.c.depth + 1).label("depth"))
+        .select_from(_links)
+        .join(
+            seed,
+            or_(_links.c.source_id == seed.c.note_id, _links.c.target_id == seed.c.note_id),
+        )
+        .where(_links.c.vault_id == vault_id, seed.c.depth < depth)
+    )
+    return seed.union(step)
+
+
+async def load_graph(
+    session: AsyncSession, vault_id: UUID, note_id: UUID | None = None, depth: int = 1
+) -> VaultGraph:
+    """Nodos (id, título) y aristas del vault o del vecindario de `note_id`; nunca lee `content`."""
+    nodes_query = select(_notes.c.id, _notes.c.title).where(_notes.c.vault_id == vault_id)
+    edges_query = select(_links.c.source_id, _links.c.target_id).where(
+        _links.c.vault_id == vault_id
+    )
+    if note_id is not None:
+        hood = _neighborhood_cte(vault_id, note_id, depth)
+        member_ids = select(hood.c.note_id)
+        nodes_query = nodes_query.where(_notes.c.id.in_(member_ids))
+        edges_query = edges_query.where(
+            _links.c.source_id.in_(member_ids), _links.c.target_id.in_(member_ids)
+        )
+
+    node_rows = (await session.execute(nodes_query.order_by(_notes.c.id))).all()
+    edge_rows = (await session.execute(edges_query)).all()
+    return VaultGraph(
+        nodes=[GraphNode(id=row.id, title=row.title) for row in node_rows],
+        edges=[GraphEdge(source=row.source_id, target=row.target_id) for row in edge_rows],
+    )
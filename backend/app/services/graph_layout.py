@@ -0,0 +1,277 @@
+"""Layout de fuerzas del grafo de notas calculado en el servidor.
+
+Fruchterman-Reingold vectorizado con NumPy: las aristas atraen con `d²/k` y todos los
+nodos se repelen con `k²/d`. Hasta `EXACT_REPULSION_MAX_NODES` la repulsión es exacta
+(todos contra todos, por bloques para acotar memoria); por encima se aproxima con una malla
+(partícula-malla): la masa se reparte en celdas y el campo de repulsión se obtiene con una
+convolución por FFT, así que cada iteración cuesta O(n + celdas·log celdas).
+
+Las posiciones se guardan por vault y versión. Cuando cambian pocas notas o enlaces se
+parte del layout anterior (los nodos nuevos junto a sus vecinos) con pocas iteraciones y
+temperatura baja, en lugar de recalcular desde cero.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import weakref
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, cast
+from uuid import UUID
+
+import numpy as np
+import orjson
+from numpy.typing import NDArray
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import Vault
+from app.services.graph import load_graph
+
+FloatArray = NDArray[np.float64]
+IntArray = NDArray[np.intp]
+
+COLD_ITERATIONS = 120
+WARM_ITERATIONS = 40
+WARM_TEMPERATURE = 1.0
+SETTLED_TEMPERATURE = 0.02
+EXACT_REPULSION_MAX_NODES = 500
+# Por encima de esta fracción de nodos + aristas cambiados se recalcula desde cero.
+WARM_START_MAX_CHANGE = 0.25
+_BLOCK_ROWS = 512
+_MESH_MAX_CELLS = 256
+_GRAVITY = 0.25
+
+
+@dataclass(slots=True, frozen=True)
+class GraphLayout:
+    version: int
+    node_ids: tuple[UUID, ...]
+    edges: frozenset[tuple[UUID, UUID]]
+    positions: FloatArray
+    body: bytes
+
+
+_layouts: TTLCache[UUID, GraphLayout] = TTLCache(
+    maxsize=settings.graph_layout_cache_size, ttl=settings.graph_layout_cache_ttl_seconds
+)
+_locks: weakref.WeakValueDictionary[UUID, asyncio.Lock] = weakref.WeakValueDictionary()
+
+
+def _exact_repulsion(pos: FloatArray) -> FloatArray:
+    x, y = pos[:, 0], pos[:, 1]
+    force = np.empty_like(pos)
+    for start in range(0, len(pos), _BLOCK_ROWS):
+        dx = x[start : start + _BLOCK_ROWS, None] - x
+        dy = y[start : start + _BLOCK_ROWS, None] - y
+        inverse = dx * dx
+        inverse += dy * dy
+        np.maximum(inverse, 1e-4, out=inverse)
+        np.reciprocal(inverse, out=inverse)
+        force[start : start + _BLOCK_ROWS, 0] = np.einsum("ij,ij->i", dx, inverse)
+        force[start : start + _BLOCK_ROWS, 1] = np.einsum("ij,ij->i", dy, inverse)
+    return force
+
+
+@lru_cache(maxsize=32)
+def _mesh_kernel(cells: int) -> tuple[NDArray[np.complex128], NDArray[np.complex128]]:
+    """FFT del núcleo r/(|r|² + h²) en unidades de celda (luego se divide por h)."""
+    padded = 2 * cells
+    offsets = np.fft.fftfreq(padded, d=1.0 / padded)
+    ox, oy = np.meshgrid(offsets, offsets, indexing="ij")
+    dist2 = ox * ox + oy * oy + 1.0
+    return np.fft.rfft2(ox / dist2), np.fft.rfft2(oy / dist2)
+
+
+def _mesh_repulsion(pos: FloatArray) -> FloatArray:
+    # Celdas de ~k/2 (k = 1) hasta `_MESH_MAX_CELLS` por lado; reparto bilineal (CIC).
+    low = pos.min(axis=0) - 1.0
+    span = float((pos.max(axis=0) + 1.0 - low).max())
+    cells = int(min(_MESH_MAX_CELLS, max(16, math.ceil(span * 2))))
+    size = span / (cells - 1)
+    grid = (pos - low) / size
+    base = np.minimum(np.floor(grid).astype(np.intp), cells - 2)
+    frac = grid - base
+    weights = (
+        (1 - frac[:, 0]) * (1 - frac[:, 1]),
+        frac[:, 0] * (1 - frac[:, 1]),
+        (1 - frac[:, 0]) * frac[:, 1],
+        frac[:, 0] * frac[:, 1],
+    )
+    corners = ((0, 0), (1, 0), (0, 1), (1, 1))
+    padded = 2 * cells
+    mass = np.zeros(padded * padded)
+    for (dx, dy), weight in zip(corners, weights, strict=True):
+        index = (base[:, 0] + dx) * padded + base[:, 1] + dy
+        mass += np.bincount(index, weights=weight, minlength=padded * padded)
+    # Convolución circular sobre la malla doble: sin solapes entre extremos opuestos.
+    mass_hat = np.fft.rfft2(mass.reshape(padded, padded)) / size
+    field = [
+        np.fft.irfft2(mass_hat * kernel_hat, s=(padded, padded))
+        for kernel_hat in _mesh_kernel(cells)
+    ]
+
+    force = np.zeros_like(pos)
+    for (dx, dy), weight in zip(corners, weights, strict=True):
+        ix, iy = base[:, 0] + dx, base[:, 1] + dy
+        force[:, 0] += weight * field[0][ix, iy]
+        force[:, 1] += weight * field[1][ix, iy]
+    return force
+
+
+def _attraction(pos: FloatArray, sources: IntArray, targets: IntArray) -> FloatArray:
+    delta = pos[sources] - pos[targets]
+    pull = delta * np.sqrt(np.einsum("ij,ij->i", delta, delta))[:, None]
+    count = len(pos)
+    force = np.empty_like(pos)
+    for axis in (0, 1):
+        force[:, axis] = np.bincount(targets, pull[:, axis], count) - np.bincount(
+            sources, pull[:, axis], count
+        )
+    return force
+
+
+def force_layout(
+    positions: FloatArray,
+    sources: IntArray,
+    targets: IntArray,
+    iterations: int,
+    temperature: float | FloatArray,
+) -> FloatArray:
+    """Itera Fruchterman-Reingold (k = 1) enfriando linealmente desde `temperature`.
+
+    `temperature` es el desplazamiento máximo por paso, global o por nodo.
+    """
+    pos = positions.copy()
+    if len(pos) < 2:
+        return pos
+    repulsion = _exact_repulsion if len(pos) <= EXACT_REPULSION_MAX_NODES else _mesh_repulsion
+    for step in range(iterations):
+        force = repulsion(pos) + _attraction(pos, sources, targets) - _GRAVITY * pos
+        length = np.sqrt(np.einsum("ij,ij->i", force, force))
+        limit = temperature * (1 - step / iterations)
+        scale = np.minimum(length, limit) / np.maximum(length, 1e-9)
+        pos += force * scale[:, None]
+    return pos
+
+
+def _edge_indices(
+    node_ids: Sequence[UUID], edges: Iterable[tuple[UUID, UUID]]
+) -> tuple[IntArray, IntArray]:
+    index = {node_id: position for position, node_id in enumerate(node_ids)}
+    pairs = [(index[a], index[b]) for a, b in edges if a in index and b in index]
+    array = np.array(pairs, dtype=np.intp).reshape(-1, 2)
+    return array[:, 0], array[:, 1]
+
+
+def compute_positions(
+    seed: int,
+    node_ids: Sequence[UUID],
+    edges: frozenset[tuple[UUID, UUID]],
+    previous: GraphLayout | None,
+) -> FloatArray:
+    """Posiciones para el grafo; parte de `previous` si el cambio es pequeño."""
+    rng = np.random.default_rng(seed)
+    count = len(node_ids)
+    if count == 0:
+        return np.zeros((0, 2))
+    sources, targets = _edge_indices(node_ids, edges)
+    if previous is not None:
+        old_index = {node_id: position for position, node_id in enumerate(previous.node_ids)}
+        kept = [old_index.get(node_id) for node_id in node_ids]
+        added = sum(position is None for position in kept)
+        changed_edges = edges ^ previous.edges
+        changed = added + (len(previous.node_ids) - (count - added)) + len(changed_edges)
+        if changed == 0:
+            return previous.positions[cast(list[int], kept)]
+        if changed <= WARM_START_MAX_CHANGE * max(count + len(edges), 1):
+            touched_sources, touched_targets = _edge_indices(node_ids, changed_edges)
+            touched = np.zeros(count, dtype=bool)
+            touched[touched_sources] = touched[touched_targets] = True
+            return _warm_start(rng, previous.positions, kept, touched, sources, targets)
+    radius = math.sqrt(max(count, 1))
+    start = rng.uniform(-radius, radius, size=(count, 2))
+    pos = force_layout(start, sources, targets, COLD_ITERATIONS, temperature=radius / 2)
+    pos -= pos.mean(axis=0)
+    return pos
+
+
+def _warm_start(
+    rng: np.random.Generator,
+    old_positions: FloatArray,
+    kept: list[int | None],
+    touched: NDArray[np.bool_],
+    sources: IntArray,
+    targets: IntArray,
+) -> FloatArray:
+    count = len(kept)
+    placed = np.array([position is not None for position in kept], dtype=bool)
+    pos = np.zeros((count, 2))
+    pos[placed] = old_positions[[position for position in kept if position is not None]]
+    # Cada nodo nuevo arranca en la media de sus vecinos ya colocados (o cerca del centro).
+    neighbor_sum = np.zeros((count, 2))
+    neighbor_count = np.zeros(count)
+    for a, b in ((sources, targets), (targets, sources)):
+        known = placed[b]
+        np.add.at(neighbor_sum, a[known], pos[b[known]])
+        np.add.at(neighbor_count, a[known], 1)
+    new = ~placed
+    with_neighbors = new & (neighbor_count > 0)
+    pos[with_neighbors] = neighbor_sum[with_neighbors] / neighbor_count[with_neighbors, None]
+    pos[new] += rng.normal(scale=0.5, size=(int(new.sum()), 2))
+    # Solo los nodos nuevos y los extremos de enlaces cambiados se mueven con libertad; el
+    # resto apenas se ajusta, para que el grafo no "salte" entre versiones.
+    temperature = np.where(new | touched, WARM_TEMPERATURE, SETTLED_TEMPERATURE)
+    return force_layout(pos, sources, targets, WARM_ITERATIONS, temperature)
+
+
+def _encode(
+    version: int, nodes: Sequence[tuple[UUID, str]], positions: FloatArray, edges: list[Any]
+) -> bytes:
+    rounded = np.round(positions, 2).tolist()
+    return orjson.dumps(
+        {
+            "version": version,
+            "nodes": [
+                {"id": node_id, "title": title, "x": x, "y": y}
+                for (node_id, title), (x, y) in zip(nodes, rounded, strict=True)
+            ],
+            "edges": edges,
+        },
+        default=str,
+    )
+
+
+async def vault_layout(session: AsyncSession, vault: Vault) -> bytes:
+    """JSON de `VaultGraphLayout` para la versión actual del vault (cacheado por versión)."""
+    cached = _layouts.get(vault.id)
+    if cached is not None and cached.version == vault.version:
+        return cached.body
+    lock = _locks.setdefault(vault.id, asyncio.Lock())
+    async with lock:
+        cached = _layouts.get(vault.id)
+        if cached is not None and cached.version == vault.version:
+            return cached.body
+        graph = await load_graph(session, vault.id)
+        nodes = [(node.id, node.title) for node in graph.nodes]
+        node_ids = tuple(node_id for node_id, _ in nodes)
+        # El layout no depende de la dirección ni de enlaces repetidos.
+        edges = frozenset(
+            (min(edge.source, edge.target), max(edge.source, edge.target)) for edge in graph.edges
+        )
+        # CPU en un hilo: NumPy suelta el GIL y el event loop sigue atendiendo.
+        positions = await asyncio.to_thread(
+            compute_positions, vault.id.int, node_ids, edges, cached
+        )
+        body = _encode(
+            vault.version,
+            nodes,
+            positions,
+            [{"source": edge.source, "target": edge.target} for edge in graph.edges],
+        )
+        _layouts.set(vault.id, GraphLayout(vault.version, node_ids, edges, positions, body))
+        return body
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable
+from typing import Any, cast
+from uuid import UUID
+
+from sqlalchemy import delete, insert, or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Note, NoteLink
+
+
+def parse_link_ids(raw_links: Iterable[str], current_note_id: UUID | None) -> list[UUID]:
+    """IDs válidos, en orden, sin duplicados ni autoenlace."""
+    candidates: list[UUID] = []
+    seen: set[UUID] = set()
+    for link in raw_links:
+        try:
+            link_id = UUID(str(link))
+        except ValueError:
+            continue
+        if link_id == current_note_id or link_id in seen:
+            continue
+        candidates.append(link_id)
+        seen.add(link_id)
+    return candidates
+
+
+async def existing_note_ids(
+    session: AsyncSession, vault_id: UUID, candidates: Collection[UUID]
+) -> set[UUID]:
+    """Subconjunto de `candidates` que son notas del vault, con un único `IN`."""
+    if not candidates:
+        return set()
+    result = await session.execute(
+        select(Note.id).where(Note.vault_id == vault_id, cast(Any, Note.id).in_(candidates))
+    )
+    return set(result.scalars().all())
+
+
+async def resolve_links(
+    session: AsyncSession, vault_id: UUID, raw_links: Iterable[str], current_note_id: UUID | None
+) -> list[str]:
+    """Conserva (en orden y sin duplicados) solo los links a notas existentes del vault.
+
+    Valida con un único `IN` sobre los IDs recibidos en lugar de leer todo el vault.
+    """
+    candidates = parse_link_ids(raw_links, current_note_id)
+    existing = await existing_note_ids(session, vault_id, candidates)
+    return [str(link_id) for link_id in candidates if link_id in existing]
+
+
+async def insert_note_links(session: AsyncSession, notes: Iterable[Note]) -> None:
+    """Inserta las aristas de `note.links`; las notas deben estar ya volcadas (flush)."""
+    rows = [
+        {"source_id": note.id, "target_id": UUID(target), "vault_id": note.vault_id}
+        for note in notes
+        for target in note.links
+    ]
+    if rows:
+        await session.execute(insert(NoteLink), rows)
+
+
+async def replace_note_links(session: AsyncSession, notes: Collection[Note]) -> None:
+    if not notes:
+        return
+    await session.execute(
+        delete(NoteLink).where(cast(Any, NoteLink.source_id).in_([note.id for note in notes]))
+    )
+    await insert_note_links(session, notes)
+
+
+async def detach_notes(session: AsyncSession, note_ids: Collection[UUID], version: int) -> None:
+    """Quita las notas de los `links` de sus backlinks y borra todas sus aristas.
+
+    Los backlinks modificados quedan con `version` para que `/changes` los devuelva.
+    """
+    if not note_ids:
+        return
+    ids = set(note_ids)
+    result = await session.execute(
+        select(Note).where(
+            cast(Any, Note.id).in_(
+                select(NoteLink.source_id).where(cast(Any, NoteLink.target_id).in_(ids))
+            ),
+            cast(Any, Note.id).not_in(ids),
+        )
+    )
+    targets = {str(note_id) for note_id in ids}
+    for source in result.scalars().all():
+        source.links = [link for link in source.links if link not in targets]
+        source.version = version
+        session.add(source)
+
+    await session.execute(
+        delete(NoteLink).where(
+            or_(
+                cast(Any, NoteLink.source_id).in_(ids),
+                cast(Any, NoteLink.target_id).in_(ids),
+            )
+        )
+    )
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Any, cast
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import undefer
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Note
+from app.schemas import (
+    NoteBatchCreate,
+    NoteBatchDelete,
+    NoteBatchRequest,
+    NoteBatchResult,
+    NoteBatchUpdate,
+    NoteRead,
+)
+from app.services.links import (
+    detach_notes,
+    existing_note_ids,
+    insert_note_links,
+    parse_link_ids,
+    replace_note_links,
+)
+from app.services.note_patch import apply_content_patch
+from app.services.revisions import NoteState, delete_revisions, record_revisions
+from app.services.search import index_notes, remove_notes
+from app.services.sync import next_vault_version, record_tombstones
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+async def apply_note_batch(
+    session: AsyncSession, vault_id: UUID, payload: NoteBatchRequest
+) -> NoteBatchResult:
+    """Aplica altas, ediciones y bajas de un vault en una sola transacción.
+
+    Las operaciones se aplican como conjunto (no en secuencia): cada nota existente puede
+    aparecer una sola vez y los `links` pueden referenciar `temp_id` de altas del mismo lote.
+    El vault ya debe estar autorizado por el llamador.
+    """
+    creates = [op for op in payload.operations if isinstance(op, NoteBatchCreate)]
+    updates = [op for op in payload.operations if isinstance(op, NoteBatchUpdate)]
+    deletes = [op for op in payload.operations if isinstance(op, NoteBatchDelete)]
+
+    temp_ids: dict[str, UUID] = {}
+    new_notes: list[Note] = []
+    for create_op in creates:
+        note = Note(title=create_op.title, content=create_op.content, links=[], vault_id=vault_id)
+        if create_op.temp_id is not None:
+            if create_op.temp_id in temp_ids:
+                raise _bad_request(f"temp_id duplicado en el lote: {create_op.temp_id}")
+            temp_ids[create_op.temp_id] = note.id
+        new_notes.append(note)
+
+    touched_ids = [op.id for op in updates] + [op.id for op in deletes]
+    if len(set(touched_ids)) != len(touched_ids):
+        raise _bad_request("Cada nota solo puede aparecer una vez por lote")
+    # Se versiona antes de leer las notas para que los `content_patch` se comparen con la
+    # última versión confirmada (el UPDATE del vault serializa las escrituras en Postgres).
+    version = await next_vault_version(session, vault_id)
+    existing: dict[UUID, Note] = {}
+    if touched_ids:
+        query = select(Note).where(Note.vault_id == vault_id, cast(Any, Note.id).in_(touched_ids))
+        if updates:
+            # Las bajas no necesitan el cuerpo; las ediciones lo devuelven en la respuesta.
+            query = query.options(undefer(cast(Any, Note.content)))
+        result = await session.execute(query)
+        existing = {note.id: note for note in result.scalars().all()}
+        if len(existing) != len(touched_ids):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Nota no encontrada")
+
+    created_ids = {note.id for note in new_notes}
+    deleted_ids = {op.id for op in deletes}
+    for note in new_notes:
+        note.version = version
+
+    # Links: sustituye temp_id y valida todos los IDs del lote con un único IN.
+    pending_links: list[tuple[Note, list[UUID]]] = []
+    for note, create_op in zip(new_notes, creates, strict=True):
+        if create_op.links:
+            raw = [str(temp_ids.get(link, link)) for link in create_op.links]
+            pending_links.append((note, parse_link_ids(raw, note.id)))
+    relinked: list[Note] = []
+    reindexed: list[Note] = list(new_notes)
+    revised: list[tuple[Note, NoteState]] = []
+    for update_op in updates:
+        note = existing[update_op.id]
+        previous = NoteState.of(note)
+        content = update_op.content
+        if update_op.content_patch is not None:
+            content = apply_content_patch(note, update_op.content_patch)
+        note.version = version
+        if update_op.title is not None:
+            note.title = update_op.title
+        if content is not None:
+            note.content = content
+        if update_op.title is not None or content is not None:
+            reindexed.append(note)
+            revised.append((note, previous))
+        if update_op.links is not None:
+            raw = [str(temp_ids.get(link, link)) for link in update_op.links]
+            pending_links.append((note, parse_link_ids(raw, note.id)))
+            relinked.append(note)
+        session.add(note)
+
+    candidates = {link_id for _, ids in pending_links for link_id in ids}
+    allowed = created_ids | await existing_note_ids(
+        session, vault_id, candidates - created_ids - deleted_ids
+    )
+    for note, ids in pending_links:
+        note.links = [str(link_id) for link_id in ids if link_id in allowed]
+
+    session.add_all(new_notes)
+    await detach_notes(session, deleted_ids, version)
+    await record_tombstones(session, vault_id, deleted_ids, version)
+    await remove_notes(session, deleted_ids)
+    await delete_revisions(session, list(deleted_ids))
+    for note_id in deleted_ids:
+        await session.delete(existing[note_id])
+    await session.flush()
+
+    await insert_note_links(session, new_notes)
+    await replace_note_links(session, relinked)
+    await index_notes(session, reindexed)
+    await record_revisions(session, revised)
+    await session.commit()
+
+    return NoteBatchResult(
+        version=version,
+        created=[NoteRead.model_validate(note) for note in new_notes],
+        updated=[NoteRead.model_validate(existing[op.id]) for op in updates],
+        deleted=[op.id for op in deletes],
+        temp_ids=temp_ids,
+    )
@@ -0,0 +1,58 @@
+"""Parches incrementales de contenido para el autoguardado del editor.
+
+El cliente envía solo los tramos editados y la versión (o hash) del contenido sobre el que
+los calculó; si el contenido cambió desde entonces el parche se rechaza con 409 y el
+cliente debe rebasar sus cambios sobre la versión actual.
+"""
+
+from __future__ import annotations
+
+from fastapi import HTTPException, status
+
+from app.models import Note, content_digest
+from app.schemas import NoteContentPatch
+
+_UTF16 = "utf-16-le"
+
+
+def _matches_base(note: Note, patch: NoteContentPatch) -> bool:
+    # `version` también avanza con cambios de enlaces o título (y al borrar notas enlazadas):
+    # solo hay conflicto si el contenido cambió después de la versión base.
+    if patch.base_version is not None and not (
+        note.content_version <= patch.base_version <= note.version
+    ):
+        return False
+    if patch.base_hash is None:
+        return True
+    # Filas sin migrar no tienen `content_hash`: se calcula sobre el cuerpo.
+    current = note.content_hash or content_digest(note.content)
+    return patch.base_hash.lower() == current
+
+
+def apply_content_patch(note: Note, patch: NoteContentPatch) -> str:
+    """Contenido resultante de aplicar `patch` sobre `note.content` (sin modificar la nota)."""
+    if not _matches_base(note, patch):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="La nota cambió desde la versión base del parche",
+        )
+    if not patch.edits:
+        return note.content
+    # Offsets en unidades UTF-16 (2 bytes cada una), como los índices del editor.
+    base = note.content.encode(_UTF16)
+    if patch.edits[-1].end * 2 > len(base):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Parche fuera de rango")
+    try:
+        parts: list[bytes] = []
+        cursor = 0
+        for edit in patch.edits:
+            parts.append(base[cursor : edit.start * 2])
+            parts.append(edit.text.encode(_UTF16))
+            cursor = edit.end * 2
+        parts.append(base[cursor:])
+        return b"".join(parts).decode(_UTF16)
+    except UnicodeError as exc:
+        # Un offset partió un par sustituto (emoji y similares).
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="El parche parte un carácter"
+        ) from exc
@@ -0,0 +1,91 @@
+"""Caché en proceso de tokens verificados y usuarios resueltos por `get_current_user`.
+
+Los tokens se guardan hasta su `exp`; los usuarios, como mucho `AUTH_USER_CACHE_TTL_SECONDS`
+(cota de desfase entre workers). Las escrituras ORM sobre `User` invalidan la entrada al
+confirmar la transacción; los UPDATE/DELETE Core sobre `users` deben llamar a
+`invalidate_user` explícitamente.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+import jwt
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import User
+from app.schemas import TokenPayload
+
+_PENDING_KEY = "principals.invalidate_user_ids"
+
+_token_cache: TTLCache[str, UUID] = TTLCache(
+    maxsize=settings.auth_token_cache_size, ttl=float(settings.auth_token_ttl_minutes * 60)
+)
+_user_cache: TTLCache[UUID, User] = TTLCache(
+    maxsize=settings.auth_user_cache_size, ttl=settings.auth_user_cache_ttl_seconds
+)
+
+
+def decode_token_subject(token: str) -> UUID:
+    """Verifica el JWT y devuelve el `sub` como UUID.
+
+    Lanza `jwt.InvalidTokenError` o `ValueError` si el token no es válido.
+    """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    payload = TokenPayload(
+        **jwt.decode(token, settings.auth_secret_key, algorithms=[settings.auth_algorithm])
+    )
+    if not payload.sub:
+        raise ValueError("Token sin sujeto")
+    user_id = UUID(payload.sub)
+    if payload.exp is not None:
+        remaining = (payload.exp - datetime.now(UTC)).total_seconds()
+        _token_cache.set(token, user_id, ttl=remaining)
+    return user_id
+
+
+def get_cached_user(user_id: UUID) -> User | None:
+    return _user_cache.get(user_id)
+
+
+def cache_user(user: User) -> None:
+    """Guarda un usuario ya desacoplado de su sesión (solo lectura para los handlers)."""
+    _user_cache.set(user.id, user)
+
+
+def invalidate_user(user_id: UUID) -> None:
+    _user_cache.pop(user_id)
+
+
+def clear_principal_caches() -> None:
+    _token_cache.clear()
+    _user_cache.clear()
+
+
+def _mark_user_changed(_mapper: Any, _connection: Any, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+def _flush_invalidations(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, set()):
+        invalidate_user(user_id)
+
+
+def _discard_invalidations(session: Session, _previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+event.listen(User, "after_update", _mark_user_changed)
+event.listen(User, "after_delete", _mark_user_changed)
+event.listen(Session, "after_commit", _flush_invalidations)
+event.listen(Session, "after_soft_rollback", _discard_invalidations)
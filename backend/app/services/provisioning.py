@@ -0,0 +1,164 @@
+"""Altas de agregados (usuario, su vault por defecto, vault con su nota inicial).
+
+Los objetos se construyen en memoria (UUID y timestamps los genera la app) y se vuelcan con
+un único flush; quien llama hace un solo commit y puede serializarlos sin refresh.
+
+El vault por defecto no se crea en la petición de registro: `users.provisioned_at` indica si
+ya existe y `run_user_provisioning` lo crea en segundo plano una sola vez (reintentable).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any, cast
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import CursorResult, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.clock import utcnow
+from app.core.metrics import USER_PROVISIONING
+from app.db.session import async_session
+from app.models import Note, User, Vault
+from app.services.links import insert_note_links
+from app.services.principals import invalidate_user
+from app.services.replica_routing import pin_to_primary
+from app.services.search import index_notes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VAULT_NAME_KEY = "i18n:defaultVault.name"
+DEFAULT_NOTE_WELCOME_TITLE_KEY = "i18n:defaultNotes.welcome.title"
+DEFAULT_NOTE_WELCOME_CONTENT_KEY = "i18n:defaultNotes.welcome.content"
+DEFAULT_NOTE_QUICKSTART_TITLE_KEY = "i18n:defaultNotes.quickstart.title"
+DEFAULT_NOTE_QUICKSTART_CONTENT_KEY = "i18n:defaultNotes.quickstart.content"
+NEW_VAULT_NOTE_TITLE = "Inicio"
+NEW_VAULT_NOTE_CONTENT = "Bienvenido a tu nueva bóveda."
+
+
+def build_vault(owner_id: UUID, name: str, theme: str, notes: Sequence[tuple[str, str]]) -> Vault:
+    """Vault nuevo con sus notas `(título, contenido)` ya asociadas en `vault.notes`."""
+    vault = Vault(name=name, theme=theme, owner_id=owner_id, version=1)
+    vault.notes = [
+        Note(title=title, content=content, vault_id=vault.id, links=[], version=vault.version)
+        for title, content in notes
+    ]
+    return vault
+
+
+def build_default_vault(owner_id: UUID) -> Vault:
+    vault = build_vault(
+        owner_id,
+        DEFAULT_VAULT_NAME_KEY,
+        "violet",
+        [
+            (DEFAULT_NOTE_WELCOME_TITLE_KEY, DEFAULT_NOTE_WELCOME_CONTENT_KEY),
+            (DEFAULT_NOTE_QUICKSTART_TITLE_KEY, DEFAULT_NOTE_QUICKSTART_CONTENT_KEY),
+        ],
+    )
+    welcome_note, quickstart_note = vault.notes
+    welcome_note.links = [str(quickstart_note.id)]
+    quickstart_note.links = [str(welcome_note.id)]
+    return vault
+
+
+async def add_vault(session: AsyncSession, vault: Vault) -> None:
+    """Vuelca el vault con sus notas, aristas y documentos de búsqueda (sin commit)."""
+    session.add(vault)
+    await session.flush()
+    await insert_note_links(session, vault.notes)
+    await index_notes(session, vault.notes, replace=False)
+
+
+async def create_user(
+    session: AsyncSession, email: str, display_name: str | None, hashed_password: str
+) -> User:
+    """Usuario nuevo aún sin aprovisionar (sin commit); el vault lo crea `run_user_provisioning`."""
+    user = User(email=email, display_name=display_name, hashed_password=hashed_password)
+    session.add(user)
+    try:
+        await session.flush()
+    except IntegrityError as exc:
+        # Registro concurrente con el mismo correo.
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="El correo ya está registrado"
+        ) from exc
+    return user
+
+
+async def provision_default_vault(session: AsyncSession, user_id: UUID) -> bool:
+    """Crea el vault por defecto si el usuario sigue pendiente; indica si lo creó (sin commit).
+
+    El `UPDATE ... WHERE provisioned_at IS NULL` reclama al usuario antes de insertar: dos
+    intentos simultáneos se serializan en esa fila y solo uno crea el vault. Si algo falla,
+    el rollback deshace también la marca y el usuario vuelve a quedar pendiente.
+    """
+    claimed = await session.execute(
+        update(User)
+        .where(cast(Any, User.id) == user_id, cast(Any, User.provisioned_at).is_(None))
+        .values(provisioned_at=utcnow())
+    )
+    if cast(CursorResult[Any], claimed).rowcount == 0:
+        return False
+    await add_vault(session, build_default_vault(user_id))
+    return True
+
+
+async def run_user_provisioning(user_id: UUID) -> bool:
+    """Aprovisiona en su propia transacción; se usa como tarea en segundo plano tras la respuesta.
+
+    Los errores no se propagan: el usuario queda pendiente para el siguiente login o para
+    `run_provisioning_retries`.
+    """
+    try:
+        async with async_session() as session:
+            created = await provision_default_vault(session, user_id)
+            await session.commit()
+    except Exception:
+        USER_PROVISIONING.inc("failed")
+        logger.exception("Falló el aprovisionamiento del usuario %s", user_id)
+        return False
+    if created:
+        USER_PROVISIONING.inc("created")
+        # El UPDATE en bloque no pasa por los eventos del ORM que invalidan la caché.
+        invalidate_user(user_id)
+        pin_to_primary(user_id)
+    return created
+
+
+async def provision_pending_users(older_than: timedelta, limit: int = 100) -> int:
+    """Reintenta los usuarios que siguen pendientes pasado `older_than` desde el registro."""
+    async with async_session() as session:
+        result = await session.execute(
+            select(User.id)
+            .where(
+                cast(Any, User.provisioned_at).is_(None),
+                cast(Any, User.created_at) < utcnow() - older_than,
+            )
+            .order_by(cast(Any, User.created_at))
+            .limit(limit)
+        )
+        pending = list(result.scalars())
+    created = 0
+    for user_id in pending:
+        created += await run_user_provisioning(user_id)
+    return created
+
+
+async def run_provisioning_retries(interval: float) -> None:
+    """Bucle de fondo del lifespan; con varios workers cada uno lo ejecuta (es idempotente)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            created = await provision_pending_users(timedelta(seconds=interval))
+            if created:
+                logger.info("Aprovisionamiento reintentado: %d usuarios", created)
+        except Exception:
+            logger.exception("Falló el reintento de aprovisionamiento")
@@ -0,0 +1,30 @@
+"""Lecturas de solo lectura sobre réplicas con "read-your-writes" por usuario.
+
+Tras una escritura el usuario queda fijado a la base primaria durante
+`READ_YOUR_WRITES_SECONDS`, así no ve datos anteriores a su propio cambio mientras las
+réplicas se ponen al día. El registro es por proceso: detrás de varios workers sin afinidad
+de sesión, el margen debe cubrir también el retraso de replicación observado.
+"""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+_pins: TTLCache[UUID, bool] = TTLCache(
+    maxsize=settings.read_your_writes_cache_size, ttl=settings.read_your_writes_seconds
+)
+
+
+def pin_to_primary(user_id: UUID) -> None:
+    _pins.set(user_id, True)
+
+
+def is_pinned(user_id: UUID) -> bool:
+    return _pins.get(user_id) is not None
+
+
+def clear_pins() -> None:
+    _pins.clear()
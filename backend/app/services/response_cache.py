@@ -0,0 +1,216 @@
+"""Caché de respuestas de lectura de vaults: bytes JSON ya codificados por versión.
+
+La clave es `(endpoint, vault_id, versión)`: cualquier escritura sube la versión del vault,
+así que una entrada nunca queda desactualizada; el handler ya cargó la fila del vault (para
+el ETag y el permiso) y solo se ahorra la consulta de notas y su serialización. Los handlers
+de escritura invalidan el vault tras el commit para liberar la memoria de versiones viejas.
+
+La caché `local` es un LRU por worker acotado en bytes. Con `RESPONSE_CACHE_BACKEND=postgres`
+se añade un segundo nivel compartido entre workers (tabla UNLOGGED `response_cache_entries`):
+un fallo local se busca ahí antes de recalcular. Solo van a ese nivel los cuerpos de hasta
+`RESPONSE_CACHE_MAX_ENTRY_BYTES`, y se escriben en segundo plano: la respuesta no espera al
+INSERT ni retiene una conexión del pool mientras se copia el cuerpo.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Protocol
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.metrics import RESPONSE_CACHE_BYTES, RESPONSE_CACHE_REQUESTS
+from app.db.session import engine
+from app.models import Vault
+
+logger = logging.getLogger(__name__)
+
+CacheKey = tuple[str, UUID, int]
+
+
+class LocalResponseCache:
+    """LRU en memoria del proceso acotado por la suma de los tamaños de los cuerpos."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._by_vault: dict[UUID, set[CacheKey]] = {}
+
+    def get(self, key: CacheKey) -> bytes | None:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def set(self, key: CacheKey, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        self._discard(key)
+        self._entries[key] = body
+        self._by_vault.setdefault(key[1], set()).add(key)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+        RESPONSE_CACHE_BYTES.set(value=self.size)
+
+    def invalidate(self, vault_id: UUID) -> None:
+        for key in self._by_vault.get(vault_id, set()).copy():
+            self._discard(key)
+        RESPONSE_CACHE_BYTES.set(value=self.size)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_vault.clear()
+        self.size = 0
+        RESPONSE_CACHE_BYTES.set(value=0)
+
+    def _discard(self, key: CacheKey) -> None:
+        body = self._entries.pop(key, None)
+        if body is None:
+            return
+        self.size -= len(body)
+        keys = self._by_vault[key[1]]
+        keys.discard(key)
+        if not keys:
+            del self._by_vault[key[1]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedResponseStore(Protocol):
+    async def get(self, key: CacheKey) -> bytes | None: ...
+
+    async def set(self, key: CacheKey, body: bytes) -> None: ...
+
+    async def invalidate(self, vault_id: UUID) -> None: ...
+
+
+_POSTGRES_GET = text(
+    "SELECT body FROM response_cache_entries "
+    "WHERE vault_id = :vault_id AND kind = :kind AND version = :version"
+)
+# Solo avanza: una petición lenta con una versión vieja no pisa una entrada más nueva.
+_POSTGRES_SET = text(
+    """
+    INSERT INTO response_cache_entries AS e (vault_id, kind, version, body)
+    VALUES (:vault_id, :kind, :version, :body)
+    ON CONFLICT (vault_id, kind) DO UPDATE SET version = excluded.version, body = excluded.body
+    WHERE e.version < excluded.version
+    """
+)
+_POSTGRES_INVALIDATE = text("DELETE FROM response_cache_entries WHERE vault_id = :vault_id")
+
+
+class PostgresResponseStore:
+    """Nivel compartido en Postgres; si falla se comporta como una caché vacía."""
+
+    def __init__(self, max_entry_bytes: int) -> None:
+        self.max_entry_bytes = max_entry_bytes
+
+    async def get(self, key: CacheKey) -> bytes | None:
+        kind, vault_id, version = key
+        try:
+            async with engine.connect() as conn:
+                result = await conn.execute(
+                    _POSTGRES_GET, {"vault_id": vault_id, "kind": kind, "version": version}
+                )
+                body = result.scalar_one_or_none()
+        except Exception:
+            logger.warning("No se pudo leer la caché compartida de %s", vault_id, exc_info=True)
+            return None
+        return None if body is None else bytes(body)
+
+    async def set(self, key: CacheKey, body: bytes) -> None:
+        if len(body) > self.max_entry_bytes:
+            return
+        kind, vault_id, version = key
+        params = {"vault_id": vault_id, "kind": kind, "version": version, "body": body}
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(_POSTGRES_SET, params)
+        except Exception:
+            logger.warning("No se pudo guardar en la caché compartida %s", vault_id, exc_info=True)
+
+    async def invalidate(self, vault_id: UUID) -> None:
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(_POSTGRES_INVALIDATE, {"vault_id": vault_id})
+        except Exception:
+            logger.warning("No se pudo invalidar la caché compartida %s", vault_id, exc_info=True)
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, shared: SharedResponseStore | None = None) -> None:
+        self.local = LocalResponseCache(max_bytes)
+        self.shared = shared
+        # Referencias a las escrituras en segundo plano para que no las recoja el GC.
+        self._pending: set[asyncio.Task[None]] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.local.max_bytes > 0
+
+    async def get_or_render(
+        self, kind: str, vault: Vault, render: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Cuerpo de `kind` para la versión actual de `vault`; `render` solo si no está cacheado."""
+        if not self.enabled:
+            return await render()
+        key = (kind, vault.id, vault.version)
+        body = self.local.get(key)
+        if body is not None:
+            RESPONSE_CACHE_REQUESTS.inc(kind, "hit")
+            return body
+        if self.shared is not None:
+            body = await self.shared.get(key)
+            if body is not None:
+                RESPONSE_CACHE_REQUESTS.inc(kind, "shared_hit")
+                self.local.set(key, body)
+                return body
+        RESPONSE_CACHE_REQUESTS.inc(kind, "miss")
+        body = await render()
+        self.local.set(key, body)
+        if self.shared is not None:
+            task = asyncio.create_task(self.shared.set(key, body))
+            self._pending.add(task)
+            task.add_done_callback(self._write_done)
+        return body
+
+    def _write_done(self, task: asyncio.Task[None]) -> None:
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Falló la escritura en la caché compartida", exc_info=task.exception())
+
+    async def flush(self) -> None:
+        """Espera las escrituras pendientes en el nivel compartido."""
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def invalidate(self, vault_id: UUID) -> None:
+        if not self.enabled:
+            return
+        self.local.invalidate(vault_id)
+        if self.shared is not None:
+            await self.shared.invalidate(vault_id)
+
+    def clear(self) -> None:
+        self.local.clear()
+
+
+def build_response_cache(max_bytes: int, backend: str, max_entry_bytes: int) -> ResponseCache:
+    shared = PostgresResponseStore(max_entry_bytes) if backend == "postgres" else None
+    return ResponseCache(max_bytes, shared)
+
+
+response_cache = build_response_cache(
+    settings.response_cache_max_bytes,
+    settings.response_cache_backend,
+    settings.response_cache_max_entry_bytes,
+)
@@ -0,0 +1,305 @@
+"""Historial de revisiones de notas: copias periódicas más deltas inversos.
+
+Cada escritura que cambia título o contenido guarda el estado anterior como delta contra
+el nuevo (la revisión vigente es la propia nota). Una de cada `SNAPSHOT_INTERVAL`
+revisiones se guarda completa, así que reconstruir cualquiera lee como mucho ese número
+de filas. Las ráfagas de autoguardado se agrupan: durante `COALESCE_SECONDS` desde la
+última revisión guardada los estados intermedios se descartan, reescribiendo solo el delta
+de esa revisión contra el contenido nuevo.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import difflib
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, cast
+from uuid import UUID
+
+import orjson
+from sqlalchemy import and_, delete, func, insert, or_, update
+from sqlalchemy.orm import aliased
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.clock import utcnow
+from app.core.config import settings
+from app.db.session import async_session
+from app.models import Note, NoteRevision, content_digest
+from app.schemas import NoteRevisionRead, NoteRevisionSummary
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_INTERVAL = 20
+COALESCE_SECONDS = 300
+# Por encima de estas líneas el delta se limita a prefijo/sufijo comunes (lineal).
+_LINE_DIFF_MAX_LINES = 5000
+
+SUMMARY_COLUMNS: tuple[Any, ...] = (
+    NoteRevision.revision,
+    NoteRevision.title,
+    NoteRevision.content_length,
+    NoteRevision.content_hash,
+    NoteRevision.version,
+    NoteRevision.saved_at,
+    NoteRevision.superseded_at,
+)
+
+
+def _common_prefix(a: str, b: str) -> int:
+    # Búsqueda binaria con comparaciones de slices (en C) en lugar de un bucle por carácter.
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle :] == b[len(b) - middle :]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def make_delta(base: str, target: str) -> str:
+    """Delta JSON que convierte `base` en `target`.
+
+    Lista de operaciones: `[inicio, fin]` copia `base[inicio:fin]`, un string se inserta.
+    """
+    prefix = _common_prefix(base, target)
+    suffix = _common_suffix(base, target, min(len(base), len(target)) - prefix)
+    base_end, target_end = len(base) - suffix, len(target) - suffix
+    ops: list[list[int] | str] = [[0, prefix]]
+
+    base_lines = base[prefix:base_end].splitlines(keepends=True)
+    target_lines = target[prefix:target_end].splitlines(keepends=True)
+    small = max(len(base_lines), len(target_lines)) <= _LINE_DIFF_MAX_LINES
+    if base_lines and target_lines and small:
+        offsets = [prefix]
+        for line in base_lines:
+            offsets.append(offsets[-1] + len(line))
+        matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append([offsets[i1], offsets[i2]])
+            elif j2 > j1:
+                ops.append("".join(target_lines[j1:j2]))
+    elif target_end > prefix:
+        ops.append(target[prefix:target_end])
+    ops.append([base_end, len(base)])
+
+    merged: list[list[int] | str] = []
+    for op in ops:
+        if isinstance(op, list) and op[0] == op[1]:
+            continue
+        previous = merged[-1] if merged else None
+        if isinstance(op, list) and isinstance(previous, list) and previous[1] == op[0]:
+            previous[1] = op[1]
+        else:
+            merged.append(op)
+    return orjson.dumps(merged).decode()
+
+
+def apply_delta(base: str, delta: str) -> str:
+    ops = orjson.loads(delta)
+    return "".join(base[op[0] : op[1]] if isinstance(op, list) else op for op in ops)
+
+
+@dataclass(slots=True)
+class NoteState:
+    """Título y contenido de una nota antes de una escritura."""
+
+    title: str
+    content: str
+    version: int
+    saved_at: datetime
+
+    @classmethod
+    def of(cls, note: Note) -> NoteState:
+        return cls(note.title, note.content, note.version, note.updated_at)
+
+
+async def record_revisions(
+    session: AsyncSession, changes: Sequence[tuple[Note, NoteState]]
+) -> None:
+    """Guarda el estado previo de las notas cuyo título o contenido cambió (sin commit).
+
+    Debe llamarse después de versionar el vault, que serializa las escrituras de las notas.
+    """
+    changed = [
+        (note, previous)
+        for note, previous in changes
+        if note.title != previous.title or note.content != previous.content
+    ]
+    if not changed:
+        return
+    now = utcnow()
+    window_start = now - timedelta(seconds=COALESCE_SECONDS)
+    latest_revision = (
+        select(NoteRevision.note_id, func.max(NoteRevision.revision).label("revision"))
+        .where(cast(Any, NoteRevision.note_id).in_([note.id for note, _ in changed]))
+        .group_by(cast(Any, NoteRevision.note_id))
+        .subquery()
+    )
+    result = await session.execute(
+        select(
+            NoteRevision.note_id,
+            NoteRevision.revision,
+            NoteRevision.snapshot,
+            (cast(Any, NoteRevision.superseded_at) > window_start).label("recent"),
+        ).join(
+            latest_revision,
+            and_(
+                cast(Any, NoteRevision.note_id) == latest_revision.c.note_id,
+                cast(Any, NoteRevision.revision) == latest_revision.c.revision,
+            ),
+        )
+    )
+    latest = {row.note_id: row for row in result.all()}
+
+    rows: list[dict[str, Any]] = []
+    for note, previous in changed:
+        last = latest.get(note.id)
+        if last is not None and last.recent:
+            # Ráfaga: el estado previo no se guarda y la última revisión pasa a apuntar al
+            # contenido nuevo (las copias completas no dependen de él).
+            if not last.snapshot:
+                await _rebase_revision(session, note.id, last.revision, previous, note.content)
+            continue
+        revision = 1 if last is None else last.revision + 1
+        snapshot = revision % SNAPSHOT_INTERVAL == 0
+        data = previous.content if snapshot else make_delta(note.content, previous.content)
+        rows.append(
+            {
+                "note_id": note.id,
+                "revision": revision,
+                "vault_id": note.vault_id,
+                "title": previous.title,
+                "snapshot": snapshot,
+                "data": data,
+                "content_length": len(previous.content),
+                "content_hash": content_digest(previous.content),
+                "version": previous.version,
+                "saved_at": previous.saved_at,
+                "superseded_at": now,
+            }
+        )
+    if rows:
+        await session.execute(insert(NoteRevision), rows)
+
+
+async def _rebase_revision(
+    session: AsyncSession, note_id: UUID, revision: int, previous: NoteState, content: str
+) -> None:
+    key = and_(
+        cast(Any, NoteRevision.note_id) == note_id, cast(Any, NoteRevision.revision) == revision
+    )
+    data = (await session.execute(select(NoteRevision.data).where(key))).scalar_one()
+    restored = apply_delta(previous.content, data)
+    rebased = make_delta(content, restored)
+    await session.execute(update(NoteRevision).where(key).values(data=rebased))
+
+
+async def delete_revisions(session: AsyncSession, note_ids: Sequence[UUID]) -> None:
+    if note_ids:
+        await session.execute(
+            delete(NoteRevision).where(cast(Any, NoteRevision.note_id).in_(note_ids))
+        )
+
+
+async def list_revisions(
+    session: AsyncSession, note_id: UUID, limit: int, before: int | None
+) -> tuple[list[NoteRevisionSummary], int | None]:
+    """Página de revisiones de la más nueva a la más antigua, sin leer `data`."""
+    query = select(*SUMMARY_COLUMNS).where(NoteRevision.note_id == note_id)
+    if before is not None:
+        query = query.where(cast(Any, NoteRevision.revision) < before)
+    query = query.order_by(cast(Any, NoteRevision.revision).desc()).limit(limit + 1)
+    rows = (await session.execute(query)).all()
+    items = [NoteRevisionSummary.model_validate(row) for row in rows[:limit]]
+    return items, items[-1].revision if len(rows) > limit else None
+
+
+async def load_revision(
+    session: AsyncSession, note_id: UUID, revision: int
+) -> NoteRevisionRead | None:
+    """Reconstruye una revisión desde la copia completa siguiente (o la nota) hacia atrás."""
+    next_snapshot = -(-revision // SNAPSHOT_INTERVAL) * SNAPSHOT_INTERVAL
+    result = await session.execute(
+        select(NoteRevision)
+        .where(
+            NoteRevision.note_id == note_id,
+            cast(Any, NoteRevision.revision).between(revision, next_snapshot),
+        )
+        .order_by(cast(Any, NoteRevision.revision).desc())
+    )
+    chain = list(result.scalars().all())
+    if not chain or chain[-1].revision != revision:
+        return None
+    target = chain[-1]
+    if chain[0].snapshot:
+        content = chain.pop(0).data
+    else:
+        head = await session.execute(select(Note.content).where(Note.id == note_id))
+        content = head.scalar_one()
+    for row in chain:
+        content = apply_delta(content, row.data)
+    summary = NoteRevisionSummary.model_validate(target)
+    return NoteRevisionRead(**summary.model_dump(), note_id=note_id, content=content)
+
+
+async def prune_revisions(
+    session: AsyncSession, now: datetime, retention_days: int, max_per_note: int
+) -> int:
+    """Borra revisiones más viejas que la retención o fuera de las `max_per_note` últimas.
+
+    Solo se borran las más antiguas de cada nota, así que las cadenas de deltas de las
+    que quedan siguen completas. La última fila de cada nota se conserva aunque caduque:
+    los números de revisión continúan desde ella y no se reutilizan.
+    """
+    newer = aliased(NoteRevision)
+    latest = (
+        select(func.max(newer.revision))
+        .where(newer.note_id == NoteRevision.note_id)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        delete(NoteRevision).where(
+            cast(Any, NoteRevision.revision) < latest,
+            or_(
+                cast(Any, NoteRevision.superseded_at) < now - timedelta(days=retention_days),
+                cast(Any, NoteRevision.revision) <= latest - max_per_note,
+            ),
+        )
+    )
+    return int(cast(Any, result).rowcount or 0)
+
+
+async def run_revision_retention(interval: float) -> None:
+    """Bucle de fondo del lifespan; con varios workers cada uno lo ejecuta (es idempotente)."""
+    while True:
+        try:
+            async with async_session() as session:
+                removed = await prune_revisions(
+                    session,
+                    utcnow(),
+                    settings.note_revisions_retention_days,
+                    settings.note_revisions_max,
+                )
+                await session.commit()
+            if removed:
+                logger.info("Retención de revisiones: %d borradas", removed)
+        except Exception:
+            logger.exception("Falló la retención de revisiones")
+        await asyncio.sleep(interval)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import html
+import re
+from collections.abc import Iterable
+from typing import Any, cast
+from uuid import UUID
+
+from sqlalchemy import Float, String, Uuid, bindparam, delete, insert, text
+from sqlalchemy.types import TypeEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Note, NoteSearchDocument
+from app.schemas.search import SearchHit, SearchPage
+
+# Separadores de control para marcar coincidencias antes de escapar el HTML del fragmento.
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+_SNIPPET_TOKENS = 24
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# El índice guarda el cuerpo sin comprimir: solo los primeros caracteres de cada nota son
+# buscables, para que la copia no anule la compresión de `notes.content` en notas largas.
+INDEXED_CONTENT_MAX_CHARS = 32_768
+
+_RESULT_COLUMNS: dict[str, TypeEngine[Any]] = {
+    "note_id": Uuid(),
+    "title": String(),
+    "snippet": String(),
+    "rank": Float(),
+}
+
+_SQLITE_SEARCH = (
+    text(
+        "SELECT s.note_id AS note_id, s.title AS title, "
+        "snippet(note_search_fts, -1, :mark_start, :mark_end, '…', :tokens) AS snippet, "
+        "-bm25(note_search_fts, 10.0, 1.0) AS rank "
+        "FROM note_search_fts JOIN note_search AS s ON s.id = note_search_fts.rowid "
+        "WHERE note_search_fts MATCH :query AND s.vault_id = :vault_id "
+        "ORDER BY bm25(note_search_fts, 10.0, 1.0) LIMIT :limit OFFSET :offset"
+    )
+    .bindparams(bindparam("vault_id", type_=Uuid()))
+    .columns(**_RESULT_COLUMNS)
+)
+
+_POSTGRES_SEARCH = (
+    text(
+        "SELECT s.note_id AS note_id, s.title AS title, "
+        "ts_headline('simple', left(s.content, 262144), q, :headline_options) AS snippet, "
+        "ts_rank_cd(s.document, q) AS rank "
+        "FROM note_search AS s, to_tsquery('simple', :query) AS q "
+        "WHERE s.vault_id = :vault_id AND s.document @@ q "
+        "ORDER BY rank DESC, s.note_id LIMIT :limit OFFSET :offset"
+    )
+    .bindparams(bindparam("vault_id", type_=Uuid()))
+    .columns(**_RESULT_COLUMNS)
+)
+
+
+def _document_rows(notes: Iterable[Note]) -> list[dict[str, Any]]:
+    return [
+        {
+            "note_id": note.id,
+            "vault_id": note.vault_id,
+            "title": note.title,
+            "content": note.content[:INDEXED_CONTENT_MAX_CHARS],
+        }
+        for note in notes
+    ]
+
+
+async def index_notes(
+    session: AsyncSession, notes: Iterable[Note], *, replace: bool = True
+) -> None:
+    """Reemplaza los documentos de búsqueda de `notes` (las notas deben estar volcadas).
+
+    Con `replace=False` (notas recién creadas) se omite el DELETE previo.
+    """
+    rows = _document_rows(notes)
+    if not rows:
+        return
+    if replace:
+        await session.execute(
+            delete(NoteSearchDocument).where(
+                cast(Any, NoteSearchDocument.note_id).in_([row["note_id"] for row in rows])
+            )
+        )
+    await session.execute(insert(NoteSearchDocument), rows)
+
+
+async def remove_notes(session: AsyncSession, note_ids: Iterable[UUID]) -> None:
+    ids = list(note_ids)
+    if ids:
+        await session.execute(
+            delete(NoteSearchDocument).where(cast(Any, NoteSearchDocument.note_id).in_(ids))
+        )
+
+
+async def remove_vault_documents(session: AsyncSession, vault_id: UUID) -> None:
+    await session.execute(
+        delete(NoteSearchDocument).where(cast(Any, NoteSearchDocument.vault_id) == vault_id)
+    )
+
+
+def _fts5_query(tokens: list[str]) -> str:
+    """AND de términos entre comillas (sin sintaxis FTS5 del usuario); el último como prefijo."""
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _tsquery(tokens: list[str]) -> str:
+    return " & ".join([*tokens[:-1], f"{tokens[-1]}:*"])
+
+
+def _render_snippet(raw: str | None) -> str:
+    escaped = html.escape(raw or "")
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+async def search_notes(
+    session: AsyncSession, vault_id: UUID, raw_query: str, limit: int, offset: int
+) -> SearchPage:
+    """Búsqueda rankeada dentro de un vault; pide limit+1 para saber si hay otra página."""
+    tokens = _TOKEN_RE.findall(raw_query)
+    if not tokens:
+        return SearchPage()
+
+    dialect = cast(Any, session.bind).dialect.name
+    if dialect == "sqlite":
+        statement = _SQLITE_SEARCH.bindparams(
+            query=_fts5_query(tokens),
+            vault_id=vault_id,
+            mark_start=_MARK_START,
+            mark_end=_MARK_END,
+            tokens=_SNIPPET_TOKENS,
+        )
+    elif dialect == "postgresql":
+        statement = _POSTGRES_SEARCH.bindparams(
+            query=_tsquery(tokens),
+            vault_id=vault_id,
+            headline_options=(
+                f"StartSel={_MARK_START}, StopSel={_MARK_END}, "
+                f"MaxWords={_SNIPPET_TOKENS}, MinWords=8, MaxFragments=1"
+            ),
+        )
+    else:  # pragma: no cover - otros motores no están soportados
+        raise RuntimeError(f"Búsqueda no soportada para el dialecto {dialect}")
+
+    result = await session.execute(statement.bindparams(limit=limit + 1, offset=offset))
+    rows = result.all()
+    hits = [
+        SearchHit(
+            id=row.note_id,
+            title=row.title,
+            snippet=_render_snippet(row.snippet),
+            rank=float(row.rank),
+        )
+        for row in rows[:limit]
+    ]
+    return SearchPage(items=hits, next_offset=offset + limit if len(rows) > limit else None)
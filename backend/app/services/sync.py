@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Collection
+from datetime import datetime, timedelta
+from typing import Any, cast
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.orm import undefer
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.clock import utcnow
+from app.core.config import settings
+from app.db.session import async_session
+from app.models import Note, NoteTombstone, Vault
+from app.schemas import NoteRead
+from app.schemas.sync import VaultChanges
+
+logger = logging.getLogger(__name__)
+
+
+async def next_vault_version(session: AsyncSession, vault_id: UUID) -> int:
+    """Incrementa `Vault.version` de forma atómica y devuelve el nuevo valor.
+
+    En Postgres el UPDATE bloquea la fila hasta el commit, así que las escrituras de un
+    mismo vault confirman en el orden de sus versiones y `/changes` nunca salta ninguna.
+    """
+    result = await session.execute(
+        update(Vault)
+        .where(cast(Any, Vault.id) == vault_id)
+        .values(version=cast(Any, Vault.version) + 1)
+        .returning(cast(Any, Vault.version))
+    )
+    return int(result.scalar_one())
+
+
+async def record_tombstones(
+    session: AsyncSession, vault_id: UUID, note_ids: Collection[UUID], version: int
+) -> None:
+    if not note_ids:
+        return
+    deleted_at = utcnow()
+    await session.execute(
+        insert(NoteTombstone),
+        [
+            {"note_id": note_id, "vault_id": vault_id, "version": version, "deleted_at": deleted_at}
+            for note_id in note_ids
+        ],
+    )
+
+
+def parse_since(raw: str) -> int | datetime:
+    """`since` acepta una versión (entero) o un timestamp ISO-8601."""
+    try:
+        return int(raw)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`since` debe ser una versión o un timestamp ISO-8601",
+        ) from exc
+
+
+def ensure_changes_available(vault: Vault, since: int | datetime) -> None:
+    """410 si los tombstones posteriores a `since` ya se podaron: el cliente debe recargar todo.
+
+    `since=0` (cliente sin datos) siempre vale; con un timestamp solo se sabe que la poda
+    alcanza hasta la retención, así que se exige resync a partir de ella.
+    """
+    if isinstance(since, datetime):
+        horizon = utcnow() - timedelta(days=settings.note_tombstones_retention_days)
+        expired = vault.tombstones_pruned_version > 0 and since < horizon
+    else:
+        expired = 0 < since < vault.tombstones_pruned_version
+    if expired:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Los cambios desde `since` ya no están disponibles: recarga el vault completo",
+        )
+
+
+async def load_changes(session: AsyncSession, vault: Vault, since: int | datetime) -> VaultChanges:
+    ensure_changes_available(vault, since)
+    notes_query = (
+        select(Note).where(Note.vault_id == vault.id).options(undefer(cast(Any, Note.content)))
+    )
+    tombstones_query = select(NoteTombstone.note_id).where(NoteTombstone.vault_id == vault.id)
+    if isinstance(since, datetime):
+        notes_query = notes_query.where(cast(Any, Note.updated_at) > since)
+        tombstones_query = tombstones_query.where(cast(Any, NoteTombstone.deleted_at) > since)
+    else:
+        notes_query = notes_query.where(cast(Any, Note.version) > since)
+        tombstones_query = tombstones_query.where(cast(Any, NoteTombstone.version) > since)
+
+    notes = (await session.execute(notes_query.order_by(cast(Any, Note.version)))).scalars()
+    deleted = (await session.execute(tombstones_query)).scalars()
+    return VaultChanges(
+        version=vault.version,
+        notes=[NoteRead.model_validate(note) for note in notes.all()],
+        deleted=list(deleted.all()),
+    )
+
+
+async def prune_tombstones(session: AsyncSession, now: datetime, retention_days: int) -> int:
+    """Borra los tombstones más viejos que la retención y sube el horizonte de cada vault.
+
+    Las versiones crecen con el tiempo, así que la mayor podada de un vault es su nuevo
+    `tombstones_pruned_version` (sin commit).
+    """
+    cutoff = now - timedelta(days=retention_days)
+    expired = cast(Any, NoteTombstone.deleted_at) < cutoff
+    pruned_version = (
+        select(func.max(NoteTombstone.version))
+        .where(NoteTombstone.vault_id == Vault.id, expired)
+        .scalar_subquery()
+    )
+    await session.execute(
+        update(Vault)
+        .where(cast(Any, Vault.id).in_(select(NoteTombstone.vault_id).where(expired)))
+        # Sin `updated_at`: la poda no es una escritura del vault.
+        .values(tombstones_pruned_version=pruned_version, updated_at=Vault.updated_at)
+    )
+    result = await session.execute(delete(NoteTombstone).where(expired))
+    return int(cast(Any, result).rowcount or 0)
+
+
+async def run_tombstone_retention(interval: float) -> None:
+    """Bucle de fondo del lifespan; con varios workers cada uno lo ejecuta (es idempotente)."""
+    while True:
+        try:
+            async with async_session() as session:
+                removed = await prune_tombstones(
+                    session, utcnow(), settings.note_tombstones_retention_days
+                )
+                await session.commit()
+            if removed:
+                logger.info("Retención de tombstones: %d borrados", removed)
+        except Exception:
+            logger.exception("Falló la retención de tombstones")
+        await asyncio.sleep(interval)
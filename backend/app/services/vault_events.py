@@ -0,0 +1,250 @@
+"""Feed de cambios por vault en tiempo real (Server-Sent Events).
+
+Los handlers publican `(vault_id, versión)` tras cada commit. El broker reparte esa señal a
+las suscripciones locales y cada suscripción carga su propio diff con `load_changes`, así
+que una ráfaga de escrituras se agrupa en un solo evento y un cliente que reconecta con
+`Last-Event-ID` recupera lo que se perdió. Con varios workers, el backend `postgres`
+propaga las señales entre procesos con LISTEN/NOTIFY (el mensaje cabe de sobra en su
+límite de 8 KB porque no lleva notas).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager, suppress
+from typing import Any, Protocol
+from uuid import UUID
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.db.session import async_session
+from app.models import Vault
+from app.services.sync import load_changes
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "vault_changes"
+HEARTBEAT_SECONDS = 15.0
+RECONNECT_INITIAL_SECONDS = 0.5
+RECONNECT_MAX_SECONDS = 30.0
+
+Deliver = Callable[[UUID, int], None]
+
+
+class VaultEventBackend(Protocol):
+    """Transporte de las señales entre workers; `deliver` entrega las de cualquier proceso."""
+
+    def attach(self, deliver: Deliver) -> None: ...
+
+    async def start(self) -> None: ...
+
+    async def publish(self, vault_id: UUID, version: int) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class LocalBackend:
+    """Un solo proceso: publicar es entregar."""
+
+    def __init__(self) -> None:
+        self._deliver: Deliver | None = None
+
+    def attach(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def start(self) -> None:
+        return None
+
+    async def publish(self, vault_id: UUID, version: int) -> None:
+        if self._deliver is not None:
+            self._deliver(vault_id, version)
+
+    async def stop(self) -> None:
+        return None
+
+
+class PostgresNotifyBackend(LocalBackend):
+    """LISTEN/NOTIFY sobre una conexión asyncpg dedicada (fuera del pool de SQLAlchemy).
+
+    Postgres también entrega las notificaciones a la conexión que las emite, así que las
+    del propio worker llegan por el mismo camino que las de los demás. Si la conexión se
+    cae, una tarea la restablece con backoff exponencial y vuelve a emitir LISTEN; mientras
+    tanto solo se entregan las señales locales y las perdidas se recuperan en la siguiente.
+    """
+
+    def __init__(self, database_url: str) -> None:
+        super().__init__()
+        url = make_url(database_url).set(drivername="postgresql")
+        self._dsn = url.render_as_string(hide_password=False)
+        self._connection: Any = None
+        self._lock = asyncio.Lock()
+        self._lost = asyncio.Event()
+        self._supervisor: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        await self._connect()
+        self._supervisor = asyncio.create_task(self._reconnect_forever())
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        connection = await asyncpg.connect(self._dsn)
+        self._lost.clear()
+        connection.add_termination_listener(self._on_terminate)
+        await connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+        self._connection = connection
+
+    def _on_terminate(self, _connection: Any) -> None:
+        self._lost.set()
+
+    async def _reconnect_forever(self) -> None:
+        while True:
+            await self._lost.wait()
+            self._connection = None
+            logger.warning("Se perdió la conexión LISTEN de %s; reconectando", NOTIFY_CHANNEL)
+            delay = RECONNECT_INITIAL_SECONDS
+            while self._connection is None:
+                try:
+                    await self._connect()
+                except Exception:
+                    logger.warning(
+                        "No se pudo restablecer LISTEN; reintento en %.1f s", delay, exc_info=True
+                    )
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+            logger.info("Conexión LISTEN de %s restablecida", NOTIFY_CHANNEL)
+
+    def _on_notify(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        vault_id, _, version = payload.partition(":")
+        if self._deliver is not None:
+            self._deliver(UUID(vault_id), int(version))
+
+    async def publish(self, vault_id: UUID, version: int) -> None:
+        if self._connection is None:
+            await super().publish(vault_id, version)
+            return
+        try:
+            # asyncpg no admite operaciones concurrentes sobre la misma conexión.
+            async with self._lock:
+                await self._connection.execute(
+                    "SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, f"{vault_id}:{version}"
+                )
+        except Exception:
+            # Los clientes de otros workers se pondrán al día en la siguiente señal.
+            logger.warning("No se pudo notificar el cambio del vault %s", vault_id, exc_info=True)
+            await super().publish(vault_id, version)
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            supervisor, self._supervisor = self._supervisor, None
+            supervisor.cancel()
+            with suppress(asyncio.CancelledError):
+                await supervisor
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await connection.close()
+
+
+class Subscription:
+    """Última versión señalada de un vault; las señales intermedias se agrupan."""
+
+    def __init__(self) -> None:
+        self.latest = 0
+        self._signal = asyncio.Event()
+
+    def notify(self, version: int) -> None:
+        if version > self.latest:
+            self.latest = version
+            self._signal.set()
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._signal.wait(), timeout)
+        except TimeoutError:
+            return False
+        self._signal.clear()
+        return True
+
+
+class VaultEventBroker:
+    def __init__(self, backend: VaultEventBackend) -> None:
+        self.backend = backend
+        self._subscriptions: dict[UUID, set[Subscription]] = {}
+        backend.attach(self._deliver)
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    async def publish(self, vault_id: UUID, version: int) -> None:
+        await self.backend.publish(vault_id, version)
+
+    def subscriber_count(self, vault_id: UUID) -> int:
+        return len(self._subscriptions.get(vault_id, ()))
+
+    def _deliver(self, vault_id: UUID, version: int) -> None:
+        for subscription in self._subscriptions.get(vault_id, ()):
+            subscription.notify(version)
+
+    @contextmanager
+    def subscribe(self, vault_id: UUID) -> Iterator[Subscription]:
+        subscription = Subscription()
+        self._subscriptions.setdefault(vault_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscriptions[vault_id]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[vault_id]
+
+
+def build_backend(backend: str, database_url: str) -> VaultEventBackend:
+    if backend == "postgres":
+        return PostgresNotifyBackend(database_url)
+    return LocalBackend()
+
+
+vault_events = VaultEventBroker(build_backend(settings.events_backend, settings.database_url))
+
+
+def _sse(event: str, event_id: int, data: str) -> bytes:
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n".encode()
+
+
+async def stream_vault_changes(
+    vault_id: UUID,
+    since: int,
+    broker: VaultEventBroker = vault_events,
+    heartbeat: float = HEARTBEAT_SECONDS,
+) -> AsyncIterator[bytes]:
+    """Eventos `changes` (un `VaultChanges` por evento, `id` = versión) desde `since`.
+
+    Se suscribe antes de mirar la versión actual para no perder escrituras entre ambas
+    cosas; cada consulta usa una sesión corta para no retener conexiones del pool.
+    """
+    with broker.subscribe(vault_id) as subscription:
+        version = since
+        pending = True
+        while True:
+            if pending:
+                async with async_session() as session:
+                    vault = await session.get(Vault, vault_id)
+                    if vault is None:
+                        yield _sse("deleted", version, "{}")
+                        return
+                    if vault.version > version:
+                        changes = await load_changes(session, vault, version)
+                        version = changes.version
+                        yield _sse("changes", version, changes.model_dump_json())
+            pending = await subscription.wait(heartbeat)
+            if not pending:
+                # Comentario SSE: mantiene viva la conexión a través de proxies.
+                yield b": ping\n\n"
+            elif subscription.latest <= version:
+                pending = False
@@ -0,0 +1,295 @@
+"""Importación de vaults de Obsidian: zip de `.md` a notas con inserciones por lotes.
+
+El zip se recorre entrada a entrada (solo hay en memoria el índice de títulos y el lote en
+curso). Los `[[wikilinks]]` se resuelven con ese índice, construido a partir del directorio
+central del zip antes de leer ninguna nota, así que los enlaces hacia notas posteriores
+también se resuelven.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import zipfile
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import IO, Any, cast
+from uuid import UUID, uuid4
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert
+
+from app.core.clock import utcnow
+from app.db.session import async_session
+from app.models import Note, NoteLink, Vault
+from app.schemas import ImportFailure, ImportProgress, ImportResult, VaultRead
+from app.services.search import index_notes, remove_vault_documents
+from app.services.sync import next_vault_version
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+CONTENT_METADATA_FIELDS = {"content_length", "content_hash"}
+MAX_IMPORT_NOTES = 20_000
+MAX_IMPORT_NOTE_BYTES = 2 * 1024 * 1024
+# Tope de un lote por bytes leídos: 500 notas de 2 MiB no deben llegar juntas a memoria.
+IMPORT_BATCH_MAX_BYTES = 8 * 1024 * 1024
+
+# [[destino]], [[destino|alias]], [[destino#encabezado]] y embeds ![[destino]].
+_WIKILINK_RE = re.compile(r"\[\[([^\[\]|#^\n]+)(?:[#^][^\[\]|\n]*)?(?:\|[^\[\]\n]*)?\]\]")
+_FRONT_MATTER_RE = re.compile(r"\A---\n(.*?)\n---[ \t]*(?:\n|\Z)", re.DOTALL)
+_FRONT_MATTER_KEY_RE = re.compile(r"^([\w-]+):", re.MULTILINE)
+_FRONT_MATTER_TITLE_RE = re.compile(r"^title:[ \t]*(.+?)[ \t]*$", re.MULTILINE)
+# Claves que escribe la exportación Markdown; ese front-matter se descarta al reimportar.
+_EXPORT_FRONT_MATTER_KEYS = {"id", "title", "created", "updated", "links"}
+# Enlaces a adjuntos (imágenes, PDFs...): no son notas y no cuentan como rotos.
+_ATTACHMENT_RE = re.compile(r"\.(?!md$)[a-z0-9]{1,5}$")
+
+
+@dataclass(slots=True)
+class ImportEntry:
+    info: zipfile.ZipInfo
+    note_id: UUID
+    title: str
+
+
+@dataclass(slots=True)
+class ParsedNote:
+    title: str
+    content: str
+    link_targets: list[str]
+
+
+def _note_parts(info: zipfile.ZipInfo) -> tuple[str, ...] | None:
+    if info.is_dir() or not info.filename.lower().endswith(".md"):
+        return None
+    parts = PurePosixPath(info.filename.replace("\\", "/")).parts
+    # Configuración de Obsidian (.obsidian/, .trash/) y metadatos de macOS.
+    if any(part.startswith(".") or part == "__MACOSX" for part in parts):
+        return None
+    return parts
+
+
+def _link_key(target: str) -> str:
+    key = target.strip().replace("\\", "/").lstrip("/").lower()
+    return key.removesuffix(".md")
+
+
+class ObsidianArchive:
+    """Zip subido más el índice `título/ruta -> id` de sus notas."""
+
+    def __init__(self, fileobj: IO[bytes]) -> None:
+        try:
+            self._zip = zipfile.ZipFile(fileobj)
+        except (zipfile.BadZipFile, OSError) as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Archivo zip inválido"
+            ) from exc
+
+        notes = [
+            (info, parts)
+            for info in self._zip.infolist()
+            if (parts := _note_parts(info)) is not None
+        ]
+        if len(notes) > MAX_IMPORT_NOTES:
+            self._zip.close()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El zip supera el máximo de {MAX_IMPORT_NOTES} notas",
+            )
+        oversized = next(
+            (info for info, _ in notes if info.file_size > MAX_IMPORT_NOTE_BYTES), None
+        )
+        if oversized is not None:
+            self._zip.close()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La nota {oversized.filename} supera el tamaño máximo",
+            )
+
+        # Un zip de un vault suele traer una carpeta raíz con su nombre.
+        roots = {parts[0] for _, parts in notes if len(parts) > 1}
+        self.root_name: str | None = None
+        if len(roots) == 1 and all(len(parts) > 1 for _, parts in notes):
+            self.root_name = roots.pop()
+            notes = [(info, parts[1:]) for info, parts in notes]
+
+        self.entries: list[ImportEntry] = []
+        self._by_path: dict[str, UUID] = {}
+        self._by_name: dict[str, UUID] = {}
+        for info, parts in notes:
+            entry = ImportEntry(info=info, note_id=uuid4(), title=parts[-1][:-3])
+            self.entries.append(entry)
+            self._by_path["/".join(parts)[:-3].lower()] = entry.note_id
+        # Como Obsidian, un `[[Nombre]]` ambiguo apunta a la nota menos anidada.
+        ranked = sorted(zip(self.entries, notes, strict=True), key=lambda item: len(item[1][1]))
+        for entry, _ in ranked:
+            self._by_name.setdefault(entry.title.lower(), entry.note_id)
+
+    def resolve(self, target: str) -> UUID | None:
+        key = _link_key(target)
+        return self._by_path.get(key) or self._by_name.get(key.rsplit("/", 1)[-1])
+
+    def read_texts(self, entries: Sequence[ImportEntry]) -> list[str]:
+        """Lee un lote de notas; bloqueante, pensado para ejecutarse fuera del event loop.
+
+        Se detiene al superar `IMPORT_BATCH_MAX_BYTES` leídos (siempre lee al menos una), así
+        que puede devolver menos textos que entradas recibidas.
+        """
+        texts: list[str] = []
+        read_bytes = 0
+        for entry in entries:
+            if texts and read_bytes >= IMPORT_BATCH_MAX_BYTES:
+                break
+            with self._zip.open(entry.info) as handle:
+                # El tamaño declarado en el zip no es fiable: se corta al leer.
+                raw = handle.read(MAX_IMPORT_NOTE_BYTES + 1)
+            if len(raw) > MAX_IMPORT_NOTE_BYTES:
+                raise ValueError(f"La nota {entry.info.filename} supera el tamaño máximo")
+            read_bytes += len(raw)
+            texts.append(raw.decode("utf-8-sig", errors="replace").replace("\r\n", "\n"))
+        return texts
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+def parse_note(text: str, default_title: str) -> ParsedNote:
+    """Título, contenido y destinos de `[[wikilinks]]` (front-matter incluido) de una nota."""
+    title = default_title
+    content = text
+    match = _FRONT_MATTER_RE.match(text)
+    if match is not None:
+        front_matter = match.group(1)
+        title_match = _FRONT_MATTER_TITLE_RE.search(front_matter)
+        if title_match is not None:
+            title = _front_matter_string(title_match.group(1))
+        if set(_FRONT_MATTER_KEY_RE.findall(front_matter)) <= _EXPORT_FRONT_MATTER_KEYS:
+            content = text[match.end() :].removeprefix("\n")
+    return ParsedNote(
+        title=title,
+        content=content,
+        link_targets=_WIKILINK_RE.findall(text),
+    )
+
+
+def _front_matter_string(raw: str) -> str:
+    if raw.startswith('"'):
+        try:
+            value = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return raw.strip('"')
+        return value if isinstance(value, str) else raw
+    return raw.strip("'")
+
+
+async def import_obsidian_vault(
+    archive: ObsidianArchive, owner_id: UUID, name: str, theme: str
+) -> AsyncIterator[bytes]:
+    """Crea el vault y sus notas por lotes, emitiendo progreso en NDJSON.
+
+    Cada lote confirma su propia transacción antes de emitir el progreso: con SQLite el
+    turno de escritura no queda retenido mientras se espera a un cliente lento. Si algo
+    falla (o el cliente se va) se borra lo ya importado. Las aristas se insertan al final
+    porque pueden apuntar a notas de lotes posteriores; las notas llevan una versión más
+    que el vault, que la alcanza al terminar, para que `/changes` las entregue todas.
+    """
+    total = len(archive.entries)
+    vault_id: UUID | None = None
+    completed = False
+    try:
+        async with async_session() as session:
+            vault = Vault(name=name, theme=theme, owner_id=owner_id, version=1)
+            session.add(vault)
+            await session.commit()
+            vault_id = vault.id
+            notes_version = vault.version + 1
+
+            edges: list[tuple[UUID, UUID]] = []
+            unresolved = 0
+            processed = 0
+            while processed < total:
+                candidates = archive.entries[processed : processed + IMPORT_BATCH_SIZE]
+                texts = await asyncio.to_thread(archive.read_texts, candidates)
+                batch = candidates[: len(texts)]
+                now = utcnow()
+                notes = []
+                for entry, text in zip(batch, texts, strict=True):
+                    parsed = parse_note(text, entry.title)
+                    links: list[UUID] = []
+                    for target in parsed.link_targets:
+                        target_id = archive.resolve(target)
+                        if target_id is None:
+                            if _ATTACHMENT_RE.search(_link_key(target)) is None:
+                                unresolved += 1
+                        elif target_id != entry.note_id and target_id not in links:
+                            links.append(target_id)
+                    edges.extend((entry.note_id, target_id) for target_id in links)
+                    notes.append(
+                        Note(
+                            id=entry.note_id,
+                            vault_id=vault_id,
+                            title=parsed.title,
+                            content=parsed.content,
+                            links=[str(link) for link in links],
+                            version=notes_version,
+                            created_at=now,
+                            updated_at=now,
+                        )
+                    )
+                # Sin longitud/hash: los calculan los defaults de columna a partir de `content`.
+                rows = [note.model_dump(exclude=CONTENT_METADATA_FIELDS) for note in notes]
+                await session.execute(insert(Note), rows)
+                await index_notes(session, notes, replace=False)
+                await session.commit()
+                processed += len(batch)
+                yield _event(ImportProgress(processed=processed, total=total))
+
+            for start in range(0, len(edges), IMPORT_BATCH_SIZE):
+                await session.execute(
+                    insert(NoteLink),
+                    [
+                        {"source_id": source_id, "target_id": target_id, "vault_id": vault_id}
+                        for source_id, target_id in edges[start : start + IMPORT_BATCH_SIZE]
+                    ],
+                )
+            await next_vault_version(session, vault_id)
+            await session.commit()
+            await session.refresh(vault)
+            result = ImportResult(
+                vault=VaultRead.model_validate(vault),
+                notes=total,
+                links=len(edges),
+                unresolved_links=unresolved,
+            )
+        completed = True
+        yield _event(result)
+    except ValueError as exc:
+        yield _event(ImportFailure(detail=str(exc)))
+    except Exception:
+        logger.exception("Falló la importación del vault %s", name)
+        yield _event(ImportFailure(detail="No se pudo importar el vault"))
+    finally:
+        archive.close()
+        if vault_id is not None and not completed:
+            await _discard_vault(vault_id)
+
+
+async def _discard_vault(vault_id: UUID) -> None:
+    """Borra un vault importado a medias (SQLite no aplica los `ON DELETE CASCADE`)."""
+    try:
+        async with async_session() as session:
+            await session.execute(delete(NoteLink).where(cast(Any, NoteLink.vault_id) == vault_id))
+            await remove_vault_documents(session, vault_id)
+            await session.execute(delete(Note).where(cast(Any, Note.vault_id) == vault_id))
+            await session.execute(delete(Vault).where(cast(Any, Vault.id) == vault_id))
+            await session.commit()
+    except Exception:
+        logger.exception("No se pudo borrar el vault importado a medias %s", vault_id)
+
+
+def _event(payload: ImportProgress | ImportResult | ImportFailure) -> bytes:
+    return payload.model_dump_json().encode() + b"\n"
@@ -0,0 +1 @@
+# Reproducible benchmarks (run manually, not part of pytest).
@@ -0,0 +1,356 @@
+"""Carga concurrente sobre la API de vaults y notas, con la app FastAPI en proceso.
+
+Uso:
+    uv run --directory backend python -m benchmarks.api_load --sizes 100,10000,100000
+    uv run --directory backend python -m benchmarks.api_load --output before.json
+    uv run --directory backend python -m benchmarks.compare before.json after.json
+
+Por cada tamaño crea un usuario con un vault de N notas (enlaces con distribución sesgada
+hacia notas "hub", como un vault real) y lanza cada workload con `--concurrency` clientes
+concurrentes. El JSON de salida incluye throughput y p50/p95/p99 por workload.
+
+Usa un SQLite temporal e ignora `DATABASE_URL`; para Postgres exporta `BENCH_DATABASE_URL`
+apuntando a una base desechable (el script recrea las tablas). `PASSWORD_BCRYPT_ROUNDS`
+fija el coste del hash que mide el workload de login. `--login-flood N` añade N atacantes
+haciendo login con contraseña incorrecta durante cada workload, para ver cómo afecta un
+abuso a las lecturas (el control de admisión está desactivado salvo que se exporten sus
+variables).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+from uuid import UUID, uuid4
+
+from benchmarks.common import (
+    cleanup_temporary_database,
+    latency_summary,
+    run_metadata,
+    use_temporary_database,
+)
+
+use_temporary_database()
+# Mide capacidad, no el control de admisión: sin límites salvo que se pidan explícitamente.
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("AUTH_MAX_CONCURRENCY", "0")
+os.environ.setdefault("NOTE_WRITE_MAX_CONCURRENCY", "0")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.core.clock import utcnow  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.session import async_session, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Note, NoteLink, NoteSearchDocument, User, Vault  # noqa: E402
+
+PASSWORD = "bench-password"
+SEED_BATCH_SIZE = 2000
+WORKLOADS = ("login", "read_vault", "list_notes", "update_note", "create_note")
+_WORDS = [
+    "idea",
+    "proyecto",
+    "lectura",
+    "resumen",
+    "reunión",
+    "tarea",
+    "diseño",
+    "borrador",
+    "referencia",
+    "cita",
+    "pregunta",
+    "respuesta",
+    "hipótesis",
+    "experimento",
+    "resultado",
+    "nota",
+    "enlace",
+    "grafo",
+    "mapa",
+    "índice",
+    "sesión",
+]
+
+Request = Callable[[httpx.AsyncClient, random.Random], Awaitable[httpx.Response]]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(_WORDS, k=words))
+
+
+def _link_targets(rng: random.Random, note_ids: list[UUID], index: int, mean: float) -> list[str]:
+    """Enlaces de la nota `index`: cantidad geométrica y destinos sesgados a los primeros IDs."""
+    count = 0
+    while rng.random() < mean / (mean + 1):
+        count += 1
+    targets: list[str] = []
+    for _ in range(count):
+        target = note_ids[int(len(note_ids) * rng.random() ** 2)]
+        if target != note_ids[index] and str(target) not in targets:
+            targets.append(str(target))
+    return targets
+
+
+async def seed_vault(
+    size: int, links_per_note: float, password_hash: str, rng: random.Random
+) -> dict[str, Any]:
+    """Usuario + vault de `size` notas con sus aristas e índice de búsqueda (inserts por lotes)."""
+    user = User(
+        email=f"bench-{size}-{uuid4().hex[:6]}@example.com",
+        hashed_password=password_hash,
+        provisioned_at=utcnow(),
+    )
+    vault = Vault(name=f"bench-{size}", theme="violet", owner_id=user.id, version=1)
+    note_ids = [uuid4() for _ in range(size)]
+    edges: list[dict[str, UUID]] = []
+    async with async_session() as session:
+        session.add(user)
+        session.add(vault)
+        await session.flush()
+        for start in range(0, size, SEED_BATCH_SIZE):
+            now = utcnow()
+            rows = [
+                {
+                    "id": note_ids[index],
+                    "vault_id": vault.id,
+                    "title": f"{_sentence(rng, 3)} {index}",
+                    "content": _sentence(rng, rng.randint(40, 400)),
+                    "links": _link_targets(rng, note_ids, index, links_per_note),
+                    "version": 1,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index in range(start, min(start + SEED_BATCH_SIZE, size))
+            ]
+            await session.execute(insert(Note), rows)
+            edges.extend(
+                {"source_id": row["id"], "target_id": UUID(target), "vault_id": vault.id}
+                for row in rows
+                for target in row["links"]
+            )
+            await session.execute(
+                insert(NoteSearchDocument),
+                [
+                    {
+                        "note_id": row["id"],
+                        "vault_id": vault.id,
+                        "title": row["title"],
+                        "content": row["content"],
+                    }
+                    for row in rows
+                ],
+            )
+        # Las aristas pueden apuntar a notas de lotes posteriores (FK inmediata en Postgres).
+        for start in range(0, len(edges), SEED_BATCH_SIZE):
+            await session.execute(insert(NoteLink), edges[start : start + SEED_BATCH_SIZE])
+        await session.commit()
+    return {"email": user.email, "vault_id": str(vault.id), "note_ids": [str(i) for i in note_ids]}
+
+
+def _requests(fixture: dict[str, Any], headers: dict[str, str]) -> dict[str, Request]:
+    vault_url = f"/api/vaults/{fixture['vault_id']}"
+    note_ids: list[str] = fixture["note_ids"]
+
+    async def login(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.post(
+            "/api/auth/login", json={"email": fixture["email"], "password": PASSWORD}
+        )
+
+    async def read_vault(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.get(vault_url, headers=headers)
+
+    async def list_notes(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.get(f"{vault_url}/notes", headers=headers)
+
+    async def update_note(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.patch(
+            f"{vault_url}/notes/{rng.choice(note_ids)}",
+            headers=headers,
+            json={"content": _sentence(rng, 120)},
+        )
+
+    async def create_note(client: httpx.AsyncClient, rng: random.Random) -> httpx.Response:
+        return await client.post(
+            f"{vault_url}/notes",
+            headers=headers,
+            json={
+                "title": _sentence(rng, 3),
+                "content": _sentence(rng, 120),
+                "links": rng.sample(note_ids, min(2, len(note_ids))),
+            },
+        )
+
+    return {
+        "login": login,
+        "read_vault": read_vault,
+        "list_notes": list_notes,
+        "update_note": update_note,
+        "create_note": create_note,
+    }
+
+
+async def run_workload(
+    client: httpx.AsyncClient,
+    request: Request,
+    requests: int,
+    concurrency: int,
+    max_seconds: float,
+    seed: int,
+) -> dict[str, Any]:
+    """`requests` peticiones repartidas entre `concurrency` clientes (o hasta `max_seconds`)."""
+    timings: list[float] = []
+    errors = 0
+    pending = iter(range(requests))
+    started = time.perf_counter()
+    deadline = started + max_seconds
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed * 1000 + worker_id)
+        for _ in pending:
+            if time.perf_counter() > deadline:
+                return
+            request_started = time.perf_counter()
+            response = await request(client, rng)
+            timings.append((time.perf_counter() - request_started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    await asyncio.gather(*(worker(worker_id) for worker_id in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(timings) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": latency_summary(timings),
+    }
+
+
+async def login_flood(
+    client: httpx.AsyncClient, email: str, clients: int, pause: float, stop: asyncio.Event
+) -> dict[str, int]:
+    """Logins con contraseña incorrecta desde `clients` atacantes hasta que se active `stop`."""
+    statuses: Counter[int] = Counter()
+
+    async def attacker() -> None:
+        while not stop.is_set():
+            response = await client.post(
+                "/api/auth/login", json={"email": email, "password": "wrong-password"}
+            )
+            statuses[response.status_code] += 1
+            await asyncio.sleep(pause)
+
+    await asyncio.gather(*(attacker() for _ in range(clients)))
+    return {str(code): count for code, count in sorted(statuses.items())}
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    password_hash = get_password_hash(PASSWORD)
+    workloads = [name for name in args.workloads.split(",") if name]
+
+    report: dict[str, Any] = {
+        **run_metadata(),
+        "dialect": engine.dialect.name,
+        "concurrency": args.concurrency,
+        "requests_per_workload": args.requests,
+        "links_per_note": args.links,
+        "login_flood_clients": args.login_flood,
+        "sizes": {},
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size in (int(value) for value in args.sizes.split(",") if value):
+            seed_started = time.perf_counter()
+            fixture = await seed_vault(size, args.links, password_hash, rng)
+            seed_seconds = time.perf_counter() - seed_started
+
+            response = await client.post(
+                "/api/auth/login", json={"email": fixture["email"], "password": PASSWORD}
+            )
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            requests = _requests(fixture, headers)
+
+            results: dict[str, Any] = {"seed_seconds": round(seed_seconds, 2)}
+            for index, name in enumerate(workloads):
+                await requests[name](client, random.Random(index))  # calentamiento
+                stop = asyncio.Event()
+                flood = asyncio.create_task(
+                    login_flood(
+                        client, fixture["email"], args.login_flood, args.login_flood_pause, stop
+                    )
+                )
+                results[name] = await run_workload(
+                    client,
+                    requests[name],
+                    args.requests,
+                    args.concurrency,
+                    args.max_seconds,
+                    args.seed + index,
+                )
+                stop.set()
+                flood_statuses = await flood
+                if args.login_flood:
+                    results[name]["login_flood_statuses"] = flood_statuses
+            report["sizes"][str(size)] = results
+    await engine.dispose()
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de carga de la API de vaults/notas.")
+    parser.add_argument("--sizes", default="100,10000,100000", help="Notas por vault (CSV).")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help="Workloads (CSV).")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Peticiones por workload.")
+    parser.add_argument(
+        "--max-seconds", type=float, default=60.0, help="Tope de tiempo por workload."
+    )
+    parser.add_argument("--links", type=float, default=3.0, help="Enlaces medios por nota.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--login-flood",
+        type=int,
+        default=0,
+        help="Atacantes haciendo login con contraseña incorrecta durante cada workload.",
+    )
+    parser.add_argument(
+        "--login-flood-pause", type=float, default=0.05, help="Pausa entre logins por atacante."
+    )
+    parser.add_argument("--output", type=Path, help="Escribe el JSON también en este archivo.")
+    args = parser.parse_args()
+    unknown = set(args.workloads.split(",")) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"Workloads desconocidos: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        cleanup_temporary_database()
+    output = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
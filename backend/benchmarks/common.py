@@ -0,0 +1,66 @@
+"""Utilidades compartidas por los benchmarks (base temporal, percentiles, metadatos)."""
+
+from __future__ import annotations
+
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+_TMP_DIR: str | None = None
+
+
+def use_temporary_database() -> None:
+    """Apunta la app a la base del benchmark. Llamar antes de importar `app`.
+
+    Los benchmarks borran y recrean las tablas, así que nunca usan `DATABASE_URL`: por
+    defecto un SQLite temporal, o la base desechable de `BENCH_DATABASE_URL`.
+    """
+    global _TMP_DIR
+    bench_url = os.environ.get("BENCH_DATABASE_URL")
+    if bench_url:
+        if bench_url == os.environ.get("DATABASE_URL"):
+            raise SystemExit("BENCH_DATABASE_URL no puede ser la base de la app (DATABASE_URL)")
+        os.environ["DATABASE_URL"] = bench_url
+        return
+    _TMP_DIR = tempfile.mkdtemp(prefix="vitrum-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(_TMP_DIR) / 'bench.db'}"
+
+
+def cleanup_temporary_database() -> None:
+    if _TMP_DIR is not None:
+        shutil.rmtree(_TMP_DIR, ignore_errors=True)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def latency_summary(timings_ms: list[float]) -> dict[str, float]:
+    if not timings_ms:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    return {
+        "p50": round(statistics.median(timings_ms), 2),
+        "p95": round(percentile(timings_ms, 95), 2),
+        "p99": round(percentile(timings_ms, 99), 2),
+    }
+
+
+def run_metadata() -> dict[str, str | None]:
+    """Commit y entorno, para comparar resultados entre ejecuciones."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "machine": platform.machine()}
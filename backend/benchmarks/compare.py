@@ -0,0 +1,70 @@
+"""Compara dos reportes de `benchmarks.api_load` (p. ej. antes y después de un commit).
+
+Uso:
+    uv run --directory backend python -m benchmarks.compare before.json after.json
+
+Imprime, por tamaño y workload, throughput y p50/p95/p99 de ambos con la variación en %.
+Con `--fail-above PCT` termina con código 1 si algún p95 empeora más de ese porcentaje.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def _delta(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare(before: dict[str, Any], after: dict[str, Any]) -> tuple[list[str], float]:
+    lines = [f"{before.get('commit')} -> {after.get('commit')} ({after.get('dialect')})"]
+    worst_p95 = 0.0
+    for size, workloads in after["sizes"].items():
+        previous = before["sizes"].get(size, {})
+        for name, result in workloads.items():
+            if not isinstance(result, dict) or name not in previous:
+                continue
+            old = previous[name]
+            metrics = [("rps", old["throughput_rps"], result["throughput_rps"])]
+            metrics += [
+                (pct, old["latency_ms"][pct], result["latency_ms"][pct])
+                for pct in ("p50", "p95", "p99")
+            ]
+            cells = "  ".join(
+                f"{label} {old_value}->{new_value} ({_delta(old_value, new_value)})"
+                for label, old_value, new_value in metrics
+            )
+            lines.append(f"{size:>7} {name:<12} {cells}")
+            if old["latency_ms"]["p95"]:
+                change = (result["latency_ms"]["p95"] - old["latency_ms"]["p95"]) / old[
+                    "latency_ms"
+                ]["p95"]
+                worst_p95 = max(worst_p95, change * 100)
+    return lines, worst_p95
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara dos reportes de api_load.")
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    parser.add_argument("--fail-above", type=float, help="Regresión máxima de p95 en %%.")
+    args = parser.parse_args()
+
+    lines, worst_p95 = compare(
+        json.loads(args.before.read_text(encoding="utf-8")),
+        json.loads(args.after.read_text(encoding="utf-8")),
+    )
+    print("\n".join(lines))
+    if args.fail_above is not None and worst_p95 > args.fail_above:
+        print(f"p95 empeoró {worst_p95:.1f}% (> {args.fail_above}%)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Latencia de búsqueda full-text sobre un vault grande.
+
+Uso:
+    uv run --directory backend python -m benchmarks.search_latency --notes 50000
+
+Usa un SQLite temporal (FTS5) e ignora `DATABASE_URL`. Exporta `BENCH_DATABASE_URL`
+apuntando a una base desechable de Postgres para medir `tsvector` + GIN: el script recrea
+el esquema.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from uuid import uuid4
+
+from benchmarks.common import (
+    cleanup_temporary_database,
+    latency_summary,
+    run_metadata,
+    use_temporary_database,
+)
+
+use_temporary_database()
+
+from sqlalchemy import insert  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.db.session import async_session, engine  # noqa: E402
+from app.models import Note, NoteSearchDocument, User, Vault  # noqa: E402
+from app.services.search import search_notes  # noqa: E402
+
+_SYLLABLES = ["ra", "mo", "ne", "ti", "lu", "ca", "so", "ve", "pi", "da", "gor", "fen"]
+
+
+def _vocabulary(size: int, rng: random.Random) -> list[str]:
+    words: set[str] = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _text(words: list[str], weights: list[float], count: int, rng: random.Random) -> str:
+    return " ".join(rng.choices(words, weights=weights, k=count))
+
+
+async def seed(notes: int, words_per_note: int, rng: random.Random) -> tuple[Vault, list[str]]:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    vocabulary = _vocabulary(5000, rng)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]  # Zipf aproximado
+    async with async_session() as session:
+        user = User(email=f"bench-{uuid4().hex[:8]}@example.com", hashed_password="x")
+        vault = Vault(name="bench", owner_id=user.id)
+        session.add(user)
+        session.add(vault)
+        await session.flush()
+        for start in range(0, notes, 1000):
+            batch = [
+                {
+                    "id": uuid4(),
+                    "vault_id": vault.id,
+                    "title": _text(vocabulary, weights, 4, rng),
+                    "content": _text(vocabulary, weights, words_per_note, rng),
+                    "links": [],
+                }
+                for _ in range(min(1000, notes - start))
+            ]
+            await session.execute(insert(Note), batch)
+            await session.execute(
+                insert(NoteSearchDocument),
+                [
+                    {key: row[key] for key in ("vault_id", "title", "content")}
+                    | {"note_id": row["id"]}
+                    for row in batch
+                ],
+            )
+        await session.commit()
+    return vault, vocabulary
+
+
+async def measure(vault: Vault, queries: list[str], limit: int) -> list[float]:
+    timings: list[float] = []
+    async with async_session() as session:
+        for query in queries:
+            started = time.perf_counter()
+            await search_notes(session, vault.id, query, limit, 0)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def run(args: argparse.Namespace) -> dict[str, object]:
+    rng = random.Random(args.seed)
+    seed_started = time.perf_counter()
+    vault, vocabulary = await seed(args.notes, args.words, rng)
+    seed_seconds = time.perf_counter() - seed_started
+
+    common, rare = vocabulary[:50], vocabulary[-2000:]
+    workloads = {
+        "common_term": [rng.choice(common) for _ in range(args.queries)],
+        "rare_term": [rng.choice(rare) for _ in range(args.queries)],
+        "two_terms": [f"{rng.choice(common)} {rng.choice(rare)}" for _ in range(args.queries)],
+        "prefix": [rng.choice(rare)[:3] for _ in range(args.queries)],
+    }
+    report: dict[str, object] = {
+        **run_metadata(),
+        "dialect": engine.dialect.name,
+        "notes": args.notes,
+        "words_per_note": args.words,
+        "seed_seconds": round(seed_seconds, 2),
+        "latency_ms": {},
+    }
+    latency = report["latency_ms"]
+    assert isinstance(latency, dict)
+    for name, queries in workloads.items():
+        await measure(vault, queries[:5], args.limit)  # calentar caché de páginas
+        timings = await measure(vault, queries, args.limit)
+        latency[name] = latency_summary(timings)
+    await engine.dispose()
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de /vaults/{id}/search.")
+    parser.add_argument("--notes", type=int, default=50_000)
+    parser.add_argument("--words", type=int, default=150, help="Palabras por nota.")
+    parser.add_argument("--queries", type=int, default=200, help="Consultas por workload.")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> None:
+    try:
+        print(json.dumps(asyncio.run(run(parse_args())), indent=2))
+    finally:
+        cleanup_temporary_database()
+
+
+if __name__ == "__main__":
+    main()
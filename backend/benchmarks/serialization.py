@@ -0,0 +1,129 @@
+"""Serialización de `read_vault`: ruta ORM + pydantic frente a columnas + orjson.
+
+Uso:
+    uv run --directory backend python -m benchmarks.serialization --notes 10000
+
+La ruta "orm_pydantic" reproduce la anterior: carga las notas como objetos ORM, las ordena
+en Python, construye `NoteRead` por nota y valida/serializa de nuevo contra
+`response_model` como hace FastAPI. "columns_orjson" es la ruta actual de la API.
+
+Usa un SQLite temporal (o la base desechable de `BENCH_DATABASE_URL`): recrea las tablas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, cast
+from uuid import UUID
+
+from benchmarks.common import (
+    cleanup_temporary_database,
+    latency_summary,
+    run_metadata,
+    use_temporary_database,
+)
+
+use_temporary_database()
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+from sqlmodel import SQLModel, select  # noqa: E402
+
+from app.api.serialization import encode_vault_with_notes  # noqa: E402
+from app.api.v1.endpoints.vaults import _serialize_vault  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.session import async_session, engine  # noqa: E402
+from app.models import Note, Vault  # noqa: E402
+from app.schemas import VaultWithNotes  # noqa: E402
+from benchmarks.api_load import seed_vault  # noqa: E402
+
+_RESPONSE_ADAPTER = TypeAdapter(VaultWithNotes)
+
+
+async def orm_pydantic(vault_id: UUID) -> bytes:
+    async with async_session() as session:
+        result = await session.execute(
+            select(Vault)
+            .where(Vault.id == vault_id)
+            .options(selectinload(cast(Any, Vault.notes)).undefer(cast(Any, Note.content)))
+        )
+        vault = result.scalar_one()
+        payload = _serialize_vault(vault)
+        # FastAPI valida el valor devuelto contra `response_model` antes de serializarlo.
+        validated = _RESPONSE_ADAPTER.validate_python(payload, from_attributes=True)
+        return _RESPONSE_ADAPTER.dump_json(validated)
+
+
+async def columns_orjson(vault_id: UUID) -> bytes:
+    async with async_session() as session:
+        vault = (await session.execute(select(Vault).where(Vault.id == vault_id))).scalar_one()
+        return await encode_vault_with_notes(session, vault)
+
+
+def _normalized(body: bytes) -> dict[str, Any]:
+    # Las notas sembradas por lote comparten timestamps: el orden entre empates no cuenta.
+    payload = json.loads(body)
+    payload["notes"] = sorted(payload["notes"], key=lambda note: note["id"])
+    return payload
+
+
+async def measure(
+    path: Callable[[UUID], Awaitable[bytes]], vault_id: UUID, runs: int
+) -> list[float]:
+    await path(vault_id)  # calentamiento
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await path(vault_id)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    fixture = await seed_vault(args.notes, 3.0, get_password_hash("x"), random.Random(args.seed))
+    vault_id = UUID(fixture["vault_id"])
+    legacy, fast = await orm_pydantic(vault_id), await columns_orjson(vault_id)
+    same_payload = _normalized(legacy) == _normalized(fast)
+
+    report: dict[str, Any] = {
+        **run_metadata(),
+        "dialect": engine.dialect.name,
+        "notes": args.notes,
+        "response_bytes": len(fast),
+        "same_payload": same_payload,
+        "latency_ms": {},
+    }
+    for name, path in (("orm_pydantic", orm_pydantic), ("columns_orjson", columns_orjson)):
+        report["latency_ms"][name] = latency_summary(await measure(path, vault_id, args.runs))
+    legacy_p50 = report["latency_ms"]["orm_pydantic"]["p50"]
+    fast_p50 = report["latency_ms"]["columns_orjson"]["p50"]
+    report["speedup_p50"] = round(legacy_p50 / fast_p50, 2) if fast_p50 else None
+    await engine.dispose()
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de read_vault.")
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> None:
+    try:
+        print(json.dumps(asyncio.run(run(parse_args())), indent=2))
+    finally:
+        cleanup_temporary_database()
+
+
+if __name__ == "__main__":
+    main()
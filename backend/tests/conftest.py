@@ -0,0 +1,72 @@
+"""Fixtures compartidas: la app sobre una base temporal y un contador de sentencias SQL."""
+
+import os
+import tempfile
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from typing import Any
+
+# Antes de importar la app: el engine se crea al importar `app.db.session`. Los tests
+# borran y recrean las tablas, así que nunca usan `DATABASE_URL`: por defecto una SQLite
+# temporal, o la base desechable que se indique en `TEST_DATABASE_URL`.
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='vitrum-tests-')}/test.db"
+)
+os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "4")
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+from app.db.session import engine
+from app.main import app
+from app.services.admission import admission
+from app.services.principals import clear_principal_caches
+from app.services.response_cache import response_cache
+
+CountQueries = Callable[[], AbstractContextManager[list[str]]]
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    clear_principal_caches()
+    admission.store.clear()
+    response_cache.clear()
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as http_client:
+        yield http_client
+    # Cada test corre en su propio event loop: las conexiones no se reutilizan entre tests.
+    await engine.dispose()
+
+
+@pytest.fixture
+def count_queries() -> CountQueries:
+    """`with count_queries() as statements:` registra las sentencias SQL emitidas dentro."""
+
+    @contextmanager
+    def _count() -> Iterator[list[str]]:
+        statements: list[str] = []
+
+        def _record(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+    return _count
+
+
+async def register(client: httpx.AsyncClient, email: str = "ana@example.com") -> dict[str, str]:
+    response = await client.post(
+        "/api/auth/register", json={"email": email, "password": "password1"}
+    )
+    assert response.status_code == 201, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
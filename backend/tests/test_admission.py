@@ -0,0 +1,113 @@
+import io
+import zipfile
+
+import httpx
+import pytest
+
+from app.api import admission as admission_api
+from app.db.session import engine
+from app.services.admission import (
+    PostgresRateLimitStore,
+    RateLimit,
+    auth_concurrency,
+    gcra,
+)
+from tests.conftest import register
+
+
+def test_gcra_allows_burst_then_refills() -> None:
+    limit = RateLimit(per_minute=60, burst=3)
+    tat = None
+    for _ in range(3):
+        tat, wait = gcra(tat, 100.0, limit)
+        assert wait == 0
+    _, wait = gcra(tat, 100.0, limit)
+    assert wait == pytest.approx(1.0)
+    # Un segundo después vuelve a haber una ficha (y solo una).
+    tat, wait = gcra(tat, 101.0, limit)
+    assert wait == 0
+    assert gcra(tat, 101.0, limit)[1] > 0
+
+
+async def test_auth_limits_per_account_ip_and_concurrency(client: httpx.AsyncClient) -> None:
+    await register(client)
+    credentials = {"email": "ana@example.com", "password": "password1"}
+    statuses = [
+        (await client.post("/api/auth/login", json=credentials)).status_code for _ in range(5)
+    ]
+    # El registro ya gastó una ficha de la cuenta (ráfaga de 5).
+    assert statuses == [200, 200, 200, 200, 429]
+
+    others = [
+        await client.post(
+            "/api/auth/login", json={"email": f"otro{index}@example.com", "password": "password1"}
+        )
+        for index in range(5)
+    ]
+    # La IP lleva 10 intentos: el resto se corta antes de bcrypt.
+    assert [response.status_code for response in others] == [401, 401, 401, 401, 429]
+    assert int(others[-1].headers["Retry-After"]) >= 1
+
+    in_flight = auth_concurrency.in_flight
+    auth_concurrency.in_flight = auth_concurrency.limit
+    try:
+        busy = await client.post("/api/auth/login", json=credentials)
+    finally:
+        auth_concurrency.in_flight = in_flight
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "1"
+
+
+async def test_note_writes_are_limited_per_user(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(admission_api, "NOTE_WRITE_LIMIT", RateLimit(per_minute=60, burst=2))
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    notes_url = f"/api/vaults/{vault['id']}/notes"
+
+    statuses = [
+        (await client.post(notes_url, headers=headers, json={"title": "N"})).status_code
+        for _ in range(3)
+    ]
+    assert statuses == [201, 201, 429]
+    # Las lecturas no pasan por el límite.
+    assert (await client.get(notes_url, headers=headers)).status_code == 200
+
+    other = await register(client, "bea@example.com")
+    other_vault = (await client.get("/api/vaults/summary", headers=other)).json()[0]
+    created = await client.post(
+        f"/api/vaults/{other_vault['id']}/notes", headers=other, json={"title": "N"}
+    )
+    assert created.status_code == 201
+
+
+async def test_postgres_store_shares_buckets(client: httpx.AsyncClient) -> None:
+    if engine.dialect.name != "postgresql":
+        pytest.skip("Solo aplica a Postgres")
+    limit = RateLimit(per_minute=60, burst=2)
+    first, second = PostgresRateLimitStore(), PostgresRateLimitStore()
+    assert await first.take("test:shared", limit) == 0
+    assert await second.take("test:shared", limit) == 0
+    assert await first.take("test:shared", limit) == pytest.approx(1.0, abs=0.2)
+    assert await second.take("test:other", limit) == 0
+
+
+async def test_vault_imports_share_the_note_write_limit(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(admission_api, "NOTE_WRITE_LIMIT", RateLimit(per_minute=60, burst=1))
+    headers = await register(client)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as bundle:
+        bundle.writestr("Vault/Nota.md", "Hola")
+
+    def upload() -> dict[str, tuple[str, bytes]]:
+        return {"file": ("vault.zip", archive.getvalue())}
+
+    first = await client.post("/api/vaults/import", headers=headers, files=upload())
+    assert first.status_code == 200
+    rejected = await client.post("/api/vaults/import", headers=headers, files=upload())
+    assert rejected.status_code == 429
+    names = [vault["name"] for vault in (await client.get("/api/vaults", headers=headers)).json()]
+    assert names.count("Vault") == 1
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.db.profiles import engine_options
+from app.db.session import engine
+
+
+def test_postgres_profile_options() -> None:
+    tuned = settings.model_copy(
+        update={"db_pool_size": 20, "db_statement_cache_size": 0, "db_statement_timeout_ms": 1500}
+    )
+    options = engine_options(make_url("postgresql+asyncpg://app@db/app"), tuned)
+
+    assert options["pool_size"] == 20
+    assert options["connect_args"] == {
+        "prepared_statement_cache_size": 0,
+        "statement_cache_size": 0,
+        "server_settings": {"statement_timeout": "1500"},
+    }
+    assert engine_options(make_url("sqlite+aiosqlite://"), tuned) == {}
+
+
+async def test_sqlite_writers_are_queued() -> None:
+    if engine.dialect.name != "sqlite":
+        pytest.skip("Solo aplica a SQLite")
+    async with engine.begin() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        await conn.execute(text("DROP TABLE IF EXISTS writer_queue_probe"))
+        await conn.execute(text("CREATE TABLE writer_queue_probe (value INTEGER)"))
+
+    async def write(value: int) -> None:
+        # Lee, escribe y cede el loop con la transacción abierta: sin cola, las demás
+        # transacciones chocan con el lock de SQLite.
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT count(*) FROM writer_queue_probe"))
+            await conn.execute(text("INSERT INTO writer_queue_probe VALUES (:v)"), {"v": value})
+            await asyncio.sleep(0.002)
+            await conn.execute(
+                text("UPDATE writer_queue_probe SET value = value + 1 WHERE value = :v"),
+                {"v": value},
+            )
+
+    await asyncio.gather(*(write(value * 10) for value in range(40)))
+    async with engine.connect() as conn:
+        count = (await conn.execute(text("SELECT count(*) FROM writer_queue_probe"))).scalar()
+    await engine.dispose()
+    assert count == 40
@@ -0,0 +1,68 @@
+import io
+import zipfile
+
+import httpx
+import orjson
+
+from tests.conftest import register
+
+
+async def _setup(client: httpx.AsyncClient) -> tuple[dict[str, str], str]:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    return headers, f"/api/vaults/{vault['id']}"
+
+
+async def test_ndjson_export_streams_vault_then_notes(client: httpx.AsyncClient) -> None:
+    headers, vault_url = await _setup(client)
+    await client.post(
+        f"{vault_url}/notes", headers=headers, json={"title": "Nueva", "content": "hola"}
+    )
+
+    response = await client.get(f"{vault_url}/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-disposition"].endswith('.ndjson"')
+
+    vault_line, *note_lines = [orjson.loads(line) for line in response.content.splitlines()]
+    assert vault_line["type"] == "vault"
+    assert vault_line["id"] == vault_url.rsplit("/", 1)[1]
+    notes = (await client.get(f"{vault_url}/notes", headers=headers)).json()
+    assert [line["id"] for line in note_lines] == sorted(note["id"] for note in notes)
+    assert {line["type"] for line in note_lines} == {"note"}
+    assert {line["title"]: line["content"] for line in note_lines}["Nueva"] == "hola"
+
+
+async def test_markdown_export_names_are_unique(client: httpx.AsyncClient) -> None:
+    headers, vault_url = await _setup(client)
+    ids = {}
+    # Títulos distintos que dan el mismo archivo tras sanearlos o sin distinguir mayúsculas
+    # (incluidas las no ASCII).
+    for title in ("a/b", "a:b", "Ñandú", "ñandú", "", "Única"):
+        note = await client.post(f"{vault_url}/notes", headers=headers, json={"title": title})
+        ids[title] = note.json()["id"]
+    await client.post(
+        f"{vault_url}/notes",
+        headers=headers,
+        json={"title": "Índice", "links": [ids["a/b"], ids["ñandú"], ids["Única"]]},
+    )
+
+    response = await client.get(f"{vault_url}/export?format=markdown", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    names = archive.namelist()
+    notes = (await client.get(f"{vault_url}/notes", headers=headers)).json()
+    assert len(names) == len(notes)
+    assert len({name.casefold() for name in names}) == len(names)
+    assert "Única.md" in names
+    assert f"a-b ({ids['a/b'].replace('-', '')[:8]}).md" in names
+    assert f"Sin título ({ids[''].replace('-', '')[:8]}).md" in names
+
+    index = archive.read("Índice.md").decode()
+    assert 'title: "Índice"' in index
+    stems = {name.removesuffix(".md") for name in names}
+    wikilinks = [line.split('"')[1] for line in index.splitlines() if line.startswith("  - ")]
+    assert len(wikilinks) == 3
+    assert all(wikilink.removeprefix("[[").removesuffix("]]") in stems for wikilink in wikilinks)
@@ -0,0 +1,75 @@
+import httpx
+
+from app.services.graph import MAX_GRAPH_DEPTH
+from tests.conftest import register
+
+
+async def test_neighborhood_depth_and_cycles(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_url = f"/api/vaults/{vault['id']}"
+
+    # Cadena C0 -> C1 -> ... -> C7 con un ciclo C2 -> C0.
+    ids: dict[str, str] = {}
+    next_id: str | None = None
+    for index in reversed(range(8)):
+        links = [] if next_id is None else [next_id]
+        note = (
+            await client.post(
+                f"{vault_url}/notes", headers=headers, json={"title": f"C{index}", "links": links}
+            )
+        ).json()
+        ids[note["id"]] = note["title"]
+        next_id = note["id"]
+    by_title = {title: note_id for note_id, title in ids.items()}
+    await client.patch(
+        f"{vault_url}/notes/{by_title['C2']}",
+        headers=headers,
+        json={"links": [by_title["C3"], by_title["C0"]]},
+    )
+
+    async def hood(depth: int) -> tuple[set[str], int]:
+        response = await client.get(
+            f"{vault_url}/graph",
+            headers=headers,
+            params={"note_id": by_title["C0"], "depth": depth},
+        )
+        assert response.status_code == 200
+        graph = response.json()
+        return {ids[node["id"]] for node in graph["nodes"]}, len(graph["edges"])
+
+    assert await hood(1) == ({"C0", "C1", "C2"}, 3)
+    assert await hood(2) == ({"C0", "C1", "C2", "C3"}, 4)
+    nodes, edges = await hood(MAX_GRAPH_DEPTH)
+    assert nodes == {f"C{index}" for index in range(MAX_GRAPH_DEPTH + 2)}
+    assert edges == MAX_GRAPH_DEPTH + 2
+
+    too_deep = await client.get(
+        f"{vault_url}/graph",
+        headers=headers,
+        params={"note_id": by_title["C0"], "depth": MAX_GRAPH_DEPTH + 1},
+    )
+    assert too_deep.status_code == 422
+
+    full = (await client.get(f"{vault_url}/graph", headers=headers)).json()
+    # Las 8 notas de la cadena más las 2 del vault por defecto (enlazadas entre sí).
+    assert len(full["nodes"]) == 10
+    assert len(full["edges"]) == 7 + 1 + 2
+    assert all("content" not in node for node in full["nodes"])
+
+
+async def test_neighborhood_of_unknown_note_is_404(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    other = await register(client, "bea@example.com")
+    other_vault = (await client.get("/api/vaults/summary", headers=other)).json()[0]
+    foreign = (
+        await client.post(
+            f"/api/vaults/{other_vault['id']}/notes", headers=other, json={"title": "Ajena"}
+        )
+    ).json()
+
+    response = await client.get(
+        f"/api/vaults/{vault['id']}/graph", headers=headers, params={"note_id": foreign["id"]}
+    )
+    assert response.status_code == 404
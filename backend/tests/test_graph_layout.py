@@ -0,0 +1,63 @@
+import math
+from uuid import UUID
+
+import httpx
+import numpy as np
+
+from app.services.graph_layout import EXACT_REPULSION_MAX_NODES, compute_positions
+from tests.conftest import register
+
+
+async def test_layout_is_cached_per_version_and_warm_started(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_url = f"/api/vaults/{vault['id']}"
+    hub = (await client.post(f"{vault_url}/notes", headers=headers, json={"title": "Hub"})).json()
+    for index in range(30):
+        await client.post(
+            f"{vault_url}/notes",
+            headers=headers,
+            json={"title": f"N{index}", "links": [hub["id"]]},
+        )
+
+    response = await client.get(f"{vault_url}/graph/layout", headers=headers)
+    assert response.status_code == 200
+    first = response.json()
+    positions = {node["id"]: (node["x"], node["y"]) for node in first["nodes"]}
+    assert sum(edge["target"] == hub["id"] for edge in first["edges"]) == 30
+    assert len(positions) == len(first["nodes"])
+    assert all(math.isfinite(x) and math.isfinite(y) for x, y in positions.values())
+
+    etag = response.headers["ETag"]
+    cached = await client.get(
+        f"{vault_url}/graph/layout", headers={**headers, "If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+
+    leaf = (
+        await client.post(
+            f"{vault_url}/notes", headers=headers, json={"title": "Nueva", "links": [hub["id"]]}
+        )
+    ).json()
+    second = (await client.get(f"{vault_url}/graph/layout", headers=headers)).json()
+    assert second["version"] > first["version"]
+    moved = {node["id"]: (node["x"], node["y"]) for node in second["nodes"]}
+    # Los nodos ya colocados apenas se mueven y el nuevo aparece junto a su vecino.
+    assert max(math.dist(positions[key], moved[key]) for key in positions) < 1.5
+    assert math.dist(moved[leaf["id"]], moved[hub["id"]]) < 5
+
+
+def test_large_graphs_use_the_mesh_and_stay_spread() -> None:
+    count = EXACT_REPULSION_MAX_NODES + 100
+    node_ids = [UUID(int=index + 1) for index in range(count)]
+    edges = frozenset((node_ids[index // 2], node_ids[index]) for index in range(1, count))
+
+    positions = compute_positions(7, node_ids, edges, None)
+    assert positions.shape == (count, 2)
+    assert np.isfinite(positions).all()
+    assert np.array_equal(positions, compute_positions(7, node_ids, edges, None))
+
+    sample = positions[:200]
+    distances = np.linalg.norm(sample[:, None] - sample[None, :], axis=2)
+    np.fill_diagonal(distances, np.inf)
+    assert np.median(distances.min(axis=1)) > 0.3
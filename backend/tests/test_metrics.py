@@ -0,0 +1,72 @@
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import CallbackGauge, MetricsRegistry, _Metric
+from tests.conftest import register
+
+
+async def test_metrics_expose_route_latency_and_db_statements(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    await client.get("/api/vaults/summary", headers=headers)
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert "# TYPE http_request_duration_seconds histogram" in lines
+    summary = [line for line in lines if 'route="' in line and 'summary"' in line]
+    assert any(line.startswith("http_request_db_statements_count") for line in summary)
+    assert any(line.startswith("db_pool_checked_out ") for line in lines)
+    assert any(line.startswith("password_hash_seconds_count ") for line in lines)
+
+
+def _sample(text: str, name: str) -> float:
+    return float(
+        next(line for line in text.splitlines() if line.startswith(f"{name} ")).split()[-1]
+    )
+
+
+async def test_pool_metrics_track_checkouts_and_capacity(client: httpx.AsyncClient) -> None:
+    before = (await client.get("/metrics")).text
+    await register(client)
+    after = (await client.get("/metrics")).text
+
+    checkouts = "db_pool_checkout_seconds_count"
+    assert _sample(after, checkouts) > _sample(before, checkouts)
+    capacity = settings.db_pool_size + settings.db_max_overflow
+    assert _sample(after, "db_pool_capacity") == capacity
+
+
+def test_text_exposition_format() -> None:
+    metrics = MetricsRegistry()
+    requests = metrics.counter("demo_total", "Ruta con \\ y\nsalto.", ("route",))
+    requests.inc('/a"b\\c\nd')
+    requests.inc('/a"b\\c\nd', amount=2)
+    latency = metrics.histogram("demo_seconds", "Latencia.", ("op",), buckets=(0.1, 1))
+    latency.observe("get", value=0.05)
+    latency.observe("get", value=3)
+    metrics.register(CallbackGauge("demo_up", "Vivo.", lambda: 1.5))
+
+    assert metrics.render().splitlines() == [
+        "# HELP demo_total Ruta con \\\\ y\\nsalto.",
+        "# TYPE demo_total counter",
+        'demo_total{route="/a\\"b\\\\c\\nd"} 3',
+        "# HELP demo_seconds Latencia.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{op="get",le="0.1"} 1',
+        'demo_seconds_bucket{op="get",le="1"} 1',
+        'demo_seconds_bucket{op="get",le="+Inf"} 2',
+        'demo_seconds_sum{op="get"} 3.05',
+        'demo_seconds_count{op="get"} 2',
+        "# HELP demo_up Vivo.",
+        "# TYPE demo_up gauge",
+        "demo_up 1.5",
+    ]
+    with pytest.raises(ValueError):
+        requests.inc()
+    with pytest.raises(ValueError):
+        metrics.counter("demo_total", "Duplicada.")
+    with pytest.raises(TypeError):
+        _Metric("demo_abstract", "Sin muestras.")  # type: ignore[abstract]
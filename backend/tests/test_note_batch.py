@@ -0,0 +1,83 @@
+import uuid
+
+import httpx
+
+from tests.conftest import register
+
+
+async def _setup(client: httpx.AsyncClient) -> tuple[dict[str, str], str, list[dict[str, str]]]:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_url = f"/api/vaults/{vault['id']}"
+    notes = (await client.get(f"{vault_url}/notes", headers=headers)).json()
+    return headers, vault_url, notes
+
+
+async def test_mixed_batch_resolves_temp_ids(client: httpx.AsyncClient) -> None:
+    headers, vault_url, (keep, drop) = await _setup(client)
+
+    response = await client.post(
+        f"{vault_url}/notes/batch",
+        headers=headers,
+        json={
+            "operations": [
+                {"op": "create", "temp_id": "a", "title": "A", "links": ["b", keep["id"]]},
+                {"op": "create", "temp_id": "b", "title": "B", "links": ["a", drop["id"]]},
+                {"op": "update", "id": keep["id"], "title": "Editada", "links": ["a"]},
+                {"op": "delete", "id": drop["id"]},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    result = response.json()
+    a_id, b_id = result["temp_ids"]["a"], result["temp_ids"]["b"]
+    created = {note["title"]: note for note in result["created"]}
+    assert created["A"]["links"] == [b_id, keep["id"]]
+    # El enlace a la nota borrada en el mismo lote se descarta.
+    assert created["B"]["links"] == [a_id]
+    assert result["updated"][0]["links"] == [a_id]
+    assert result["deleted"] == [drop["id"]]
+
+    listed = {
+        note["title"]: note
+        for note in (await client.get(f"{vault_url}/notes", headers=headers)).json()
+    }
+    assert set(listed) == {"A", "B", "Editada"}
+    assert {note["version"] for note in listed.values()} == {result["version"]}
+    backlinks = (await client.get(f"{vault_url}/notes/{a_id}/backlinks", headers=headers)).json()
+    assert {note["id"] for note in backlinks} == {b_id, keep["id"]}
+
+
+async def test_invalid_item_rolls_back_whole_batch(client: httpx.AsyncClient) -> None:
+    headers, vault_url, (keep, drop) = await _setup(client)
+    before = await client.get(vault_url, headers=headers)
+
+    invalid_batches = [
+        # Nota inexistente después de un alta y una baja válidas.
+        (
+            [
+                {"op": "create", "title": "Nueva"},
+                {"op": "delete", "id": drop["id"]},
+                {"op": "update", "id": str(uuid.uuid4()), "title": "X"},
+            ],
+            404,
+        ),
+        # Misma nota dos veces.
+        (
+            [
+                {"op": "update", "id": keep["id"], "title": "X"},
+                {"op": "delete", "id": keep["id"]},
+            ],
+            400,
+        ),
+        ([{"op": "create", "temp_id": "t", "title": "1"}, {"op": "create", "temp_id": "t"}], 400),
+    ]
+    for operations, expected in invalid_batches:
+        response = await client.post(
+            f"{vault_url}/notes/batch", headers=headers, json={"operations": operations}
+        )
+        assert response.status_code == expected, response.text
+
+    after = await client.get(vault_url, headers=headers)
+    assert after.headers["ETag"] == before.headers["ETag"]
+    assert after.json() == before.json()
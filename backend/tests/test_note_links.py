@@ -0,0 +1,64 @@
+import httpx
+from sqlalchemy import text
+
+from app.db.session import engine
+from tests.conftest import register
+
+
+async def _edges() -> set[tuple[str, str]]:
+    async with engine.connect() as conn:
+        rows = await conn.execute(
+            text(
+                "SELECT s.title, t.title FROM note_links "
+                "JOIN notes s ON s.id = note_links.source_id "
+                "JOIN notes t ON t.id = note_links.target_id "
+                "WHERE s.title LIKE 'L%'"
+            )
+        )
+        return {(row[0], row[1]) for row in rows}
+
+
+async def test_backlinks_follow_edits_and_deletes(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    notes_url = f"/api/vaults/{vault['id']}/notes"
+    other = await register(client, "bea@example.com")
+    other_vault = (await client.get("/api/vaults/summary", headers=other)).json()[0]
+    foreign = (
+        await client.post(
+            f"/api/vaults/{other_vault['id']}/notes", headers=other, json={"title": "Ajena"}
+        )
+    ).json()
+
+    target = (await client.post(notes_url, headers=headers, json={"title": "LB"})).json()
+    source = (
+        await client.post(
+            notes_url,
+            headers=headers,
+            # Duplicados, IDs de otro vault y basura se descartan.
+            json={"title": "LA", "links": [target["id"], target["id"], foreign["id"], "x"]},
+        )
+    ).json()
+    assert source["links"] == [target["id"]]
+    assert await _edges() == {("LA", "LB")}
+
+    backlinks_url = f"{notes_url}/{target['id']}/backlinks"
+    backlinks = (await client.get(backlinks_url, headers=headers)).json()
+    assert [note["id"] for note in backlinks] == [source["id"]]
+    assert "content" not in backlinks[0]
+
+    await client.patch(f"{notes_url}/{source['id']}", headers=headers, json={"links": []})
+    assert (await client.get(backlinks_url, headers=headers)).json() == []
+    assert await _edges() == set()
+
+    await client.patch(
+        f"{notes_url}/{source['id']}", headers=headers, json={"links": [target["id"]]}
+    )
+    deleted = await client.delete(f"{notes_url}/{target['id']}", headers=headers)
+    assert deleted.status_code == 204
+    assert await _edges() == set()
+    listed = (await client.get(notes_url, headers=headers)).json()
+    assert next(note for note in listed if note["id"] == source["id"])["links"] == []
+
+    missing = await client.get(f"{notes_url}/{target['id']}/backlinks", headers=headers)
+    assert missing.status_code == 404
@@ -0,0 +1,72 @@
+import httpx
+from sqlalchemy import text
+
+from app.db.session import engine
+from tests.conftest import register
+
+
+async def _vault_url(client: httpx.AsyncClient, headers: dict[str, str]) -> str:
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    return f"/api/vaults/{vault['id']}"
+
+
+async def test_pages_have_no_gaps_or_duplicates_when_updated_at_ties(
+    client: httpx.AsyncClient,
+) -> None:
+    headers = await register(client)
+    vault_url = await _vault_url(client, headers)
+    for index in range(7):
+        created = await client.post(
+            f"{vault_url}/notes", headers=headers, json={"title": f"N{index}"}
+        )
+        assert created.status_code == 201
+    async with engine.begin() as conn:
+        # Todas con el mismo `updated_at`: el orden lo decide el id.
+        await conn.execute(
+            text("UPDATE notes SET updated_at = (SELECT max(updated_at) FROM notes)")
+        )
+    expected = {
+        note["id"] for note in (await client.get(f"{vault_url}/notes", headers=headers)).json()
+    }
+    assert len(expected) == 9  # las 2 notas del vault por defecto + 7
+
+    for endpoint in ("page", "summary"):
+        seen: list[str] = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+            response = await client.get(
+                f"{vault_url}/notes/{endpoint}", headers=headers, params=params
+            )
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(item["id"] for item in page["items"])
+            pages += 1
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen)) == 9
+        assert set(seen) == expected
+        assert pages == 5
+
+    summary = (await client.get(f"{vault_url}/notes/summary", headers=headers)).json()
+    assert "content" not in summary["items"][0]
+
+
+async def test_exact_last_page_and_malformed_cursor(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault_url = await _vault_url(client, headers)
+
+    page = (
+        await client.get(f"{vault_url}/notes/page", headers=headers, params={"limit": 2})
+    ).json()
+    assert len(page["items"]) == 2
+    assert page["next_cursor"] is None
+
+    for cursor in ("no-es-un-cursor", "bm8tc2VwYXJhZG9y", "%%%"):
+        response = await client.get(
+            f"{vault_url}/notes/page", headers=headers, params={"cursor": cursor}
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Cursor inválido"
@@ -0,0 +1,138 @@
+import hashlib
+
+import httpx
+
+from tests.conftest import register
+
+
+async def _note(client: httpx.AsyncClient, headers: dict[str, str], content: str) -> dict:
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    response = await client.post(
+        f"/api/vaults/{vault['id']}/notes", headers=headers, json={"title": "N", "content": content}
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+async def _current(client: httpx.AsyncClient, headers: dict[str, str], note: dict) -> dict:
+    notes = (await client.get(f"/api/vaults/{note['vault_id']}/notes", headers=headers)).json()
+    return next(item for item in notes if item["id"] == note["id"])
+
+
+async def test_patch_applies_edits_against_base_version(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    note = await _note(client, headers, "hola 😀 mundo")
+    url = f"/api/vaults/{note['vault_id']}/notes/{note['id']}"
+
+    # El emoji ocupa dos unidades UTF-16: "mundo" empieza en el offset 8.
+    response = await client.patch(
+        url,
+        headers=headers,
+        json={
+            "content_patch": {
+                "base_version": note["version"],
+                "edits": [
+                    {"start": 0, "end": 4, "text": "adiós"},
+                    {"start": 8, "end": 13, "text": "mundo!"},
+                ],
+            }
+        },
+    )
+    assert response.status_code == 200, response.text
+    patched = response.json()
+    # Respuesta mínima: sin el contenido, que el cliente ya tiene.
+    assert set(patched) == {"id", "version", "content_hash"}
+    assert patched["version"] > note["version"]
+    assert patched["content_hash"] == hashlib.sha256("adiós 😀 mundo!".encode()).hexdigest()
+
+    stale = await client.patch(
+        url,
+        headers=headers,
+        json={"content_patch": {"base_version": note["version"], "edits": []}},
+    )
+    assert stale.status_code == 409
+
+    by_hash = await client.patch(
+        url,
+        headers=headers,
+        json={
+            "content_patch": {
+                "base_hash": patched["content_hash"],
+                "edits": [{"start": 0, "end": 0, "text": "¡"}],
+            }
+        },
+    )
+    assert by_hash.status_code == 200
+    assert (await _current(client, headers, note))["content"] == "¡adiós 😀 mundo!"
+
+
+async def test_only_content_changes_conflict(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    note = await _note(client, headers, "base")
+    other = await _note(client, headers, "otra")
+    vault_url = f"/api/vaults/{note['vault_id']}"
+    url = f"{vault_url}/notes/{note['id']}"
+
+    # Enlaces, título y el borrado de una nota enlazada avanzan `version`, no el contenido.
+    await client.patch(url, headers=headers, json={"links": [other["id"]]})
+    await client.patch(url, headers=headers, json={"title": "Renombrada"})
+    await client.delete(f"{vault_url}/notes/{other['id']}", headers=headers)
+    assert (await _current(client, headers, note))["version"] > note["version"]
+
+    def append(base_version: int, text: str) -> dict:
+        edit = {"start": 4, "end": 4, "text": text}
+        return {"content_patch": {"base_version": base_version, "edits": [edit]}}
+
+    response = await client.patch(url, headers=headers, json=append(note["version"], "!"))
+    assert response.status_code == 200, response.text
+    stale = await client.patch(url, headers=headers, json=append(note["version"], "?"))
+    assert stale.status_code == 409
+    ahead = await client.patch(url, headers=headers, json=append(10**6, "?"))
+    assert ahead.status_code == 409
+    assert (await _current(client, headers, note))["content"] == "base!"
+
+
+async def test_invalid_patches_are_rejected(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    note = await _note(client, headers, "a😀")
+    url = f"/api/vaults/{note['vault_id']}/notes/{note['id']}"
+    base = {"base_version": note["version"]}
+
+    def patch(**body: object) -> dict:
+        return {"content_patch": {**base, **body}}
+
+    out_of_range = patch(edits=[{"start": 3, "end": 4, "text": ""}])
+    splits_emoji = patch(edits=[{"start": 2, "end": 3, "text": ""}])
+    overlapping = patch(edits=[{"start": 0, "end": 2}, {"start": 1, "end": 1}])
+    assert (await client.patch(url, headers=headers, json=out_of_range)).status_code == 400
+    assert (await client.patch(url, headers=headers, json=splits_emoji)).status_code == 400
+    assert (await client.patch(url, headers=headers, json=overlapping)).status_code == 422
+    both = {"content": "x", **patch(edits=[])}
+    assert (await client.patch(url, headers=headers, json=both)).status_code == 422
+    assert (
+        await client.patch(url, headers=headers, json={"content_patch": {"edits": []}})
+    ).status_code == 422
+
+
+async def test_batch_update_accepts_patches(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    note = await _note(client, headers, "uno")
+
+    response = await client.post(
+        f"/api/vaults/{note['vault_id']}/notes/batch",
+        headers=headers,
+        json={
+            "operations": [
+                {
+                    "op": "update",
+                    "id": note["id"],
+                    "content_patch": {
+                        "base_version": note["version"],
+                        "edits": [{"start": 3, "end": 3, "text": " dos"}],
+                    },
+                }
+            ]
+        },
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["updated"][0]["content"] == "uno dos"
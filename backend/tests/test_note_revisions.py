@@ -0,0 +1,144 @@
+import random
+from datetime import timedelta
+from typing import Any, cast
+from uuid import UUID
+
+import httpx
+from sqlalchemy import update
+
+from app.core.clock import utcnow
+from app.db.session import async_session
+from app.models import NoteRevision
+from app.services.revisions import SNAPSHOT_INTERVAL, apply_delta, make_delta, prune_revisions
+from tests.conftest import register
+
+
+async def _age_revisions(note_id: str, seconds: int) -> None:
+    # Simula que la última escritura quedó fuera de la ventana de agrupado.
+    async with async_session() as session:
+        await session.execute(
+            update(NoteRevision)
+            .where(cast(Any, NoteRevision.note_id) == UUID(note_id))
+            .values(superseded_at=utcnow() - timedelta(seconds=seconds))
+        )
+        await session.commit()
+
+
+def test_delta_round_trip() -> None:
+    rng = random.Random(7)
+    words = ["alfa", "beta", "gamma\n", "δ", "🙂", "\n"]
+    base = "".join(rng.choice(words) for _ in range(2000))
+    for _ in range(50):
+        target = list(base)
+        for _ in range(rng.randint(0, 20)):
+            position = rng.randint(0, len(target))
+            target[position : position + rng.randint(0, 30)] = rng.choice(words)
+        target_text = "".join(target)
+        assert apply_delta(base, make_delta(base, target_text)) == target_text
+    assert len(make_delta(base, base[:100] + "x" + base[100:])) < 50
+
+
+async def test_revisions_reconstruct_across_snapshots(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    notes_url = f"/api/vaults/{vault['id']}/notes"
+    note = (
+        await client.post(notes_url, headers=headers, json={"title": "v0", "content": "línea\n"})
+    ).json()
+    contents = ["línea\n"]
+    total = SNAPSHOT_INTERVAL + 5
+    for step in range(1, total + 1):
+        await _age_revisions(note["id"], 600)
+        contents.append(contents[-1] + f"paso {step}\n")
+        response = await client.patch(
+            f"{notes_url}/{note['id']}",
+            headers=headers,
+            json={"title": f"v{step}", "content": contents[-1]},
+        )
+        assert response.status_code == 200
+
+    revisions_url = f"{notes_url}/{note['id']}/revisions"
+    listed: list[dict[str, Any]] = []
+    cursor = None
+    while True:
+        params: dict[str, Any] = {"limit": 10}
+        if cursor is not None:
+            params["cursor"] = cursor
+        page = (await client.get(revisions_url, headers=headers, params=params)).json()
+        listed.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert [item["revision"] for item in listed] == list(range(total, 0, -1))
+    assert "content" not in listed[0]
+
+    for revision in (1, SNAPSHOT_INTERVAL - 1, SNAPSHOT_INTERVAL, total):
+        read = (await client.get(f"{revisions_url}/{revision}", headers=headers)).json()
+        assert read["content"] == contents[revision - 1]
+        assert read["title"] == f"v{revision - 1}"
+        assert read["content_length"] == len(contents[revision - 1])
+    missing = await client.get(f"{revisions_url}/{total + 1}", headers=headers)
+    assert missing.status_code == 404
+    bad_cursor = await client.get(revisions_url, headers=headers, params={"cursor": "x"})
+    assert bad_cursor.status_code == 400
+
+
+async def test_autosave_bursts_coalesce_and_prune(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    notes_url = f"/api/vaults/{vault['id']}/notes"
+    note = (
+        await client.post(notes_url, headers=headers, json={"title": "T", "content": "a"})
+    ).json()
+    for content in ("ab", "abc", "abcd"):
+        await client.patch(f"{notes_url}/{note['id']}", headers=headers, json={"content": content})
+    await client.post(
+        f"{notes_url}/batch",
+        headers=headers,
+        json={"operations": [{"op": "update", "id": note["id"], "content": "abcde"}]},
+    )
+
+    revisions_url = f"{notes_url}/{note['id']}/revisions"
+    items = (await client.get(revisions_url, headers=headers)).json()["items"]
+    assert [item["revision"] for item in items] == [1]
+    read = (await client.get(f"{revisions_url}/1", headers=headers)).json()
+    assert read["content"] == "a"
+
+    await _age_revisions(note["id"], 600)
+    await client.patch(f"{notes_url}/{note['id']}", headers=headers, json={"content": "final"})
+    read = (await client.get(f"{revisions_url}/2", headers=headers)).json()
+    assert read["content"] == "abcde"
+    assert (await client.get(f"{revisions_url}/1", headers=headers)).json()["content"] == "a"
+
+    async with async_session() as session:
+        removed = await prune_revisions(session, utcnow(), retention_days=90, max_per_note=1)
+        await session.commit()
+    assert removed >= 1
+    items = (await client.get(revisions_url, headers=headers)).json()["items"]
+    assert [item["revision"] for item in items] == [2]
+    assert (await client.get(f"{revisions_url}/2", headers=headers)).json()["content"] == "abcde"
+
+    await client.delete(f"{notes_url}/{note['id']}", headers=headers)
+    async with async_session() as session:
+        assert await prune_revisions(session, utcnow(), retention_days=1, max_per_note=200) == 0
+
+
+async def test_expired_revisions_keep_numbering(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    notes_url = f"/api/vaults/{vault['id']}/notes"
+    note = (await client.post(notes_url, headers=headers, json={"content": "v1"})).json()
+    revisions_url = f"{notes_url}/{note['id']}/revisions"
+    for content in ("v2", "v3"):
+        await _age_revisions(note["id"], 600)
+        await client.patch(f"{notes_url}/{note['id']}", headers=headers, json={"content": content})
+
+    await _age_revisions(note["id"], 10 * 86400)
+    async with async_session() as session:
+        assert await prune_revisions(session, utcnow(), retention_days=1, max_per_note=200) == 1
+        await session.commit()
+    # La última caducada se conserva: la siguiente escritura no vuelve a usar el número 1.
+    await client.patch(f"{notes_url}/{note['id']}", headers=headers, json={"content": "v4"})
+    items = (await client.get(revisions_url, headers=headers)).json()["items"]
+    assert [item["revision"] for item in items] == [3, 2]
+    assert (await client.get(f"{revisions_url}/2", headers=headers)).json()["content"] == "v2"
@@ -0,0 +1,47 @@
+import hashlib
+
+import httpx
+from sqlalchemy import text
+
+from app.db.session import engine
+from tests.conftest import CountQueries, register
+
+
+async def test_large_bodies_are_compressed_with_metadata(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    notes_url = f"/api/vaults/{vault['id']}/notes"
+    body = "párrafo de investigación\n" * 20_000
+
+    created = await client.post(notes_url, headers=headers, json={"title": "Big", "content": body})
+    assert created.status_code == 201
+    listed = (await client.get(notes_url, headers=headers)).json()
+    assert next(note for note in listed if note["title"] == "Big")["content"] == body
+
+    query = "SELECT length(content), content_length, content_hash FROM notes WHERE title = 'Big'"
+    async with engine.connect() as conn:
+        stored, length, digest = (await conn.execute(text(query))).one()
+    assert stored < len(body) // 10
+    assert length == len(body)
+    assert digest == hashlib.sha256(body.encode()).hexdigest()
+
+    summary = (await client.get(f"{notes_url}/summary", headers=headers)).json()["items"]
+    assert next(item for item in summary if item["title"] == "Big")["content_length"] == len(body)
+
+
+async def test_metadata_paths_do_not_read_bodies(
+    client: httpx.AsyncClient, count_queries: CountQueries
+) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    notes_url = f"/api/vaults/{vault['id']}/notes"
+    note = (
+        await client.post(notes_url, headers=headers, json={"title": "A", "content": "cuerpo"})
+    ).json()
+
+    with count_queries() as statements:
+        await client.get(f"{notes_url}/{note['id']}/backlinks", headers=headers)
+        await client.delete(f"{notes_url}/{note['id']}", headers=headers)
+
+    assert statements
+    assert not [statement for statement in statements if "notes.content," in statement]
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.config import settings
+from app.core.security import hash_password, hashing_stats, verify_and_update_password
+from tests.conftest import register
+
+
+async def test_hashes_run_in_pool_and_rehash_on_cost_change(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    hashes = await asyncio.gather(*(hash_password(f"clave-{index}") for index in range(6)))
+    assert hashing_stats.in_flight == 0
+    assert await verify_and_update_password("clave-0", hashes[0]) == (True, None)
+    assert (await verify_and_update_password("otra", hashes[0]))[0] is False
+
+    monkeypatch.setattr(settings, "password_bcrypt_rounds", 5)
+    security.password_context.cache_clear()
+    try:
+        valid, new_hash = await verify_and_update_password("clave-0", hashes[0])
+    finally:
+        monkeypatch.undo()
+        security.password_context.cache_clear()
+    assert valid
+    assert new_hash is not None and new_hash.startswith("$2b$05$")
+
+
+async def test_full_hash_queue_returns_503(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await register(client)
+    monkeypatch.setattr(
+        hashing_stats,
+        "in_flight",
+        settings.password_hash_workers + settings.password_hash_max_queue,
+    )
+    with pytest.raises(HTTPException) as rejected:
+        await hash_password("password1")
+    assert rejected.value.status_code == 503
+
+    response = await client.post(
+        "/api/auth/login", json={"email": "ana@example.com", "password": "password1"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+async def test_cancelled_wait_keeps_hash_slot_until_job_ends() -> None:
+    release = threading.Event()
+    task = asyncio.create_task(security._run_in_hash_pool(release.wait, 5))
+    while hashing_stats.in_flight == 0:
+        await asyncio.sleep(0.01)
+    # El cliente se desconecta, pero bcrypt sigue ocupando el pool.
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert hashing_stats.in_flight == 1
+
+    release.set()
+    for _ in range(100):
+        if hashing_stats.in_flight == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert hashing_stats.in_flight == 0
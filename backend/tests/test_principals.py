@@ -0,0 +1,70 @@
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+import httpx
+import jwt
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.session import async_session
+from app.models import User
+from app.services.principals import get_cached_user
+from tests.conftest import register
+
+
+def test_ttl_cache_expires_and_evicts() -> None:
+    now = [0.0]
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)  # nunca más que el TTL de la caché
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # "b" es la menos usada
+    assert cache.get("b") is None
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
+    cache.set("d", 4, ttl=0)
+    assert cache.get("d") is None
+
+
+async def test_user_cache_is_invalidated_on_commit(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    me = (await client.get("/api/auth/me", headers=headers)).json()
+    user_id = UUID(me["id"])
+    assert get_cached_user(user_id) is not None
+
+    async with async_session() as session:
+        user = await session.get(User, user_id)
+        assert user is not None
+        user.display_name = "Sin confirmar"
+        await session.flush()
+        await session.rollback()
+    assert get_cached_user(user_id) is not None
+
+    async with async_session() as session:
+        user = await session.get(User, user_id)
+        assert user is not None
+        user.display_name = "Ana"
+        await session.commit()
+    assert get_cached_user(user_id) is None
+    assert (await client.get("/api/auth/me", headers=headers)).json()["display_name"] == "Ana"
+
+
+async def test_invalid_tokens_are_rejected(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    user_id = (await client.get("/api/auth/me", headers=headers)).json()["id"]
+    expired = jwt.encode(
+        {"sub": user_id, "exp": datetime.now(UTC) - timedelta(minutes=1)},
+        settings.auth_secret_key,
+        algorithm=settings.auth_algorithm,
+    )
+    forged = jwt.encode(
+        {"sub": user_id, "exp": datetime.now(UTC) + timedelta(minutes=5)},
+        "otra-clave-de-al-menos-32-bytes-de-largo",
+        algorithm=settings.auth_algorithm,
+    )
+    unknown = create_access_token(str(uuid4()))
+    for token in (expired, forged, unknown, "basura"):
+        response = await client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 401
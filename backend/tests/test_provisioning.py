@@ -0,0 +1,88 @@
+from datetime import timedelta
+from uuid import UUID
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.db.session import engine
+from app.services import provisioning
+from app.services.provisioning import provision_pending_users, run_user_provisioning
+from tests.conftest import register
+
+
+async def _vault_count(email: str) -> int:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT count(*) FROM vaults JOIN users ON users.id = vaults.owner_id "
+                "WHERE users.email = :email"
+            ),
+            {"email": email},
+        )
+        return int(result.scalar_one())
+
+
+async def test_failed_provisioning_is_retried_on_login(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    original = provisioning.build_default_vault
+
+    def broken(_owner_id: object) -> None:
+        raise RuntimeError("fallo simulado")
+
+    monkeypatch.setattr(provisioning, "build_default_vault", broken)
+    headers = await register(client)
+    # El registro devuelve el token aunque el vault por defecto no se haya podido crear.
+    assert (await client.get("/api/vaults/summary", headers=headers)).json() == []
+    assert await _vault_count("ana@example.com") == 0
+
+    monkeypatch.setattr(provisioning, "build_default_vault", original)
+    credentials = {"email": "ana@example.com", "password": "password1"}
+    for _ in range(2):
+        response = await client.post("/api/auth/login", json=credentials)
+        assert response.status_code == 200
+    assert await _vault_count("ana@example.com") == 1
+    vaults = (await client.get("/api/vaults/summary", headers=headers)).json()
+    assert [vault["name"] for vault in vaults] == [provisioning.DEFAULT_VAULT_NAME_KEY]
+
+
+async def test_pending_users_are_provisioned_once(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def skip(_user_id: object) -> bool:
+        return False
+
+    monkeypatch.setattr("app.api.v1.endpoints.auth.run_user_provisioning", skip)
+    headers = await register(client)
+    await register(client, "bea@example.com")
+
+    assert await provision_pending_users(timedelta(hours=1)) == 0
+    assert await provision_pending_users(timedelta(0)) == 2
+    assert await provision_pending_users(timedelta(0)) == 0
+
+    user_id = UUID((await client.get("/api/auth/me", headers=headers)).json()["id"])
+    assert await run_user_provisioning(user_id) is False
+    assert await _vault_count("ana@example.com") == 1
+    assert await _vault_count("bea@example.com") == 1
+
+
+async def test_listing_vaults_provisions_pending_user(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def skip(_user_id: object) -> bool:
+        return False
+
+    # La tarea del registro aún no ha corrido cuando el cliente pide sus vaults.
+    monkeypatch.setattr("app.api.v1.endpoints.auth.run_user_provisioning", skip)
+    headers = await register(client)
+    other = await register(client, "bea@example.com")
+
+    summaries = (await client.get("/api/vaults/summary", headers=headers)).json()
+    assert [vault["name"] for vault in summaries] == [provisioning.DEFAULT_VAULT_NAME_KEY]
+    vaults = (await client.get("/api/vaults", headers=other)).json()
+    assert [len(vault["notes"]) for vault in vaults] == [2]
+
+    assert (await client.get("/api/vaults/summary", headers=headers)).json() == summaries
+    assert await _vault_count("ana@example.com") == 1
+    assert await _vault_count("bea@example.com") == 1
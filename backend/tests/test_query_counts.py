@@ -0,0 +1,68 @@
+"""Sentencias SQL por endpoint: un cambio en estos números es un round-trip nuevo (o menos)."""
+
+import httpx
+
+from tests.conftest import CountQueries, register
+
+
+async def test_register_provisions_user_and_default_vault_in_one_flush(
+    client: httpx.AsyncClient, count_queries: CountQueries
+) -> None:
+    with count_queries() as statements:
+        await register(client)
+
+    # Petición: correo libre + usuario. Tarea en segundo plano (tras la respuesta): marca de
+    # aprovisionado + vault + notas + aristas + índice de búsqueda; sin refresh.
+    assert [statement.split()[0] for statement in statements] == (
+        ["SELECT", "INSERT", "UPDATE"] + ["INSERT"] * 4
+    )
+
+
+async def test_login_existing_user(client: httpx.AsyncClient, count_queries: CountQueries) -> None:
+    await register(client)
+
+    with count_queries() as statements:
+        response = await client.post(
+            "/api/auth/login", json={"email": "ana@example.com", "password": "password1"}
+        )
+
+    assert response.status_code == 200
+    # Solo el usuario: `provisioned_at` evita comprobar el vault por defecto.
+    assert len(statements) == 1
+
+
+async def test_create_vault_is_a_single_flush(
+    client: httpx.AsyncClient, count_queries: CountQueries
+) -> None:
+    headers = await register(client)
+    await client.get("/api/auth/me", headers=headers)  # deja el usuario en caché
+
+    with count_queries() as statements:
+        response = await client.post("/api/vaults", headers=headers, json={"name": "Nueva"})
+
+    assert response.status_code == 201
+    body = response.json()
+    assert [note["title"] for note in body["notes"]] == ["Inicio"]
+    # Vault + nota + índice de búsqueda (la nota inicial no tiene enlaces).
+    assert len(statements) == 3
+    assert all(statement.startswith("INSERT") for statement in statements)
+
+
+async def test_reads_use_cached_principal(
+    client: httpx.AsyncClient, count_queries: CountQueries
+) -> None:
+    headers = await register(client)
+    with count_queries() as statements:
+        await client.get("/api/auth/me", headers=headers)
+    # Primera petición autenticada: carga el usuario; las siguientes salen de la caché.
+    assert len(statements) == 1
+
+    with count_queries() as statements:
+        vaults = (await client.get("/api/vaults/summary", headers=headers)).json()
+    assert len(statements) == 1
+
+    with count_queries() as statements:
+        response = await client.get(f"/api/vaults/{vaults[0]['id']}/notes", headers=headers)
+    assert response.status_code == 200
+    # Vault (propiedad + ETag) + notas.
+    assert len(statements) == 2
@@ -0,0 +1,57 @@
+import tempfile
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import session as db_session
+from app.services.principals import clear_principal_caches
+from app.services.replica_routing import clear_pins
+from tests.conftest import register
+
+
+@pytest.fixture
+async def empty_replica(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[None]:
+    # Una "réplica" que nunca recibe los cambios: lo que se lea de ella sale vacío.
+    replica = create_async_engine(
+        f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='vitrum-replica-')}/replica.db"
+    )
+    async with replica.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    maker = async_sessionmaker(
+        replica, expire_on_commit=False, class_=AsyncSession, info={"replica": True}
+    )
+    monkeypatch.setattr(db_session, "replica_sessions", [maker])
+    clear_pins()
+    yield
+    clear_pins()
+    await replica.dispose()
+
+
+async def test_reads_go_to_replica_unless_user_just_wrote(
+    client: httpx.AsyncClient, empty_replica: None
+) -> None:
+    headers = await register(client)
+    # Recién registrado: fijado a la primaria.
+    vaults = (await client.get("/api/vaults/summary", headers=headers)).json()
+    assert len(vaults) == 1
+    vault_url = f"/api/vaults/{vaults[0]['id']}"
+
+    clear_pins()
+    assert (await client.get("/api/vaults/summary", headers=headers)).json() == []
+    assert (await client.get(f"{vault_url}/notes", headers=headers)).status_code == 404
+
+    created = await client.post(f"{vault_url}/notes", headers=headers, json={"title": "Nueva"})
+    assert created.status_code == 201
+    notes = (await client.get(f"{vault_url}/notes", headers=headers)).json()
+    assert "Nueva" in {note["title"] for note in notes}
+
+    # Sin fijar y sin caché de usuario: la réplica no lo conoce y se consulta la primaria.
+    clear_pins()
+    clear_principal_caches()
+    me = await client.get("/api/auth/me", headers=headers)
+    assert me.status_code == 200
+    assert me.json()["email"] == "ana@example.com"
@@ -0,0 +1,119 @@
+import asyncio
+from uuid import UUID, uuid4
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models import Vault
+from app.services.response_cache import (
+    CacheKey,
+    LocalResponseCache,
+    PostgresResponseStore,
+    ResponseCache,
+    response_cache,
+)
+from tests.conftest import CountQueries, register
+
+
+def test_local_cache_is_bounded_in_bytes() -> None:
+    cache = LocalResponseCache(max_bytes=10)
+    first, second = uuid4(), uuid4()
+    cache.set(("read_vault", first, 1), b"12345")
+    cache.set(("list_notes", first, 1), b"12345")
+    assert cache.get(("read_vault", first, 1)) == b"12345"  # ahora es la más reciente
+    cache.set(("read_vault", second, 1), b"123")
+    assert cache.get(("list_notes", first, 1)) is None
+    assert cache.size == 8
+
+    cache.set(("read_vault", second, 2), b"x" * 11)  # no cabe: no se guarda
+    cache.invalidate(first)
+    assert len(cache) == 1
+    assert cache.size == 3
+
+
+async def test_vault_reads_are_cached_until_a_write(
+    client: httpx.AsyncClient, count_queries: CountQueries
+) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_url = f"/api/vaults/{vault['id']}"
+
+    first = await client.get(vault_url, headers=headers)
+    await client.get(f"{vault_url}/notes", headers=headers)
+    with count_queries() as statements:
+        cached = await client.get(vault_url, headers=headers)
+        await client.get(f"{vault_url}/notes", headers=headers)
+    assert cached.content == first.content
+    assert len(response_cache.local) == 2
+    # Solo la fila del vault (permiso y versión) en cada lectura; las notas salen de la caché.
+    assert len(statements) == 2
+
+    created = await client.post(f"{vault_url}/notes", headers=headers, json={"title": "Nueva"})
+    assert created.status_code == 201
+    assert len(response_cache.local) == 0
+    fresh = await client.get(vault_url, headers=headers)
+    assert fresh.headers["ETag"] != first.headers["ETag"]
+    assert "Nueva" in [note["title"] for note in fresh.json()["notes"]]
+
+
+async def test_postgres_store_shares_entries_between_workers(client: httpx.AsyncClient) -> None:
+    if engine.dialect.name != "postgresql":
+        pytest.skip("Solo aplica a Postgres")
+    vault = Vault(id=uuid4(), name="V", theme="violet", owner_id=uuid4(), version=3)
+    renders = 0
+
+    async def render() -> bytes:
+        nonlocal renders
+        renders += 1
+        return b'{"v":3}'
+
+    first = ResponseCache(1024, PostgresResponseStore(1024))
+    second = ResponseCache(1024, PostgresResponseStore(1024))
+    assert await first.get_or_render("read_vault", vault, render) == b'{"v":3}'
+    await first.flush()
+    assert await second.get_or_render("read_vault", vault, render) == b'{"v":3}'
+    assert renders == 1
+
+    await first.invalidate(vault.id)
+    second.clear()
+    await second.get_or_render("read_vault", vault, render)
+    assert renders == 2
+
+
+class _SlowStore:
+    def __init__(self) -> None:
+        self.entries: dict[CacheKey, bytes] = {}
+        self.release = asyncio.Event()
+
+    async def get(self, key: CacheKey) -> bytes | None:
+        return self.entries.get(key)
+
+    async def set(self, key: CacheKey, body: bytes) -> None:
+        await self.release.wait()
+        self.entries[key] = body
+
+    async def invalidate(self, vault_id: UUID) -> None:
+        return None
+
+
+async def test_shared_tier_is_written_behind() -> None:
+    store = _SlowStore()
+    cache = ResponseCache(1024, store)
+    vault = Vault(id=uuid4(), name="V", theme="violet", owner_id=uuid4(), version=1)
+
+    async def render() -> bytes:
+        return b"{}"
+
+    # La respuesta no espera a la escritura compartida.
+    body = await asyncio.wait_for(cache.get_or_render("read_vault", vault, render), 1)
+    assert body == b"{}"
+    assert store.entries == {}
+    store.release.set()
+    await cache.flush()
+    assert store.entries == {("read_vault", vault.id, 1): b"{}"}
+
+
+def test_shared_entries_are_capped_below_the_local_budget() -> None:
+    assert settings.response_cache_max_entry_bytes < settings.response_cache_max_bytes
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import text
+
+from app.db.schema import SchemaOutOfDateError, alembic_heads, verify_schema
+from app.db.session import engine
+
+
+async def test_check_mode_requires_alembic_head() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    try:
+        with pytest.raises(SchemaOutOfDateError):
+            await verify_schema()
+
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)")
+            )
+            await conn.execute(text("INSERT INTO alembic_version VALUES ('0000')"))
+        with pytest.raises(SchemaOutOfDateError):
+            await verify_schema()
+
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("UPDATE alembic_version SET version_num = :head"),
+                {"head": next(iter(alembic_heads()))},
+            )
+        await verify_schema()
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        await engine.dispose()
+
+
+def test_heavy_modules_load_on_first_use() -> None:
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('passlib', 'bcrypt', 'numpy', 'alembic') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=os.environ, check=True
+    )
+    assert result.stdout.strip() == "[]"
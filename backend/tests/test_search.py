@@ -0,0 +1,119 @@
+from typing import Any, cast
+from uuid import UUID
+
+import httpx
+import pytest
+from sqlmodel import select
+
+from app.db.session import async_session
+from app.models import NoteSearchDocument
+from app.services import search
+from tests.conftest import register
+
+
+async def test_index_follows_note_writes(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_url = f"/api/vaults/{vault['id']}"
+
+    async def search(query: str) -> list[str]:
+        response = await client.get(f"{vault_url}/search", headers=headers, params={"q": query})
+        assert response.status_code == 200
+        return [hit["title"] for hit in response.json()["items"]]
+
+    note = (
+        await client.post(
+            f"{vault_url}/notes",
+            headers=headers,
+            json={"title": "Astronomía", "content": "telescopio refractor"},
+        )
+    ).json()
+    assert await search("telescopio") == ["Astronomía"]
+    assert await search("telesc") == ["Astronomía"]  # prefijo en el último término
+
+    await client.patch(
+        f"{vault_url}/notes/{note['id']}", headers=headers, json={"content": "cuaderno de campo"}
+    )
+    assert await search("telescopio") == []
+    assert await search("cuaderno") == ["Astronomía"]
+
+    await client.post(
+        f"{vault_url}/notes/batch",
+        headers=headers,
+        json={"operations": [{"op": "update", "id": note["id"], "title": "Botánica"}]},
+    )
+    assert await search("botánica") == ["Botánica"]
+    assert await search("astronomía") == []
+
+    await client.delete(f"{vault_url}/notes/{note['id']}", headers=headers)
+    assert await search("cuaderno") == []
+
+
+async def test_ranking_pagination_and_escaped_snippets(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_url = f"/api/vaults/{vault['id']}"
+    notes = [
+        ("Otra cosa", "<b>cometa</b> & <i>meteoro</i>"),
+        ("Cometa Halley", "periodo de 76 años"),
+        ("Sin relación", "nada que ver"),
+    ]
+    for title, content in notes:
+        await client.post(
+            f"{vault_url}/notes", headers=headers, json={"title": title, "content": content}
+        )
+
+    first = (
+        await client.get(f"{vault_url}/search", headers=headers, params={"q": "cometa", "limit": 1})
+    ).json()
+    # El título pesa más que el cuerpo.
+    assert [hit["title"] for hit in first["items"]] == ["Cometa Halley"]
+    assert first["next_offset"] == 1
+
+    second = (
+        await client.get(
+            f"{vault_url}/search",
+            headers=headers,
+            params={"q": "cometa", "limit": 1, "offset": 1},
+        )
+    ).json()
+    assert second["next_offset"] is None
+    snippet = second["items"][0]["snippet"]
+    assert "<mark>cometa</mark>" in snippet
+    # Solo quedan las marcas propias: el HTML de la nota llega escapado (o, en Postgres,
+    # ts_headline ya descarta las etiquetas).
+    assert "<" not in snippet.replace("<mark>", "").replace("</mark>", "")
+    assert "&amp;" in snippet
+
+    other = await register(client, "bea@example.com")
+    response = await client.get(f"{vault_url}/search", headers=other, params={"q": "cometa"})
+    assert response.status_code == 404
+
+
+async def test_only_the_start_of_long_notes_is_indexed(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(search, "INDEXED_CONTENT_MAX_CHARS", 20)
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_url = f"/api/vaults/{vault['id']}"
+    content = "principio del texto " + "relleno " * 10 + "final"
+    note = (
+        await client.post(
+            f"{vault_url}/notes", headers=headers, json={"title": "Larga", "content": content}
+        )
+    ).json()
+
+    async def search_titles(query: str) -> list[str]:
+        response = await client.get(f"{vault_url}/search", headers=headers, params={"q": query})
+        return [hit["title"] for hit in response.json()["items"]]
+
+    assert await search_titles("principio") == ["Larga"]
+    assert await search_titles("final") == []
+    async with async_session() as session:
+        indexed = await session.execute(
+            select(NoteSearchDocument.content).where(
+                cast(Any, NoteSearchDocument.note_id) == UUID(note["id"])
+            )
+        )
+        assert indexed.scalar_one() == content[:20]
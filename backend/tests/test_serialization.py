@@ -0,0 +1,21 @@
+import httpx
+
+from app.schemas import NoteRead, VaultWithNotes
+from tests.conftest import register
+
+
+async def test_fast_path_matches_response_models(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    url = f"/api/vaults/{vault['id']}"
+    await client.post(f"{url}/notes", headers=headers, json={"title": "Nueva", "content": "ñ"})
+
+    read = (await client.get(url, headers=headers)).json()
+    notes = (await client.get(f"{url}/notes", headers=headers)).json()
+
+    assert VaultWithNotes.model_validate(read).model_dump(mode="json") == read
+    assert [NoteRead.model_validate(note).model_dump(mode="json") for note in notes] == notes
+    assert notes == read["notes"]
+    assert notes[0]["title"] == "Nueva"
+    listed = (await client.get("/api/vaults", headers=headers)).json()
+    assert listed == [read]
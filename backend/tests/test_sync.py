@@ -0,0 +1,138 @@
+from datetime import UTC, datetime
+from typing import Any, cast
+from uuid import UUID
+
+import httpx
+from sqlalchemy import text, update
+
+from app.core.clock import utcnow
+from app.db.session import async_session, engine
+from app.models import NoteTombstone
+from app.scripts.migrate_sync_versions import migrate
+from app.services.sync import prune_tombstones
+from tests.conftest import register
+
+
+async def test_changes_since_version_and_etag(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_url = f"/api/vaults/{vault['id']}"
+
+    initial = (await client.get(f"{vault_url}/changes?since=0", headers=headers)).json()
+    assert len(initial["notes"]) == 2
+    welcome, quickstart = initial["notes"]
+
+    first = await client.get(vault_url, headers=headers)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    for url in (vault_url, f"{vault_url}/notes"):
+        cached = await client.get(url, headers={**headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+
+    created = (await client.post(f"{vault_url}/notes", headers=headers, json={"title": "N"})).json()
+    await client.patch(
+        f"{vault_url}/notes/{welcome['id']}", headers=headers, json={"title": "Editada"}
+    )
+    await client.delete(f"{vault_url}/notes/{quickstart['id']}", headers=headers)
+
+    changes = (
+        await client.get(f"{vault_url}/changes?since={initial['version']}", headers=headers)
+    ).json()
+    assert changes["version"] == initial["version"] + 3
+    assert [note["title"] for note in changes["notes"]] == ["N", "Editada"]
+    assert changes["deleted"] == [quickstart["id"]]
+    assert changes["notes"][0]["id"] == created["id"]
+
+    latest = (
+        await client.get(f"{vault_url}/changes?since={changes['version']}", headers=headers)
+    ).json()
+    assert latest == {"version": changes["version"], "notes": [], "deleted": []}
+
+    by_time = (
+        await client.get(
+            f"{vault_url}/changes", headers=headers, params={"since": "2000-01-01T00:00:00+00:00"}
+        )
+    ).json()
+    assert len(by_time["notes"]) == 2
+    assert by_time["deleted"] == [quickstart["id"]]
+
+    stale = await client.get(vault_url, headers={**headers, "If-None-Match": etag})
+    assert stale.status_code == 200
+    assert stale.headers["ETag"] != etag
+    invalid = await client.get(f"{vault_url}/changes?since=ayer", headers=headers)
+    assert invalid.status_code == 400
+
+
+async def test_migrate_sync_versions_upgrades_old_databases(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_url = f"/api/vaults/{vault['id']}"
+
+    # Esquema anterior a la sincronización incremental.
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_notes_vault_version"))
+        await conn.execute(text("ALTER TABLE notes DROP COLUMN version"))
+        await conn.execute(text("ALTER TABLE notes DROP COLUMN content_version"))
+        await conn.execute(text("ALTER TABLE vaults DROP COLUMN version"))
+        await conn.execute(text("ALTER TABLE vaults DROP COLUMN tombstones_pruned_version"))
+        await conn.execute(text("DROP TABLE note_tombstones"))
+
+    await migrate()
+    await migrate()
+
+    async with engine.connect() as conn:
+        versions = (await conn.execute(text("SELECT version FROM notes"))).scalars().all()
+        content_versions = (
+            (await conn.execute(text("SELECT content_version FROM notes"))).scalars().all()
+        )
+        vault_version = (await conn.execute(text("SELECT version FROM vaults"))).scalar_one()
+    assert versions == content_versions == [1, 1]
+    assert vault_version == 1
+
+    changes = (await client.get(f"{vault_url}/changes?since=0", headers=headers)).json()
+    assert len(changes["notes"]) == 2
+    note_id = changes["notes"][0]["id"]
+    assert (await client.delete(f"{vault_url}/notes/{note_id}", headers=headers)).status_code == 204
+    changes = (await client.get(f"{vault_url}/changes?since=1", headers=headers)).json()
+    assert changes["version"] == 2
+    assert changes["deleted"] == [note_id]
+    # La otra nota enlazaba a la borrada: pierde el enlace y también cuenta como cambio.
+    assert [note["links"] for note in changes["notes"]] == [[]]
+
+
+async def test_pruned_tombstones_require_full_resync(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_url = f"/api/vaults/{vault['id']}"
+    old, recent = (await client.get(f"{vault_url}/notes", headers=headers)).json()
+
+    await client.delete(f"{vault_url}/notes/{old['id']}", headers=headers)
+    after_old = (await client.get(f"{vault_url}/changes?since=0", headers=headers)).json()
+    await client.delete(f"{vault_url}/notes/{recent['id']}", headers=headers)
+    async with async_session() as session:
+        await session.execute(
+            update(NoteTombstone)
+            .where(cast(Any, NoteTombstone.note_id) == UUID(old["id"]))
+            .values(deleted_at=datetime(2000, 1, 1, tzinfo=UTC))
+        )
+        await session.commit()
+
+    async with async_session() as session:
+        assert await prune_tombstones(session, utcnow(), 30) == 1
+        await session.commit()
+    async with async_session() as session:
+        assert await prune_tombstones(session, utcnow(), 30) == 0
+
+    # Quien ya vio la baja podada sigue con deltas; quien es anterior, recarga.
+    changes = await client.get(f"{vault_url}/changes?since={after_old['version']}", headers=headers)
+    assert changes.json()["deleted"] == [recent["id"]]
+    for since in ("1", "2000-01-01T00:00:00+00:00"):
+        response = await client.get(
+            f"{vault_url}/changes", headers=headers, params={"since": since}
+        )
+        assert response.status_code == 410
+    events = await client.get(f"{vault_url}/events?since=1", headers=headers)
+    assert events.status_code == 410
+    full = (await client.get(f"{vault_url}/changes?since=0", headers=headers)).json()
+    assert full["deleted"] == [recent["id"]]
@@ -0,0 +1,87 @@
+import asyncio
+from uuid import UUID, uuid4
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.session import engine
+from app.services import vault_events as events_module
+from app.services.vault_events import PostgresNotifyBackend, stream_vault_changes, vault_events
+from tests.conftest import register
+
+
+async def _wait_for_subscriber(vault_id: UUID) -> None:
+    for _ in range(100):
+        if vault_events.subscriber_count(vault_id):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("El stream no llegó a suscribirse")
+
+
+async def test_stream_pushes_changes_and_catches_up(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    vault_id = UUID(vault["id"])
+    notes_url = f"/api/vaults/{vault_id}/notes"
+    start = (await client.get(f"/api/vaults/{vault_id}/changes?since=0", headers=headers)).json()
+
+    stream = stream_vault_changes(vault_id, start["version"])
+    received = asyncio.ensure_future(anext(stream))
+    await _wait_for_subscriber(vault_id)
+    created = (
+        await client.post(notes_url, headers=headers, json={"title": "En vivo", "content": ""})
+    ).json()
+    event = (await asyncio.wait_for(received, 5)).decode()
+    await stream.aclose()
+
+    assert event.startswith(f"id: {created['version']}\nevent: changes\n")
+    assert '"title":"En vivo"' in event
+    assert vault_events.subscriber_count(vault_id) == 0
+
+    # Reconexión con el último id: recibe el borrado ocurrido mientras no estaba.
+    await client.delete(f"{notes_url}/{created['id']}", headers=headers)
+    stream = stream_vault_changes(vault_id, created["version"])
+    event = (await asyncio.wait_for(anext(stream), 5)).decode()
+    await stream.aclose()
+    assert f'"deleted":["{created["id"]}"]' in event
+
+
+async def test_stream_sends_heartbeats(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+
+    stream = stream_vault_changes(UUID(vault["id"]), 10**6, heartbeat=0.01)
+    assert await asyncio.wait_for(anext(stream), 5) == b": ping\n\n"
+    await stream.aclose()
+
+
+async def test_postgres_backend_relistens_after_connection_loss(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if engine.dialect.name != "postgresql":
+        pytest.skip("Solo aplica a Postgres")
+    monkeypatch.setattr(events_module, "RECONNECT_INITIAL_SECONDS", 0.01)
+    backend = PostgresNotifyBackend(settings.database_url)
+    received: asyncio.Queue[tuple[UUID, int]] = asyncio.Queue()
+    backend.attach(lambda vault_id, version: received.put_nowait((vault_id, version)))
+    await backend.start()
+    try:
+        first = backend._connection
+        async with engine.connect() as conn:
+            await conn.execute(
+                text("SELECT pg_terminate_backend(:pid)"), {"pid": first.get_server_pid()}
+            )
+        for _ in range(500):
+            if backend._connection not in (None, first):
+                break
+            await asyncio.sleep(0.01)
+        else:
+            raise AssertionError("No se restableció la conexión LISTEN")
+
+        vault_id = uuid4()
+        await backend.publish(vault_id, 7)
+        assert await asyncio.wait_for(received.get(), 5) == (vault_id, 7)
+    finally:
+        await backend.stop()
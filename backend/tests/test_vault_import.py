@@ -0,0 +1,135 @@
+import asyncio
+import io
+import zipfile
+from uuid import UUID
+
+import httpx
+import orjson
+import pytest
+from sqlalchemy import text
+
+from app.db.session import engine
+from app.services import vault_import
+from tests.conftest import register
+
+_VAULT_FILES = {
+    "Mi vault/Inicio.md": '---\ntitle: "Portada"\n---\nVer [[Otra]], [[sub/Detalle|alias]], '
+    "[[Falta]] y ![[foto.png]].",
+    "Mi vault/Otra.md": "Vuelta a [[Inicio#Sección]].",
+    "Mi vault/sub/Detalle.md": "---\ntags: [a]\n---\nSin enlaces.",
+    "Mi vault/.obsidian/plantilla.md": "Se ignora",
+}
+
+
+def _zip(files: dict[str, str]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, text in files.items():
+            archive.writestr(name, text)
+    return buffer.getvalue()
+
+
+async def _import(client: httpx.AsyncClient, headers: dict[str, str], data: bytes) -> list[dict]:
+    response = await client.post(
+        "/api/vaults/import", headers=headers, files={"file": ("vault.zip", data)}
+    )
+    assert response.status_code == 200, response.text
+    return [orjson.loads(line) for line in response.content.splitlines()]
+
+
+async def test_import_resolves_wikilinks_and_titles(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    *progress, done = await _import(client, headers, _zip(_VAULT_FILES))
+
+    assert progress == [{"type": "progress", "processed": 3, "total": 3}]
+    assert done["type"] == "done"
+    assert done["vault"]["name"] == "Mi vault"
+    # Inicio -> Otra, Inicio -> Detalle, Otra -> Inicio; el adjunto no cuenta como roto.
+    assert (done["notes"], done["links"], done["unresolved_links"]) == (3, 3, 1)
+
+    vault_url = f"/api/vaults/{done['vault']['id']}"
+    notes = {
+        note["title"]: note
+        for note in (await client.get(f"{vault_url}/notes", headers=headers)).json()
+    }
+    assert set(notes) == {"Portada", "Otra", "Detalle"}
+    # El front-matter con claves de la exportación se descarta; el resto se conserva.
+    assert notes["Portada"]["content"].startswith("Ver [[Otra]]")
+    assert notes["Detalle"]["content"].startswith("---\ntags: [a]")
+    assert set(notes["Portada"]["links"]) == {notes["Otra"]["id"], notes["Detalle"]["id"]}
+    assert notes["Otra"]["links"] == [notes["Portada"]["id"]]
+    backlinks = (
+        await client.get(f"{vault_url}/notes/{notes['Portada']['id']}/backlinks", headers=headers)
+    ).json()
+    assert [note["title"] for note in backlinks] == ["Otra"]
+
+
+async def test_import_batches_are_capped_by_bytes(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(vault_import, "IMPORT_BATCH_MAX_BYTES", 1)
+    headers = await register(client)
+    *progress, done = await _import(client, headers, _zip(_VAULT_FILES))
+
+    assert [event["processed"] for event in progress] == [1, 2, 3]
+    assert (done["notes"], done["links"]) == (3, 3)
+
+
+async def test_import_rejects_invalid_zip(client: httpx.AsyncClient) -> None:
+    headers = await register(client)
+    response = await client.post(
+        "/api/vaults/import", headers=headers, files={"file": ("vault.zip", b"no es un zip")}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Archivo zip inválido"
+
+
+async def test_note_writes_proceed_while_import_streams(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(vault_import, "IMPORT_BATCH_SIZE", 1)
+    headers = await register(client)
+    me = (await client.get("/api/auth/me", headers=headers)).json()
+    vault = (await client.get("/api/vaults/summary", headers=headers)).json()[0]
+    note = (await client.get(f"/api/vaults/{vault['id']}/notes", headers=headers)).json()[0]
+
+    archive = vault_import.ObsidianArchive(io.BytesIO(_zip(_VAULT_FILES)))
+    events = vault_import.import_obsidian_vault(archive, UUID(me["id"]), "Lento", "violet")
+    assert orjson.loads(await anext(events))["processed"] == 1
+    # El cliente del import aún no lee el siguiente evento: nada debe quedar bloqueado.
+    response = await asyncio.wait_for(
+        client.patch(
+            f"/api/vaults/{vault['id']}/notes/{note['id']}",
+            headers=headers,
+            json={"title": "Durante el import"},
+        ),
+        timeout=2,
+    )
+    assert response.status_code == 200
+
+    done = [orjson.loads(line) async for line in events][-1]
+    assert (done["type"], done["notes"]) == ("done", 3)
+    imported = f"/api/vaults/{done['vault']['id']}"
+    changes = (await client.get(f"{imported}/changes?since=0", headers=headers)).json()
+    assert len(changes["notes"]) == 3
+    assert changes["version"] == 2
+
+
+async def test_abandoned_import_is_discarded(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(vault_import, "IMPORT_BATCH_SIZE", 1)
+    headers = await register(client)
+    me = (await client.get("/api/auth/me", headers=headers)).json()
+
+    archive = vault_import.ObsidianArchive(io.BytesIO(_zip(_VAULT_FILES)))
+    events = vault_import.import_obsidian_vault(archive, UUID(me["id"]), "Cortado", "violet")
+    await anext(events)
+    await events.aclose()
+
+    names = [vault["name"] for vault in (await client.get("/api/vaults", headers=headers)).json()]
+    assert "Cortado" not in names
+    async with engine.connect() as conn:
+        for table in ("notes", "note_search"):
+            count = await conn.execute(text(f"SELECT count(*) FROM {table}"))
+            assert count.scalar_one() == 2  # solo las del vault por defecto